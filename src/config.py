@@ -19,13 +19,21 @@ class AppConfig:
     Attributes:
         model_path: Path to the YOLOv8 model file (best.pt)
         confidence_threshold: Detection confidence threshold (0.0-1.0)
+        detection_backend: Inference backend for YOLOv8 ("pytorch", "onnx", "coreml")
+        detection_quantize_int8: Use an INT8-quantized model (onnx backend only)
         target_window_title: Title of the window to capture (partial match)
+        capture_scale: Scale factor applied to captured frames before detection/OCR (0.0-1.0, 1.0 keeps native resolution)
+        capture_use_quartz: Capture directly through Quartz without mss's intermediate copies (falls back to mss on failure)
         ocr_lang: OCR language code (e.g., 'jpn' for Japanese)
         ocr_margin: Margin in pixels to add when cropping detected regions
         min_text_length: Minimum text length to consider valid
         output_csv: Path to the output CSV file
         display_window_name: Name of the display window for visualization
+        display_use_opencl: Draw detection overlays through OpenCL (cv2.UMat) when available
         performance_mode: Performance mode preset ("fast", "balanced", "accurate")
+        pin_pipeline_threads: Pin capture/detection/OCR threads to dedicated CPUs (QoS class on macOS)
+        drop_stale_frames: Detect only the newest captured frame and discard the backlog instead of batching it
+        frame_diff_threshold: Mean absolute difference (0-255) of a 32x32 grayscale thumbnail below which a frame is treated as static (0 disables)
         detection_cache_ttl: Detection cache time-to-live in seconds
         detection_cache_similarity: Frame similarity threshold for cache hit (0.0-1.0)
         ocr_cache_position_tolerance: Position tolerance in pixels for OCR cache matching
@@ -42,9 +50,13 @@ class AppConfig:
     # Model settings
     model_path: str = "models/best.pt"
     confidence_threshold: float = 0.65  # 検出率とパフォーマンスのバランス（0.6→0.65に微調整）
+    detection_backend: str = "pytorch"  # onnx/coremlは初回起動時にモデルをエクスポートしてキャッシュ
+    detection_quantize_int8: bool = False  # 精度がわずかに低下する場合がある
     
     # Window capture settings
     target_window_title: str = "iPhone"
+    capture_scale: float = 1.0  # 大きなウィンドウで検出の前処理が重い場合に縮小（小さくしすぎるとOCR精度が低下）
+    capture_use_quartz: bool = False  # 画面収録の権限がない等で失敗した場合はmssに戻る
     
     # OCR settings
     ocr_lang: str = "jpn"
@@ -56,9 +68,13 @@ class AppConfig:
     
     # Display settings
     display_window_name: str = "Real-time Detection"
+    display_use_opencl: bool = False  # OpenCL非対応環境では自動的にCPU描画になる
     
     # Performance settings
     performance_mode: str = "balanced"
+    pin_pipeline_threads: bool = False  # 他のアプリと共用するマシンでは逆効果になる場合がある
+    drop_stale_frames: bool = False  # 遅延を優先（スクロール中の中間フレームは処理されない）
+    frame_diff_threshold: float = 2.0  # 静止フレームでは検出・OCRを省略（0で無効）
     detection_cache_ttl: float = 0.7  # キャッシュ有効期限（1.0→0.7秒に短縮、新規検出を優先）
     detection_cache_similarity: float = 0.93  # 類似度しきい値（0.90→0.93に調整、より厳密に）
     ocr_cache_position_tolerance: int = 12  # 位置許容範囲（15→12ピクセルに調整）
@@ -106,6 +122,10 @@ class AppConfig:
         if not self.target_window_title or not self.target_window_title.strip():
             return False, "target_window_title cannot be empty"
         
+        # Validate capture scale
+        if not 0.0 < self.capture_scale <= 1.0:
+            return False, f"capture_scale must be in (0.0, 1.0], got {self.capture_scale}"
+        
         # Validate ocr_lang is not empty
         if not self.ocr_lang or not self.ocr_lang.strip():
             return False, "ocr_lang cannot be empty"
@@ -122,6 +142,11 @@ class AppConfig:
             except Exception as e:
                 return False, f"Cannot create output directory {output_dir}: {e}"
         
+        # Validate detection backend
+        valid_backends = ["pytorch", "onnx", "coreml"]
+        if self.detection_backend not in valid_backends:
+            return False, f"detection_backend must be one of {valid_backends}, got '{self.detection_backend}'"
+        
         # Validate display_window_name is not empty
         if not self.display_window_name or not self.display_window_name.strip():
             return False, "display_window_name cannot be empty"
@@ -131,6 +156,10 @@ class AppConfig:
         if self.performance_mode not in valid_modes:
             return False, f"performance_mode must be one of {valid_modes}, got '{self.performance_mode}'"
         
+        # Validate frame difference threshold
+        if self.frame_diff_threshold < 0:
+            return False, f"frame_diff_threshold must be non-negative, got {self.frame_diff_threshold}"
+        
         # Validate detection cache TTL
         if self.detection_cache_ttl <= 0:
             return False, f"detection_cache_ttl must be positive, got {self.detection_cache_ttl}"
@@ -194,13 +223,21 @@ class AppConfig:
         Environment variables:
             OCR_MODEL_PATH: Path to YOLOv8 model
             OCR_CONFIDENCE_THRESHOLD: Detection confidence threshold
+            OCR_DETECTION_BACKEND: Inference backend for YOLOv8 (pytorch/onnx/coreml)
+            OCR_DETECTION_QUANTIZE_INT8: Use an INT8-quantized model (true/false)
             OCR_WINDOW_TITLE: Target window title
+            OCR_CAPTURE_SCALE: Scale factor applied to captured frames (0.0-1.0]
+            OCR_CAPTURE_USE_QUARTZ: Capture directly through Quartz (true/false)
             OCR_LANG: OCR language
             OCR_MARGIN: OCR margin in pixels
             OCR_MIN_TEXT_LENGTH: Minimum text length
             OCR_OUTPUT_CSV: Output CSV file path
             OCR_DISPLAY_WINDOW: Display window name
+            OCR_DISPLAY_USE_OPENCL: Draw detection overlays through OpenCL (true/false)
             OCR_PERFORMANCE_MODE: Performance mode preset (fast/balanced/accurate)
+            OCR_PIN_PIPELINE_THREADS: Pin pipeline threads to dedicated CPUs (true/false)
+            OCR_DROP_STALE_FRAMES: Process only the newest captured frame (true/false)
+            OCR_FRAME_DIFF_THRESHOLD: Static frame threshold (mean absolute difference, 0 disables)
             OCR_DETECTION_CACHE_TTL: Detection cache TTL in seconds
             OCR_DETECTION_CACHE_SIMILARITY: Detection cache similarity threshold
             OCR_OCR_CACHE_POSITION_TOLERANCE: OCR cache position tolerance in pixels
@@ -222,13 +259,21 @@ class AppConfig:
         return cls(
             model_path=os.getenv('OCR_MODEL_PATH', defaults.model_path),
             confidence_threshold=float(os.getenv('OCR_CONFIDENCE_THRESHOLD', str(defaults.confidence_threshold))),
+            detection_backend=os.getenv('OCR_DETECTION_BACKEND', defaults.detection_backend),
+            detection_quantize_int8=os.getenv('OCR_DETECTION_QUANTIZE_INT8', str(defaults.detection_quantize_int8)).lower() in ('true', '1', 'yes'),
             target_window_title=os.getenv('OCR_WINDOW_TITLE', defaults.target_window_title),
+            capture_scale=float(os.getenv('OCR_CAPTURE_SCALE', str(defaults.capture_scale))),
+            capture_use_quartz=os.getenv('OCR_CAPTURE_USE_QUARTZ', str(defaults.capture_use_quartz)).lower() in ('true', '1', 'yes'),
             ocr_lang=os.getenv('OCR_LANG', defaults.ocr_lang),
             ocr_margin=int(os.getenv('OCR_MARGIN', str(defaults.ocr_margin))),
             min_text_length=int(os.getenv('OCR_MIN_TEXT_LENGTH', str(defaults.min_text_length))),
             output_csv=os.getenv('OCR_OUTPUT_CSV', defaults.output_csv),
             display_window_name=os.getenv('OCR_DISPLAY_WINDOW', defaults.display_window_name),
+            display_use_opencl=os.getenv('OCR_DISPLAY_USE_OPENCL', str(defaults.display_use_opencl)).lower() in ('true', '1', 'yes'),
             performance_mode=os.getenv('OCR_PERFORMANCE_MODE', defaults.performance_mode),
+            pin_pipeline_threads=os.getenv('OCR_PIN_PIPELINE_THREADS', str(defaults.pin_pipeline_threads)).lower() in ('true', '1', 'yes'),
+            drop_stale_frames=os.getenv('OCR_DROP_STALE_FRAMES', str(defaults.drop_stale_frames)).lower() in ('true', '1', 'yes'),
+            frame_diff_threshold=float(os.getenv('OCR_FRAME_DIFF_THRESHOLD', str(defaults.frame_diff_threshold))),
             detection_cache_ttl=float(os.getenv('OCR_DETECTION_CACHE_TTL', str(defaults.detection_cache_ttl))),
             detection_cache_similarity=float(os.getenv('OCR_DETECTION_CACHE_SIMILARITY', str(defaults.detection_cache_similarity))),
             ocr_cache_position_tolerance=int(os.getenv('OCR_OCR_CACHE_POSITION_TOLERANCE', str(defaults.ocr_cache_position_tolerance))),
@@ -248,13 +293,21 @@ class AppConfig:
             f"AppConfig(\n"
             f"  model_path='{self.model_path}',\n"
             f"  confidence_threshold={self.confidence_threshold},\n"
+            f"  detection_backend='{self.detection_backend}',\n"
+            f"  detection_quantize_int8={self.detection_quantize_int8},\n"
             f"  target_window_title='{self.target_window_title}',\n"
+            f"  capture_scale={self.capture_scale},\n"
+            f"  capture_use_quartz={self.capture_use_quartz},\n"
             f"  ocr_lang='{self.ocr_lang}',\n"
             f"  ocr_margin={self.ocr_margin},\n"
             f"  min_text_length={self.min_text_length},\n"
             f"  output_csv='{self.output_csv}',\n"
             f"  display_window_name='{self.display_window_name}',\n"
+            f"  display_use_opencl={self.display_use_opencl},\n"
             f"  performance_mode='{self.performance_mode}',\n"
+            f"  pin_pipeline_threads={self.pin_pipeline_threads},\n"
+            f"  drop_stale_frames={self.drop_stale_frames},\n"
+            f"  frame_diff_threshold={self.frame_diff_threshold},\n"
             f"  detection_cache_ttl={self.detection_cache_ttl},\n"
             f"  detection_cache_similarity={self.detection_cache_similarity},\n"
             f"  ocr_cache_position_tolerance={self.ocr_cache_position_tolerance},\n"
@@ -4,9 +4,9 @@ Data management module for the real-time OCR application.
 This module handles duplicate detection and CSV export of extracted text data.
 """
 
+import csv
 from pathlib import Path
 from typing import Set, Callable, Optional
-import pandas as pd
 
 
 class DataManager:
@@ -46,13 +46,13 @@ class DataManager:
         Returns:
             新規データの場合True、重複の場合False
         """
+        # テキストを正規化（前後の空白を削除）
+        normalized_text = text.strip() if text else ""
+        
         # 空文字列やNoneは無視
-        if not text or not text.strip():
+        if not normalized_text:
             return False
         
-        # テキストを正規化（前後の空白を削除）
-        normalized_text = text.strip()
-        
         # 重複チェック（O(1)）
         if normalized_text in self.extracted_texts:
             return False
@@ -76,7 +76,8 @@ class DataManager:
         """
         抽出されたデータをCSVファイルに出力します。
         
-        pandasを使用してDataFrameを作成し、"extracted_text"列で出力します。
+        標準ライブラリのcsvモジュールで"extracted_text"列の1列CSVとして出力します。
+        （1列の文字列のみのため、pandasのDataFrameは構築しません）
         データ件数も表示します。
         """
         count = self.get_count()
@@ -88,13 +89,11 @@ class DataManager:
         # 出力ディレクトリが存在しない場合は作成
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # DataFrameを作成
-        df = pd.DataFrame({
-            'extracted_text': sorted(self.extracted_texts)  # ソートして出力
-        })
-        
-        # CSVに出力
-        df.to_csv(self.output_path, index=False, encoding='utf-8-sig')
+        # CSVに出力（ソートして出力）
+        with open(self.output_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(('extracted_text',))
+            writer.writerows((text,) for text in sorted(self.extracted_texts))
         
         print(f"\nCSVファイルを出力しました: {self.output_path}")
         print(f"抽出されたデータ件数: {count}件")
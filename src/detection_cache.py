@@ -13,6 +13,9 @@ import cv2
 
 from src.object_detector import DetectionResult
 
+# フィンガープリントのビット数（32x32画素の平均ハッシュ）
+FINGERPRINT_BITS = 32 * 32
+
 
 @dataclass
 class CacheEntry:
@@ -21,7 +24,7 @@ class CacheEntry:
     
     Attributes:
         timestamp: キャッシュ作成時刻（Unix時間）
-        frame_hash: フレームの簡易ハッシュ値
+        frame_hash: フレームのフィンガープリント（平均ハッシュのビット列）
         detections: 検出結果のリスト
     """
     timestamp: float
@@ -52,12 +55,14 @@ class DetectionCache:
         self._cache_hits = 0
         self._cache_misses = 0
     
-    def should_skip_detection(self, frame: np.ndarray) -> bool:
+    def should_skip_detection(self, frame: np.ndarray, fingerprint: Optional[int] = None) -> bool:
         """
         フレームが類似している場合、検出をスキップすべきか判定
         
         Args:
             frame: 入力フレーム（BGR形式のnumpy配列）
+            fingerprint: compute_fingerprint()で計算済みのフィンガープリント。
+                         指定した場合はframeからの再計算を省略
         
         Returns:
             True: 検出をスキップすべき（キャッシュを使用）
@@ -74,8 +79,8 @@ class DetectionCache:
             self._cache_misses += 1
             return False
         
-        # フレームハッシュを計算
-        frame_hash = self._compute_frame_hash(frame)
+        # フレームハッシュを計算（計算済みの場合は再利用）
+        frame_hash = fingerprint if fingerprint is not None else self.compute_fingerprint(frame)
         
         # フレーム類似度を計算
         similarity = self._compute_similarity(frame_hash, self.cache.frame_hash)
@@ -105,15 +110,18 @@ class DetectionCache:
         
         return self.cache.detections
     
-    def update_cache(self, frame: np.ndarray, detections: List[DetectionResult]) -> None:
+    def update_cache(self, frame: np.ndarray, detections: List[DetectionResult],
+                     fingerprint: Optional[int] = None) -> None:
         """
         キャッシュを更新
         
         Args:
             frame: 入力フレーム（BGR形式のnumpy配列）
             detections: 検出結果のリスト
+            fingerprint: compute_fingerprint()で計算済みのフィンガープリント。
+                         指定した場合はframeからの再計算を省略
         """
-        frame_hash = self._compute_frame_hash(frame)
+        frame_hash = fingerprint if fingerprint is not None else self.compute_fingerprint(frame)
         
         self.cache = CacheEntry(
             timestamp=time.time(),
@@ -147,21 +155,29 @@ class DetectionCache:
         self.cache = None
     
     @staticmethod
-    def _compute_frame_hash(frame: np.ndarray) -> int:
+    def compute_fingerprint(frame: np.ndarray) -> int:
         """
-        フレームの簡易ハッシュを計算
+        フレームの簡易ハッシュ（フィンガープリント）を計算
+        
+        32x32ピクセルへのダウンサンプリングと平均ハッシュアルゴリズムを使用して、
+        高速にフレームの特徴を抽出します。以降の処理は1KBのサムネイルのみを扱います。
+        
+        平均ハッシュの1024ビットをそのまま整数に詰めるため、2つのフィンガープリントの
+        ハミング距離が「平均より明るい画素」の判定が食い違う画素数になります。
         
-        ダウンサンプリングと平均ハッシュアルゴリズムを使用して、
-        高速にフレームの特徴を抽出します。
+        1フレームにつき1回計算し、should_skip_detection()とupdate_cache()の
+        両方に渡すことで重複計算を避けられます。
         
         Args:
             frame: 入力フレーム（BGR形式のnumpy配列）
         
         Returns:
-            フレームのハッシュ値（整数）
+            フレームのフィンガープリント（1024ビットの整数）
         """
-        # ダウンサンプリングして高速化（64x64ピクセル）
-        small = cv2.resize(frame, (64, 64))
+        # ダウンサンプリングして高速化（32x32ピクセル）
+        # INTER_AREAは全画素を読むため、フルHDでは数ms掛かる。既定の線形補間なら
+        # 参照する画素は出力画素の近傍のみで済む
+        small = cv2.resize(frame, (32, 32))
         
         # グレースケール変換
         if len(small.shape) == 3:
@@ -169,18 +185,17 @@ class DetectionCache:
         
         # 平均ハッシュアルゴリズム
         avg = small.mean()
-        binary = (small > avg).astype(np.uint8)
+        bits = np.packbits(small > avg)
         
-        # バイト列からハッシュ値を生成
-        return hash(binary.tobytes())
+        # ビット列を整数に詰める（hash()で潰すとビット間の距離が失われる）
+        return int.from_bytes(bits.tobytes(), 'big')
     
     @staticmethod
     def _compute_similarity(hash1: int, hash2: int) -> float:
         """
         2つのハッシュ値の類似度を計算
         
-        ハッシュ値が同じ場合は1.0、異なる場合は0.0を返します。
-        より高度な類似度計算が必要な場合は、ハミング距離などを使用できます。
+        平均ハッシュのビット列のハミング距離から、判定が一致した画素の割合を返します。
         
         Args:
             hash1: 1つ目のハッシュ値
@@ -200,9 +215,8 @@ class DetectionCache:
             xor = hash1 ^ hash2
             # 1のビット数をカウント（ハミング距離）
             hamming_distance = bin(xor).count('1')
-            # 64ビット整数と仮定して類似度を計算
-            max_bits = 64
-            similarity = 1.0 - (hamming_distance / max_bits)
+            # 32x32画素の平均ハッシュ（1024ビット）に対する一致率
+            similarity = 1.0 - (hamming_distance / FINGERPRINT_BITS)
             return max(0.0, similarity)
         except Exception:
             # エラー時は保守的に0.0を返す
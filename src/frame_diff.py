@@ -0,0 +1,60 @@
+"""
+フレーム差分検出モジュール
+
+このモジュールは、前回処理したフレームからの変化量を縮小グレースケール画像の
+平均絶対差分（MAD）で判定する軽量な差分検出器を提供します。
+画面が静止している間は物体検出とOCRを省略するために使用します。
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class FrameDiffDetector:
+    """縮小グレースケール画像の平均絶対差分による静止フレーム判定
+
+    比較対象は直前のフレームではなく、最後に「変化あり」と判定したフレームです。
+    1フレームごとの変化が小さいゆっくりしたスクロールでも、変化が蓄積すれば
+    しきい値を超えて検出されます。
+    """
+
+    def __init__(self, threshold: float, size: int = 32):
+        """
+        FrameDiffDetectorを初期化
+
+        Args:
+            threshold: 静止と判定する平均絶対差分の上限（0-255の輝度差）
+            size: 比較に使用する縮小画像の一辺のピクセル数
+        """
+        self.threshold = threshold
+        self.size = size
+        self._reference: Optional[np.ndarray] = None
+
+    def is_static(self, frame: np.ndarray) -> bool:
+        """フレームが基準フレームから変化していないか判定
+
+        変化ありと判定した場合は、そのフレームを新しい基準フレームにします。
+
+        Args:
+            frame: 入力フレーム（BGR形式のnumpy配列）
+
+        Returns:
+            基準フレームとの平均絶対差分がしきい値未満の場合True
+        """
+        # 先に縮小してからグレースケール化する（変換する画素数を減らす）
+        small = cv2.resize(frame, (self.size, self.size))
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        if self._reference is not None:
+            diff = cv2.absdiff(gray, self._reference).mean()
+            if diff < self.threshold:
+                return True
+
+        self._reference = gray
+        return False
+
+    def reset(self) -> None:
+        """基準フレームを破棄（次のフレームは必ず変化ありと判定される）"""
+        self._reference = None
@@ -0,0 +1,84 @@
+"""
+フレームバッファプールモジュール
+
+このモジュールは、キャプチャフレーム用のnumpy配列を使い回すための
+固定サイズのバッファプールを提供します。毎フレーム数MBの配列を
+確保・解放するコストを削減します。
+"""
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+
+
+class FramePool:
+    """キャプチャフレーム用バッファプール
+
+    空きバッファをcollections.dequeで管理します。dequeのappend/popは
+    CPythonではアトミックなため、キャプチャスレッドと検出スレッドの間で
+    ロックなしに受け渡しできます。
+
+    プールが空の場合は新しいバッファを確保するため、バッファの返却漏れが
+    あっても処理は止まりません（返却されなかったバッファはGCで解放されます）。
+    """
+
+    def __init__(self, size: int = 4):
+        """
+        FramePoolを初期化
+
+        Args:
+            size: プールに保持するバッファ数の上限
+
+        Raises:
+            ValueError: sizeが1未満の場合
+        """
+        if size < 1:
+            raise ValueError(f"sizeは1以上である必要があります: {size}")
+
+        self.size = size
+        self._free: Deque[np.ndarray] = deque()
+
+    def allocate(self, shape: Tuple[int, ...], dtype: type = np.uint8) -> None:
+        """指定サイズのバッファを事前に確保
+
+        既存の空きバッファは破棄されます。
+
+        Args:
+            shape: バッファの形状（例: (height, width, 3)）
+            dtype: バッファのデータ型
+        """
+        self._free.clear()
+        for _ in range(self.size):
+            self._free.append(np.empty(shape, dtype=dtype))
+
+    def acquire(self) -> Optional[np.ndarray]:
+        """空きバッファを取得
+
+        公開中に読み取り専用にされたバッファも、書き込み可能に戻して返します。
+
+        Returns:
+            空きバッファ、またはプールが空の場合None
+        """
+        try:
+            buffer = self._free.pop()
+        except IndexError:
+            return None
+
+        buffer.flags.writeable = True
+        return buffer
+
+    def release(self, buffer: np.ndarray) -> None:
+        """使い終わったバッファをプールに返却
+
+        上限を超える分は保持せずに破棄します。
+
+        Args:
+            buffer: 返却するバッファ
+        """
+        if len(self._free) < self.size:
+            self._free.append(buffer)
+
+    def __len__(self) -> int:
+        """現在の空きバッファ数"""
+        return len(self._free)
@@ -5,7 +5,7 @@ GUI application module for the real-time OCR application - Simplified version.
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 import threading
 import queue
 from datetime import datetime
@@ -24,6 +24,10 @@ from src.hierarchical_pipeline import HierarchicalPipeline
 from src.session_manager import SessionManager
 from src.visualizer import Visualizer
 
+# ログ表示に保持する最大行数
+# Textウィジェットは行数に比例して挿入・スクロールが重くなるため、古い行から削除する
+LOG_MAX_LINES = 1000
+
 
 class ToolTip:
     """ツールチップを表示するクラス"""
@@ -102,6 +106,8 @@ class RealtimeOCRGUI:
         self.object_detector: Optional[ObjectDetector] = None
         self.ocr_processor: Optional[OCRProcessor] = None
         self.data_manager: Optional[DataManager] = None
+        # 処理開始時にモードに応じて束縛するレコード数取得関数（毎回の型判定を避ける）
+        self._record_count: Optional[Callable[[], int]] = None
         self.pipeline_processor: Optional[PipelineProcessor] = None
         self.hierarchical_pipeline: Optional[HierarchicalPipeline] = None
         self.session_manager: Optional[SessionManager] = None
@@ -578,6 +584,8 @@ class RealtimeOCRGUI:
         self.preview_canvas.pack(fill=tk.BOTH, expand=True)
         
         self.current_photo = None
+        # current_photoを表示しているキャンバス上の画像アイテム
+        self._preview_image_id: Optional[int] = None
         
         # Log section
         log_group = ttk.LabelFrame(parent, text="抽出データログ", padding="10")
@@ -752,6 +760,7 @@ class RealtimeOCRGUI:
         # Clear preview
         self.preview_canvas.delete("all")
         self.current_photo = None
+        self._preview_image_id = None
     
     def _preview_loop(self):
         """Preview loop - capture and display only."""
@@ -861,6 +870,8 @@ class RealtimeOCRGUI:
         
         # データマネージャーへの参照を保持
         self.data_manager = self.pipeline_processor.data_manager
+        if self.data_manager:
+            self._record_count = self.data_manager.get_count
         
         self.log_queue.put(("既存モードで処理を開始しました", 'info'))
     
@@ -877,6 +888,8 @@ class RealtimeOCRGUI:
         
         # データマネージャーへの参照を保持（階層的データマネージャー）
         self.data_manager = self.hierarchical_pipeline.data_manager
+        records = self.data_manager.records
+        self._record_count = lambda: len(records)
         
         # セッションマネージャーへの参照を保持
         self.session_manager = self.hierarchical_pipeline.session_manager
@@ -904,6 +917,7 @@ class RealtimeOCRGUI:
             self.hierarchical_pipeline = None
         
         self.data_manager = None
+        self._record_count = None
         self.session_manager = None
     
     def _stop_processing(self):
@@ -1018,14 +1032,10 @@ class RealtimeOCRGUI:
                         consecutive_errors = 0  # 成功したらリセット
                     
                     # データマネージャーから新規検出数を取得
-                    if self.data_manager:
+                    record_count = self._record_count
+                    if record_count:
                         try:
-                            if hasattr(self.data_manager, 'get_count'):
-                                current_count = self.data_manager.get_count()
-                            else:
-                                # 階層的データマネージャーの場合
-                                current_count = len(self.data_manager.records)
-                            self.stats['new_detections'] = current_count
+                            self.stats['new_detections'] = record_count()
                         except Exception as dm_error:
                             self.log_queue.put((f"データマネージャーエラー: {str(dm_error)}", 'warning'))
                 
@@ -1058,6 +1068,9 @@ class RealtimeOCRGUI:
         
         # 表示キューから最新フレームを取得
         frame = self.pipeline_processor.get_display_frame(timeout=0.1)
+        # OpenCL描画時はUMatのため、PIL変換用にホスト側へ転送
+        if isinstance(frame, cv2.UMat):
+            frame = frame.get()
         return frame
     
     def _process_hierarchical_frame(self):
@@ -1085,9 +1098,12 @@ class RealtimeOCRGUI:
             self.hierarchical_pipeline.process_frame(frame)
             
             # 検出結果を描画（表示用のフレームを作成）
+            # frameはこのフレーム専用に確保され、処理済みのため直接描画する
             display_frame = frame
             if hierarchical_results and self.visualizer:
-                display_frame = self.visualizer.draw_hierarchical_detections(frame, hierarchical_results)
+                display_frame = self.visualizer.draw_hierarchical_detections(
+                    frame, hierarchical_results, inplace=True
+                )
             
             return display_frame
             
@@ -1103,63 +1119,104 @@ class RealtimeOCRGUI:
         _display_loopを通じてこのキューに送信されます。
         """
         # Process frames - 表示キューから最新フレームを取得
+        # 複数溜まっている場合は途中のフレームを描画せず、最新の1枚のみ表示する
+        latest_frame = None
         try:
             while True:
-                frame = self.frame_queue.get_nowait()
-                self._update_preview(frame)
+                latest_frame = self.frame_queue.get_nowait()
         except queue.Empty:
             pass
         
+        if latest_frame is not None:
+            self._update_preview(latest_frame)
+        
         # Process logs
+        # 溜まったメッセージをまとめて取り出し、Textウィジェットとカウンタは1回ずつ更新する
+        messages = []
         try:
             while True:
-                message, tag = self.log_queue.get_nowait()
-                self.log_text.insert(tk.END, message + '\n', tag)
-                self.log_text.see(tk.END)
-                
-                # Update counters
-                if tag == 'new':
-                    current = int(self.new_count_var.get())
-                    self.new_count_var.set(str(current + 1))
-                elif tag == 'duplicate':
-                    current = int(self.duplicate_count_var.get())
-                    self.duplicate_count_var.set(str(current + 1))
-                
-                total = int(self.new_count_var.get()) + int(self.duplicate_count_var.get())
-                self.total_count_var.set(str(total))
+                messages.append(self.log_queue.get_nowait())
         except queue.Empty:
             pass
         
+        if messages:
+            self._append_logs(messages)
+        
         self.root.after(100, self._process_queues)
     
+    def _append_logs(self, messages):
+        """
+        ログメッセージをまとめて表示し、カウンタを更新
+        
+        Args:
+            messages: (メッセージ, タグ)のリスト
+        """
+        # 表示しきれない古いメッセージは挿入しない（カウンタには反映する）
+        visible = messages[-LOG_MAX_LINES:]
+        
+        # 1回のinsert呼び出しで (テキスト, タグ) の組を複数挿入できる
+        args = []
+        for message, tag in visible:
+            args.extend((message + '\n', tag))
+        self.log_text.insert(tk.END, *args)
+        self._trim_log()
+        self.log_text.see(tk.END)
+        
+        # Update counters
+        new_count = sum(1 for _, tag in messages if tag == 'new')
+        duplicate_count = sum(1 for _, tag in messages if tag == 'duplicate')
+        if new_count or duplicate_count:
+            new_total = int(self.new_count_var.get()) + new_count
+            duplicate_total = int(self.duplicate_count_var.get()) + duplicate_count
+            self.new_count_var.set(str(new_total))
+            self.duplicate_count_var.set(str(duplicate_total))
+            self.total_count_var.set(str(new_total + duplicate_total))
+    
+    def _trim_log(self):
+        """ログ表示の行数をLOG_MAX_LINES以下に保つ（古い行から削除）"""
+        # 'end-1c'の行番号 = 末尾の改行を除いた行数 + 1
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        if line_count > LOG_MAX_LINES:
+            self.log_text.delete('1.0', f'{line_count - LOG_MAX_LINES + 1}.0')
+    
     def _update_preview(self, frame):
         """Update preview canvas."""
         if frame is None:
             return
         
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        image = Image.fromarray(frame_rgb)
-        
-        # Resize to fit canvas
+        # Resize to fit canvas before the RGB conversion so only the preview-sized image is converted
         canvas_width = self.preview_canvas.winfo_width()
         canvas_height = self.preview_canvas.winfo_height()
         if canvas_width > 1 and canvas_height > 1:
-            image.thumbnail((canvas_width, canvas_height), Image.Resampling.LANCZOS)
+            height, width = frame.shape[:2]
+            scale = min(canvas_width / width, canvas_height / height)
+            if scale < 1.0:
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image = Image.fromarray(frame_rgb)
+        
+        # Reuse the Tk photo image while the size is unchanged; paste() updates it in place
+        # instead of allocating a new Tk image and canvas item every frame
+        photo = self.current_photo
+        if photo is not None and (photo.width(), photo.height()) == image.size:
+            photo.paste(image)
+            self.preview_canvas.coords(self._preview_image_id, canvas_width//2, canvas_height//2)
+            return
         
         photo = ImageTk.PhotoImage(image=image)
         self.preview_canvas.delete("all")
-        self.preview_canvas.create_image(canvas_width//2, canvas_height//2, anchor=tk.CENTER, image=photo)
+        self._preview_image_id = self.preview_canvas.create_image(
+            canvas_width//2, canvas_height//2, anchor=tk.CENTER, image=photo
+        )
         self.current_photo = photo
     
     def _update_stats(self):
         """Update statistics."""
-        if self.data_manager:
-            if hasattr(self.data_manager, 'get_count'):
-                # 既存モードのデータマネージャー
-                self.unique_count_var.set(str(self.data_manager.get_count()))
-            else:
-                # 階層的データマネージャー
-                self.unique_count_var.set(str(len(self.data_manager.records)))
+        record_count = self._record_count
+        if record_count:
+            self.unique_count_var.set(str(record_count()))
         
         self.frames_var.set(str(self.stats['frames_processed']))
         self.new_detections_var.set(str(self.stats['new_detections']))
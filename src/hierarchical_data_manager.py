@@ -5,14 +5,18 @@
 曖昧マッチングによる重複排除とCSV出力を行います。
 """
 
+import logging
+from collections import Counter
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from difflib import SequenceMatcher
 import pandas as pd
 
 from src.hierarchical_detector import HierarchicalDetectionResult
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class StructuredRecord:
@@ -66,7 +70,12 @@ class HierarchicalDataManager:
         self.output_path = Path(output_path)
         self.similarity_threshold = similarity_threshold
         self.records: List[StructuredRecord] = []
+        # error_statusが"OK"以外のレコード（統計表示やエラー抽出のたびに全件走査しないよう追加時に振り分け）
+        self.error_records: List[StructuredRecord] = []
         self.titles: List[str] = []  # 曖昧マッチング用のタイトルリスト
+        # 重複と判定済みのタイトル→(一致した既存タイトル, 類似度)
+        # titlesは追加のみのため、一度重複と判定されたタイトルは以降も重複のまま変わらない
+        self._duplicate_matches: Dict[str, Tuple[str, float]] = {}
         
         print(f"HierarchicalDataManager初期化:")
         print(f"  - 出力パス: {self.output_path}")
@@ -93,12 +102,21 @@ class HierarchicalDataManager:
         if not title:
             return False
         
+        # 同じ行は画面に映っている間、毎フレーム同じタイトルで照合されるため、
+        # 判定済みのタイトルは全タイトルとの比較を省略する
+        match = self._duplicate_matches.get(title)
+        if match is not None:
+            # 同じタイトルの再検出は毎フレーム発生するため、表示はDEBUGレベルに留める
+            logger.debug(f"重複検出（判定済み）: '{title}' ≈ '{match[0]}'")
+            return True
+        
         for existing_title in self.titles:
             # SequenceMatcherで類似度を計算
             similarity = SequenceMatcher(None, title, existing_title).ratio()
             
             # 類似度がしきい値以上の場合、重複と判定
             if similarity >= self.similarity_threshold:
+                self._duplicate_matches[title] = (existing_title, similarity)
                 print(f"🔄 重複検出: '{title}' ≈ '{existing_title}' (類似度: {similarity:.2f})")
                 return True
         
@@ -145,10 +163,13 @@ class HierarchicalDataManager:
         
         # レコードを追加
         self.records.append(record)
+        if record.error_status != "OK":
+            self.error_records.append(record)
         
         # タイトルリストに追加（次回の重複チェック用）
         if title:
             self.titles.append(title)
+            self._duplicate_matches[title] = (title, 1.0)
         
         # 新規データ検出メッセージを表示
         print(f"✨ 新規データ検出: {title if title else '(タイトルなし)'}")
@@ -156,6 +177,24 @@ class HierarchicalDataManager:
         return True
 
     
+    @property
+    def error_count(self) -> int:
+        """error_statusが"OK"以外のレコード数"""
+        return len(self.error_records)
+
+    
+    def get_error_records(self) -> List[StructuredRecord]:
+        """
+        error_statusが"OK"以外のレコードを取得
+        
+        追加時に振り分け済みのリストを返すため、recordsの全件走査は発生しません。
+        
+        Returns:
+            エラーレコードのリスト（追加順）
+        """
+        return list(self.error_records)
+
+    
     def export_to_csv(self) -> None:
         """
         構造化データをCSVファイルに出力
@@ -186,10 +225,11 @@ class HierarchicalDataManager:
         # CSV出力（UTF-8エンコーディング）
         df.to_csv(self.output_path, index=False, encoding='utf-8')
         
-        # 統計情報を計算
-        total = len(self.records)
-        success = len([r for r in self.records if r.error_status == "OK"])
-        errors = total - success
+        # 統計情報を計算（エラーの内訳は振り分け済みのエラーレコードのみから集計）
+        total = len(df)
+        error_status_counts = Counter(record.error_status for record in self.error_records)
+        errors = len(self.error_records)
+        success = total - errors
         
         # 統計情報を表示
         print(f"\n✅ CSV出力完了: {self.output_path}")
@@ -200,11 +240,6 @@ class HierarchicalDataManager:
         
         # エラーの内訳を表示
         if errors > 0:
-            error_types = {}
-            for record in self.records:
-                if record.error_status != "OK":
-                    error_types[record.error_status] = error_types.get(record.error_status, 0) + 1
-            
             print(f"   エラー内訳:")
-            for error_type, count in error_types.items():
+            for error_type, count in error_status_counts.items():
                 print(f"     - {error_type}: {count}件")
@@ -6,11 +6,14 @@
 テキストを抽出します。
 """
 
+import logging
 from typing import Dict, List
 import numpy as np
 from src.hierarchical_detector import HierarchicalDetectionResult
 from src.ocr_processor import OCRProcessor
 
+logger = logging.getLogger(__name__)
+
 
 def process_hierarchical_detection(
     frame: np.ndarray,
@@ -48,26 +51,29 @@ def process_hierarchical_detection(
         ('site_name', hierarchical_result.site_name)
     ]
     
-    for element_name, detection_result in child_elements:
-        if detection_result is not None:
-            try:
-                # OCR処理を実行
-                text = ocr_processor.extract_text(frame, detection_result)
-                ocr_texts[element_name] = text
-                
-                # デバッグ情報（空でない場合のみ）
-                if text:
-                    print(f"  {element_name}: {text}")
-                    
-            except Exception as e:
-                # OCR処理エラー時は空文字列を返して処理を継続
-                print(f"❌ {element_name}のOCR処理でエラーが発生（空文字列を返して処理を継続）: {e}")
-                print(f"   bbox: ({detection_result.x1}, {detection_result.y1}, "
-                      f"{detection_result.x2}, {detection_result.y2})")
-                ocr_texts[element_name] = ''
-        else:
-            # 検出されなかった要素は空文字列
-            ocr_texts[element_name] = ''
+    # 検出された子要素のみをまとめてOCR処理
+    detected_elements = [
+        (element_name, detection_result)
+        for element_name, detection_result in child_elements
+        if detection_result is not None
+    ]
+    
+    try:
+        texts = ocr_processor.extract_text_batch(
+            frame,
+            [detection_result for _, detection_result in detected_elements]
+        )
+    except Exception as e:
+        # OCR処理エラー時は空文字列を返して処理を継続（検出されなかった要素も空文字列のまま）
+        print(f"❌ OCR処理でエラーが発生（空文字列を返して処理を継続）: {e}")
+        return ocr_texts
+    
+    for (element_name, _), text in zip(detected_elements, texts):
+        ocr_texts[element_name] = text
+        
+        # デバッグ情報（空でない場合のみ）
+        if text:
+            logger.debug(f"{element_name}: {text}")
     
     return ocr_texts
 
@@ -91,7 +97,7 @@ def process_hierarchical_detections_batch(
     ocr_results = []
     
     for idx, hierarchical_result in enumerate(hierarchical_results):
-        print(f"\n📖 list-item {idx + 1}/{len(hierarchical_results)} のOCR処理中...")
+        logger.debug(f"list-item {idx + 1}/{len(hierarchical_results)} のOCR処理中...")
         
         try:
             ocr_texts = process_hierarchical_detection(
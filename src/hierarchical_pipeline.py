@@ -6,6 +6,7 @@
 パイプライン処理を提供します。
 """
 
+import logging
 from typing import Optional
 import numpy as np
 
@@ -16,6 +17,8 @@ from src.hierarchical_data_manager import HierarchicalDataManager
 from src.session_manager import SessionManager
 from src.ocr_processor import OCRProcessor
 
+logger = logging.getLogger(__name__)
+
 
 class HierarchicalPipeline:
     """
@@ -147,7 +150,8 @@ class HierarchicalPipeline:
                 # 検出結果がない場合はスキップ
                 return 0
             
-            print(f"\n📊 フレーム {self.frame_count}: {len(hierarchical_results)}件のlist-itemを検出")
+            # 毎フレームの出力は標準出力への書き込みが重いためDEBUGレベルで記録
+            logger.debug(f"フレーム {self.frame_count}: {len(hierarchical_results)}件のlist-itemを検出")
             
             # 2. 各list-itemについて処理
             new_records_count = 0
@@ -302,10 +306,7 @@ class HierarchicalPipeline:
             'frame_count': self.frame_count,
             'processed_count': self.processed_count,
             'total_records': len(self.data_manager.records),
-            'error_records': len([
-                r for r in self.data_manager.records
-                if r.error_status != "OK"
-            ])
+            'error_records': self.data_manager.error_count
         }
     
     def open_session_folder(self) -> None:
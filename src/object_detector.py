@@ -6,6 +6,7 @@ Apple Silicon MPS対応で最適化されています。
 """
 
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import List, Optional
 from pathlib import Path
 import numpy as np
@@ -13,6 +14,13 @@ import torch
 from ultralytics import YOLO
 
 
+# 推論バックエンドごとのエクスポート済みモデルの拡張子（"pytorch"はエクスポートしない）
+EXPORT_SUFFIXES = {
+    "onnx": ".onnx",
+    "coreml": ".mlpackage",
+}
+
+
 @dataclass
 class DetectionResult:
     """
@@ -27,6 +35,10 @@ class DetectionResult:
         class_id: クラスID
         class_name: クラス名
     """
+    # 毎フレーム検出数だけ生成・参照されるため、__dict__を持たせず生成と属性参照を軽くする
+    # （dataclassのslots=TrueはPython 3.10以降のため、__slots__を直接定義）
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'confidence', 'class_id', 'class_name')
+    
     x1: int
     y1: int
     x2: int
@@ -42,20 +54,37 @@ class ObjectDetector:
     
     学習済みYOLOv8モデルを使用してフレーム内のlist-itemを検出します。
     Apple Silicon環境ではMPS（Metal Performance Shaders）を活用して高速化します。
+    
+    backendに"onnx"または"coreml"を指定すると、初回起動時に.ptモデルを
+    エクスポートしてモデルと同じディレクトリにキャッシュし、以降はエクスポート済み
+    モデルで推論します（ONNX RuntimeはApple Silicon環境でCoreMLExecutionProviderを使用）。
+    エクスポートに失敗した場合はPyTorchでの推論にフォールバックします。
+    
+    onnxバックエンドでquantize_int8を有効にすると、エクスポートしたモデルの重みを
+    ONNX Runtimeの動的量子化でINT8に変換したモデル（best.int8.onnx）を使用します。
     """
     
-    def __init__(self, model_path: str, confidence_threshold: float = 0.6):
+    def __init__(self, model_path: str, confidence_threshold: float = 0.6,
+                 backend: str = "pytorch", quantize_int8: bool = False):
         """
         ObjectDetectorを初期化
         
         Args:
             model_path: YOLOv8モデルファイル（best.pt）のパス
             confidence_threshold: 検出の信頼度しきい値（デフォルト: 0.6）
+            backend: 推論バックエンド（"pytorch", "onnx", "coreml"）
+            quantize_int8: INT8量子化モデルを使用するか（onnxバックエンドのみ有効）
         
         Raises:
+            ValueError: 未対応のバックエンドが指定された場合
             FileNotFoundError: モデルファイルが存在しない場合
             RuntimeError: モデルのロードに失敗した場合
         """
+        if backend != "pytorch" and backend not in EXPORT_SUFFIXES:
+            raise ValueError(
+                f"未対応の推論バックエンドです: {backend}（pytorch, {', '.join(EXPORT_SUFFIXES)}）"
+            )
+        
         self.model_path = Path(model_path)
         self.confidence_threshold = confidence_threshold
         
@@ -66,9 +95,31 @@ class ObjectDetector:
                 f"YOLOv8モデル（best.pt）を {self.model_path} に配置してください。"
             )
         
+        # エクスポート済みモデルの準備（失敗した場合はPyTorchで推論）
+        self.backend = "pytorch"
+        exported_path = None
+        if backend != "pytorch":
+            exported_path = self._export_model(backend)
+            if exported_path is not None:
+                self.backend = backend
+        
+        # INT8量子化（失敗した場合はFP32のONNXモデルを使用）
+        self.quantized = False
+        if quantize_int8:
+            if self.backend == "onnx" and exported_path is not None:
+                quantized_path = self._quantize_onnx(exported_path)
+                if quantized_path is not None:
+                    exported_path = quantized_path
+                    self.quantized = True
+            else:
+                print(f"[警告] INT8量子化はonnxバックエンドのみ対応しています（現在: {self.backend}）")
+        
         # YOLOv8モデルのロード
         try:
-            self.model = YOLO(str(self.model_path))
+            if exported_path is not None:
+                self.model = YOLO(str(exported_path), task="detect")
+            else:
+                self.model = YOLO(str(self.model_path))
             
             # Apple Silicon MPS対応
             if torch.backends.mps.is_available():
@@ -81,13 +132,79 @@ class ObjectDetector:
                 self.device = "cpu"
                 print("CPU を使用します")
             
-            # モデルをデバイスに転送
-            self.model.to(self.device)
-            print(f"YOLOv8モデルをロードしました: {self.model_path}")
+            # モデルをデバイスに転送（エクスポート済みモデルは推論時のdevice指定で実行先が決まる）
+            if self.backend == "pytorch":
+                self.model.to(self.device)
+                print(f"YOLOv8モデルをロードしました: {self.model_path}")
+            else:
+                # CoreMLモデルはCPU指定でもNeural Engine/GPUに自動で振り分けられる
+                if self.backend == "coreml":
+                    self.device = "cpu"
+                print(f"YOLOv8モデルをロードしました（{self.backend}）: {exported_path or self.model_path}")
             
         except Exception as e:
             raise RuntimeError(f"モデルのロードに失敗しました: {e}")
     
+    def _export_model(self, backend: str) -> Optional[Path]:
+        """.ptモデルを指定形式にエクスポート（エクスポート済みの場合は再利用）
+        
+        Args:
+            backend: エクスポート形式（"onnx", "coreml"）
+        
+        Returns:
+            エクスポート済みモデルのパス、またはエクスポートに失敗した場合None
+        """
+        exported_path = self.model_path.with_suffix(EXPORT_SUFFIXES[backend])
+        
+        # .ptモデルより新しいエクスポート済みモデルがあれば再利用
+        if exported_path.exists() and exported_path.stat().st_mtime >= self.model_path.stat().st_mtime:
+            return exported_path
+        
+        try:
+            print(f"YOLOv8モデルを{backend}形式にエクスポートしています（初回のみ）...")
+            # - onnx: 動的バッチ（detect_batch用）、CPU推論のためFP32のまま
+            # - coreml: FP16（Neural Engine向け）
+            result = YOLO(str(self.model_path)).export(
+                format=backend,
+                imgsz=640,
+                half=(backend == "coreml"),
+                dynamic=(backend == "onnx")
+            )
+            return Path(result)
+        except Exception as e:
+            print(f"[警告] {backend}形式へのエクスポートに失敗しました。PyTorchで推論します: {e}")
+            return None
+    
+    @staticmethod
+    def _quantize_onnx(onnx_path: Path) -> Optional[Path]:
+        """ONNXモデルの重みをINT8に動的量子化（量子化済みの場合は再利用）
+        
+        Args:
+            onnx_path: FP32のONNXモデルのパス
+        
+        Returns:
+            量子化済みモデルのパス、または量子化に失敗した場合None
+        """
+        quantized_path = onnx_path.with_name(f"{onnx_path.stem}.int8.onnx")
+        
+        # 元のONNXモデルより新しい量子化済みモデルがあれば再利用
+        if quantized_path.exists() and quantized_path.stat().st_mtime >= onnx_path.stat().st_mtime:
+            return quantized_path
+        
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+        except ImportError:
+            print("[警告] onnxruntimeがインストールされていないため、INT8量子化をスキップします")
+            return None
+        
+        try:
+            print("ONNXモデルをINT8に量子化しています（初回のみ）...")
+            quantize_dynamic(str(onnx_path), str(quantized_path), weight_type=QuantType.QInt8)
+            return quantized_path
+        except Exception as e:
+            print(f"[警告] INT8量子化に失敗しました。FP32モデルで推論します: {e}")
+            return None
+    
     def detect(self, frame: np.ndarray) -> List[DetectionResult]:
         """
         フレーム内の物体を検出
@@ -96,7 +213,7 @@ class ObjectDetector:
             frame: 入力画像（BGR形式のnumpy配列）
         
         Returns:
-            検出結果のリスト（座標、信頼度、クラス情報を含む）
+            検出結果のリスト（座標、信頼度、クラス情報を含む、Y座標（y1）の昇順）
         """
         if self.model is None:
             raise RuntimeError("モデルが初期化されていません")
@@ -119,33 +236,88 @@ class ObjectDetector:
         
         # 検出結果を処理
         for result in results:
-            boxes = result.boxes
+            detections.extend(self._parse_result(result))
+        
+        return detections
+    
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[DetectionResult]]:
+        """
+        複数フレームの物体を1回の推論でまとめて検出
+        
+        フレームごとに推論を呼び出す場合と比べ、前処理やデバイスへの転送、
+        モデル呼び出しの固定コストを複数フレームで分担できます。
+        
+        Args:
+            frames: 入力画像（BGR形式のnumpy配列）のリスト
+        
+        Returns:
+            フレームごとの検出結果のリスト（framesと同じ順序、各リストはY座標（y1）の昇順）
+        """
+        if self.model is None:
+            raise RuntimeError("モデルが初期化されていません")
+        
+        if not frames:
+            return []
+        
+        # CoreMLモデルはバッチサイズ1固定でエクスポートされるため1枚ずつ推論
+        if self.backend == "coreml":
+            return [self.detect(frame) for frame in frames]
+        
+        # リストで渡すとUltralyticsはlen(frames)のバッチとして推論する
+        results = self.model(
+            list(frames),
+            verbose=False,
+            device=self.device,
+            imgsz=640,
+            conf=self.confidence_threshold,
+            max_det=50
+        )
+        
+        return [self._parse_result(result) for result in results]
+    
+    def _parse_result(self, result) -> List[DetectionResult]:
+        """
+        1枚分の推論結果をDetectionResultのリストに変換
+        
+        NMSの出力は信頼度順のため、DetectionResultに変換する前に
+        配列のままY座標でソートします（後段でオブジェクトをソートし直す必要がない）。
+        
+        Args:
+            result: Ultralyticsの推論結果（Resultsオブジェクト）
+        
+        Returns:
+            検出結果のリスト（Y座標（y1）の昇順）
+        """
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return []
+        
+        # 全ボックスを1回でCPUに転送し、NumPy上でまとめてフィルタリングする
+        # （ボックスごとに.cpu()を呼ぶとMPS/CUDAでは毎回デバイスとの同期が発生する）
+        # dataの列は [x1, y1, x2, y2, (track_id), confidence, class_id]
+        data = boxes.data.cpu().numpy()
+        data = data[data[:, -2] >= self.confidence_threshold]
+        data = data[np.argsort(data[:, 1], kind='stable')]
+        
+        names = result.names
+        detections = []
+        
+        for row in data.tolist():
+            x1, y1, x2, y2 = row[:4]
+            class_id = int(row[-1])
+            
+            # DetectionResultオブジェクトを作成
+            detection = DetectionResult(
+                x1=int(x1),
+                y1=int(y1),
+                x2=int(x2),
+                y2=int(y2),
+                confidence=row[-2],
+                class_id=class_id,
+                class_name=names[class_id]
+            )
             
-            for box in boxes:
-                # 信頼度フィルタリング
-                confidence = float(box.conf[0])
-                if confidence < self.confidence_threshold:
-                    continue
-                
-                # バウンディングボックスの座標を取得
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                
-                # クラス情報を取得
-                class_id = int(box.cls[0])
-                class_name = result.names[class_id]
-                
-                # DetectionResultオブジェクトを作成
-                detection = DetectionResult(
-                    x1=int(x1),
-                    y1=int(y1),
-                    x2=int(x2),
-                    y2=int(y2),
-                    confidence=confidence,
-                    class_id=class_id,
-                    class_name=class_name
-                )
-                
-                detections.append(detection)
+            detections.append(detection)
         
         return detections
     
@@ -154,10 +326,14 @@ class ObjectDetector:
         """
         検出結果をY座標でソート（上から下）
         
+        detect()/detect_batch()の結果は既にY座標順のため、
+        それ以外から得た検出結果に対してのみ使用してください。
+        
         Args:
             detections: 検出結果のリスト
         
         Returns:
             Y座標（y1）でソートされた検出結果のリスト
         """
-        return sorted(detections, key=lambda d: d.y1)
+        # attrgetterはC実装のため、lambdaと異なり要素ごとのPythonフレーム生成がない
+        return sorted(detections, key=attrgetter('y1'))
@@ -6,11 +6,15 @@ OCR結果キャッシュモジュール
 """
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+import threading
+from typing import Dict, Optional, Set, Tuple
 import time
 
 from src.object_detector import DetectionResult
 
+# キャッシュキー: 各座標を許容誤差幅のセルに量子化した(x1, y1, x2, y2)
+_CellKey = Tuple[int, int, int, int]
+
 
 @dataclass
 class CachedOCRResult:
@@ -21,10 +25,12 @@ class CachedOCRResult:
         text: OCRで抽出されたテキスト
         bbox: バウンディングボックス情報
         timestamp: キャッシュ作成時刻（Unix時間）
+        content_hash: 切り出し画像の内容ハッシュ（OCRProcessor.content_hash()、未指定の場合None）
     """
     text: str
     bbox: DetectionResult
     timestamp: float
+    content_hash: Optional[bytes] = None
 
 
 class OCRCache:
@@ -33,6 +39,16 @@ class OCRCache:
     
     バウンディングボックスの座標が近似している領域のOCR結果を再利用することで、
     OCR処理の実行回数を削減します。
+    
+    内容ハッシュを指定した場合は、座標が近くても内容が変わった領域
+    （スクロールで別の行が同じ位置に来た場合など）のキャッシュは使用しません。
+    
+    複数のOCRワーカースレッドから呼び出されるため、参照・更新はロックで直列化します。
+    
+    エントリは座標を許容誤差幅のセルに量子化したキーで保持し、y1のセル番号（行）
+    ごとの索引も持ちます。許容誤差以内の座標は同じセルか隣接セルに入るため、
+    検索は全エントリではなく上下に隣接する3行のエントリのみを調べます。
+    縦に並ぶリスト項目では、1行あたりのエントリは通常1件です。
     """
     
     def __init__(self, position_tolerance: int = 12, ttl: float = 2.0, max_cache_size: int = 100):
@@ -44,63 +60,90 @@ class OCRCache:
             ttl: キャッシュの有効期限（秒）。デフォルトは2.0秒
             max_cache_size: 最大キャッシュサイズ。デフォルトは100エントリ
         """
-        self.cache: Dict[str, CachedOCRResult] = {}
+        self.cache: Dict[_CellKey, CachedOCRResult] = {}
         self.position_tolerance = position_tolerance
+        # セル幅（許容誤差0の場合も0除算にならないよう1ピクセル以上）
+        self._cell_size = max(1, position_tolerance)
+        # y1のセル番号 -> その行に属するキャッシュキー
+        self._rows: Dict[int, Set[_CellKey]] = {}
+        # cacheと_rowsは常に一緒に更新するため、複数のOCRワーカーからの操作を直列化する
+        self._lock = threading.Lock()
         self.ttl = ttl
         self.max_cache_size = max_cache_size
         self._cache_hits = 0
         self._cache_misses = 0
     
-    def get_cached_text(self, bbox: DetectionResult) -> Optional[str]:
+    def get_cached_text(self, bbox: DetectionResult,
+                        content_hash: Optional[bytes] = None) -> Optional[str]:
         """
         座標が近い領域のキャッシュされたテキストを取得
         
         Args:
             bbox: 検出結果（バウンディングボックス情報）
+            content_hash: 切り出し画像の内容ハッシュ（指定した場合は内容の一致も確認）
         
         Returns:
             キャッシュされたテキスト。キャッシュが存在しない場合はNone
         """
-        current_time = time.time()
-        
-        # キャッシュ内の全エントリをチェック
-        for cache_key, cached_result in list(self.cache.items()):
-            # 有効期限チェック
-            if current_time - cached_result.timestamp > self.ttl:
-                # 期限切れのエントリを削除
-                del self.cache[cache_key]
-                continue
+        with self._lock:
+            current_time = time.time()
+            row = bbox.y1 // self._cell_size
             
-            # バウンディングボックスの近似一致判定
-            if self._is_bbox_similar(bbox, cached_result.bbox):
-                self._cache_hits += 1
-                return cached_result.text
-        
-        # キャッシュミス
-        self._cache_misses += 1
-        return None
+            # 上下に隣接する行のエントリのみをチェック
+            for row_keys in (self._rows.get(row - 1), self._rows.get(row), self._rows.get(row + 1)):
+                if not row_keys:
+                    continue
+                
+                # 期限切れのエントリを削除するため、索引の複製を走査する
+                for cache_key in tuple(row_keys):
+                    cached_result = self.cache[cache_key]
+                    
+                    # 有効期限チェック
+                    if current_time - cached_result.timestamp > self.ttl:
+                        # 期限切れのエントリを削除
+                        self._remove(cache_key)
+                        continue
+                    
+                    # バウンディングボックスの近似一致判定
+                    if self._is_bbox_similar(bbox, cached_result.bbox):
+                        # 同じ位置でも内容が変わっている場合は使用しない（OCRし直した結果で上書きされる）
+                        if (content_hash is not None and cached_result.content_hash is not None and
+                                content_hash != cached_result.content_hash):
+                            continue
+                        self._cache_hits += 1
+                        return cached_result.text
+            
+            # キャッシュミス
+            self._cache_misses += 1
+            return None
     
-    def update_cache(self, bbox: DetectionResult, text: str) -> None:
+    def update_cache(self, bbox: DetectionResult, text: str,
+                     content_hash: Optional[bytes] = None) -> None:
         """
         OCR結果をキャッシュに追加
         
         Args:
             bbox: 検出結果（バウンディングボックス情報）
             text: OCRで抽出されたテキスト
+            content_hash: 切り出し画像の内容ハッシュ
         """
-        # キャッシュサイズ制限チェック
-        if len(self.cache) >= self.max_cache_size:
-            # 最も古いエントリを削除（LRU的な動作）
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k].timestamp)
-            del self.cache[oldest_key]
-        
-        cache_key = self._get_cache_key(bbox)
-        
-        self.cache[cache_key] = CachedOCRResult(
-            text=text,
-            bbox=bbox,
-            timestamp=time.time()
-        )
+        with self._lock:
+            cache_key = self._get_cache_key(bbox)
+            
+            # 同じセルのエントリは末尾に付け直す（辞書の挿入順を作成時刻順に保つ）
+            if cache_key in self.cache:
+                self._remove(cache_key)
+            elif len(self.cache) >= self.max_cache_size:
+                # 最も古いエントリ（挿入順の先頭）を削除
+                self._remove(next(iter(self.cache)))
+            
+            self.cache[cache_key] = CachedOCRResult(
+                text=text,
+                bbox=bbox,
+                timestamp=time.time(),
+                content_hash=content_hash
+            )
+            self._rows.setdefault(cache_key[1], set()).add(cache_key)
     
     def get_cache_stats(self) -> dict:
         """
@@ -126,7 +169,9 @@ class OCRCache:
     
     def clear(self) -> None:
         """キャッシュをクリア"""
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
+            self._rows.clear()
     
     def cleanup_expired(self) -> int:
         """
@@ -135,17 +180,31 @@ class OCRCache:
         Returns:
             削除されたエントリ数
         """
-        current_time = time.time()
-        expired_keys = []
-        
-        for cache_key, cached_result in self.cache.items():
-            if current_time - cached_result.timestamp > self.ttl:
-                expired_keys.append(cache_key)
-        
-        for key in expired_keys:
-            del self.cache[key]
+        with self._lock:
+            current_time = time.time()
+            expired_keys = []
+            
+            for cache_key, cached_result in self.cache.items():
+                if current_time - cached_result.timestamp > self.ttl:
+                    expired_keys.append(cache_key)
+            
+            for key in expired_keys:
+                self._remove(key)
+            
+            return len(expired_keys)
+    
+    def _remove(self, cache_key: _CellKey) -> None:
+        """
+        エントリをキャッシュと行索引から削除（_lockを保持して呼び出す）
         
-        return len(expired_keys)
+        Args:
+            cache_key: 削除するエントリのキャッシュキー
+        """
+        del self.cache[cache_key]
+        row_keys = self._rows[cache_key[1]]
+        row_keys.discard(cache_key)
+        if not row_keys:
+            del self._rows[cache_key[1]]
     
     def _is_bbox_similar(self, bbox1: DetectionResult, bbox2: DetectionResult) -> bool:
         """
@@ -168,24 +227,18 @@ class OCRCache:
             abs(bbox1.y2 - bbox2.y2) <= self.position_tolerance
         )
     
-    def _get_cache_key(self, bbox: DetectionResult) -> str:
+    def _get_cache_key(self, bbox: DetectionResult) -> _CellKey:
         """
         バウンディングボックスからキャッシュキーを生成
         
-        座標を許容誤差で丸めることで、近似した座標に対して
-        同じキーを生成します。
+        座標を許容誤差幅のセル番号に量子化することで、近似した座標に対して
+        同じキーまたは隣接したキーを生成します。
         
         Args:
             bbox: バウンディングボックス情報
         
         Returns:
-            キャッシュキー（文字列）
-        """
-        # 座標を許容誤差で丸める
-        tolerance = self.position_tolerance
-        x1_rounded = (bbox.x1 // tolerance) * tolerance
-        y1_rounded = (bbox.y1 // tolerance) * tolerance
-        x2_rounded = (bbox.x2 // tolerance) * tolerance
-        y2_rounded = (bbox.y2 // tolerance) * tolerance
-        
-        return f"{x1_rounded}_{y1_rounded}_{x2_rounded}_{y2_rounded}"
+            キャッシュキー（セル番号のタプル）
+        """
+        cell = self._cell_size
+        return (bbox.x1 // cell, bbox.y1 // cell, bbox.x2 // cell, bbox.y2 // cell)
@@ -5,12 +5,30 @@ Tesseract OCRを使用したテキスト抽出モジュール
 クリーンアップ処理を行います。
 """
 
-from typing import Optional
+from collections import OrderedDict
+from typing import List, Optional
+import hashlib
+import os
+import threading
 import numpy as np
 import cv2
 import pytesseract
 from src.object_detector import DetectionResult
 
+# TesseractのOpenMP並列化は小さな領域では逆効果で、OCRワーカーと合わせると
+# 「ワーカー数 × コア数」のスレッドが競合するため1スレッドに制限する
+# （tesserocrの読み込み前に設定する必要がある。環境変数で明示された値は尊重）
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+# tesserocr（libtesseractの直接バインディング）はオプション依存
+# 利用できる場合はプロセス起動なしでOCRを実行できる
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+    from PIL import Image
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 
 class OCRProcessor:
     """
@@ -20,7 +38,8 @@ class OCRProcessor:
     前処理とクリーンアップを行います。
     """
     
-    def __init__(self, lang: str = 'jpn', margin: int = 5, min_bbox_size: int = 20):
+    def __init__(self, lang: str = 'jpn', margin: int = 5, min_bbox_size: int = 20,
+                 use_tesserocr: bool = False, content_cache_size: int = 1024):
         """
         OCRProcessorを初期化
         
@@ -28,10 +47,23 @@ class OCRProcessor:
             lang: OCR言語コード（デフォルト: 'jpn'）
             margin: 切り出し時のマージン（ピクセル、デフォルト: 5）
             min_bbox_size: 最小バウンディングボックスサイズ（ピクセル、デフォルト: 20）
+            use_tesserocr: tesserocrがインストールされている場合、pytesseract
+                （領域ごとにtesseractプロセスを起動）の代わりに使用するか
+            content_cache_size: 切り出し画像の内容ハッシュをキーとするOCR結果キャッシュの
+                最大エントリ数（0で無効）
         """
         self.lang = lang
         self.margin = margin
         self.min_bbox_size = min_bbox_size
+        self.use_tesserocr = use_tesserocr and TESSEROCR_AVAILABLE
+        
+        # tesserocrのAPIインスタンスはスレッド間で共有できないため、スレッドごとに保持
+        self._tls = threading.local()
+        
+        # 内容ハッシュ→OCR結果のLRUキャッシュ（OCRワーカー間で共有するためロックで保護）
+        self.content_cache_size = content_cache_size
+        self._content_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._content_cache_lock = threading.Lock()
         
         # Tesseractの動作確認
         try:
@@ -55,47 +87,175 @@ class OCRProcessor:
             OCR失敗時は空文字列を返す
         """
         try:
-            # バウンディングボックスのサイズチェック（小さすぎる領域はスキップ）
-            bbox_width = bbox.x2 - bbox.x1
-            bbox_height = bbox.y2 - bbox.y1
-            
-            if bbox_width < self.min_bbox_size or bbox_height < self.min_bbox_size:
-                return ""
-            
-            # 画像の高さと幅を取得
-            height, width = frame.shape[:2]
-            
-            # マージンを追加した座標を計算（画像境界内に収める）
-            x1 = max(0, bbox.x1 - self.margin)
-            y1 = max(0, bbox.y1 - self.margin)
-            x2 = min(width, bbox.x2 + self.margin)
-            y2 = min(height, bbox.y2 + self.margin)
-            
-            # バウンディングボックス領域を切り出す
-            cropped_image = frame[y1:y2, x1:x2]
-            
-            # 切り出した画像が空でないことを確認
-            if cropped_image.size == 0:
-                return ""
+            roi = self.crop_roi(frame, bbox)
+        except Exception as e:
+            print(f"OCR処理でエラーが発生しました: {e}")
+            return ""
+        
+        if roi is None:
+            return ""
+        
+        return self.extract_text_from_roi(roi)
+
+    def extract_text_batch(self, frame: np.ndarray, bboxes: List[DetectionResult]) -> List[str]:
+        """
+        複数のバウンディングボックス領域からテキストをまとめて抽出
+        
+        tesserocr使用時は呼び出し元スレッドのAPIインスタンスに対して
+        SetImage/GetUTF8Textを繰り返すだけのため、言語データの読み込みなど
+        エンジンの初期化は領域数によらず（スレッドごとに）1回で済みます。
+        
+        Args:
+            frame: 元画像（BGR形式のnumpy配列）
+            bboxes: バウンディングボックス情報のリスト
+        
+        Returns:
+            bboxesと同じ順序の抽出テキストのリスト
+            切り出せない領域やOCR失敗時は空文字列
+        """
+        texts = []
+        
+        for bbox in bboxes:
+            try:
+                roi = self.crop_roi(frame, bbox)
+            except Exception as e:
+                print(f"OCR処理でエラーが発生しました: {e}")
+                roi = None
             
+            texts.append(self.extract_text_from_roi(roi) if roi is not None else "")
+        
+        return texts
+
+    def crop_roi(self, frame: np.ndarray, bbox: DetectionResult) -> Optional[np.ndarray]:
+        """
+        バウンディングボックス領域をマージン付きで切り出す
+        
+        切り出し結果は連続したメモリにコピーされるため、元のフレームが
+        再利用・更新されても影響を受けません。コピーはNumPy内部でGILを
+        解放して行われるため、複数のOCRワーカーから並列に呼び出せます。
+        
+        Args:
+            frame: 元画像（BGR形式のnumpy配列）
+            bbox: バウンディングボックス情報
+        
+        Returns:
+            切り出した画像。領域が小さすぎる・空の場合はNone
+        """
+        # バウンディングボックスのサイズチェック（小さすぎる領域はスキップ）
+        bbox_width = bbox.x2 - bbox.x1
+        bbox_height = bbox.y2 - bbox.y1
+        
+        if bbox_width < self.min_bbox_size or bbox_height < self.min_bbox_size:
+            return None
+        
+        # 画像の高さと幅を取得
+        height, width = frame.shape[:2]
+        
+        # マージンを追加した座標を計算（画像境界内に収める）
+        x1 = max(0, bbox.x1 - self.margin)
+        y1 = max(0, bbox.y1 - self.margin)
+        x2 = min(width, bbox.x2 + self.margin)
+        y2 = min(height, bbox.y2 + self.margin)
+        
+        # 切り出した画像が空でないことを確認
+        if x2 <= x1 or y2 <= y1:
+            return None
+        
+        # バウンディングボックス領域を連続したメモリに切り出す
+        return np.ascontiguousarray(frame[y1:y2, x1:x2])
+
+    def extract_text_from_roi(self, roi: np.ndarray, content_key: Optional[bytes] = None) -> str:
+        """
+        切り出し済みの領域からテキストを抽出
+        
+        Args:
+            roi: crop_roi()で切り出した画像
+            content_key: 呼び出し元で計算済みのcontent_hash(roi)（Noneの場合はここで計算）
+        
+        Returns:
+            抽出されたテキスト（クリーンアップ済み）
+            OCR失敗時は空文字列を返す
+        """
+        if roi.size == 0:
+            return ""
+        
+        # 同じ内容の領域は前回の結果を再利用（Tesseractを呼び出さない）
+        key = None
+        if self.content_cache_size > 0:
+            key = content_key if content_key is not None else self.content_hash(roi)
+            with self._content_cache_lock:
+                cached_text = self._content_cache.get(key)
+                if cached_text is not None:
+                    self._content_cache.move_to_end(key)
+                    return cached_text
+        
+        try:
             # OCR実行（最適化設定）
             # --psm 6: 単一の均一なテキストブロックを想定
             # --oem 3: デフォルトのOCRエンジンモード（LSTM）
-            text = pytesseract.image_to_string(
-                cropped_image,
-                lang=self.lang,
-                config='--psm 6 --oem 3'
-            )
+            if self.use_tesserocr:
+                api = self._get_tesserocr_api()
+                api.SetImage(Image.fromarray(roi))
+                text = api.GetUTF8Text()
+            else:
+                text = pytesseract.image_to_string(
+                    roi,
+                    lang=self.lang,
+                    config='--psm 6 --oem 3'
+                )
             
             # テキストをクリーンアップ
             cleaned_text = self.cleanup_text(text)
             
-            return cleaned_text
-            
         except Exception as e:
-            # OCR失敗時はエラーをキャッチして空文字列を返す
+            # OCR失敗時はエラーをキャッチして空文字列を返す（失敗結果はキャッシュしない）
             print(f"OCR処理でエラーが発生しました: {e}")
             return ""
+        
+        if key is not None:
+            with self._content_cache_lock:
+                self._content_cache[key] = cleaned_text
+                if len(self._content_cache) > self.content_cache_size:
+                    self._content_cache.popitem(last=False)
+        
+        return cleaned_text
+
+    @staticmethod
+    def content_hash(roi: np.ndarray) -> bytes:
+        """
+        切り出し画像の内容ハッシュを計算
+        
+        画素値そのもののダイジェストのため、数字1文字だけ異なる行も別の値になります。
+        画面キャプチャ由来の変化していない行は画素が完全に一致するため、
+        フレームが変わっても同じ値になります。
+        
+        Args:
+            roi: 切り出し画像（BGRまたはグレースケール）
+        
+        Returns:
+            ハッシュ値（16バイト）
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        # 画素列が同じでも形状が異なる画像は別の内容として扱う
+        digest.update(repr(roi.shape).encode())
+        digest.update(np.ascontiguousarray(roi).data)
+        return digest.digest()
+
+    def _get_tesserocr_api(self) -> "PyTessBaseAPI":
+        """
+        呼び出し元スレッド用のtesserocr APIインスタンスを取得
+        
+        初回呼び出し時に言語データを読み込んで生成し、以降は同じスレッドで再利用します。
+        OCRワーカーは常駐スレッドのため、フレームをまたいでインスタンスが維持されます。
+        
+        Returns:
+            PyTessBaseAPIインスタンス
+        """
+        api = getattr(self._tls, 'api', None)
+        if api is None:
+            api = PyTessBaseAPI(lang=self.lang, psm=PSM.SINGLE_BLOCK, oem=OEM.DEFAULT)
+            self._tls.api = api
+        return api
 
     @staticmethod
     def cleanup_text(text: str) -> str:
@@ -0,0 +1,196 @@
+"""
+OCRワーカープールモジュール
+
+このモジュールは、OCR処理用の常駐ワーカースレッドプールを提供します。
+ThreadPoolExecutorは全ワーカーが1つの共有キュー（ロック付き）から
+タスクを取り出しますが、本プールではワーカーごとに受信箱を持たせ、
+投入時に最も空いているワーカーへ振り分けます。
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 受信箱に積むタスク: (Future, 関数, 引数)
+_Task = Tuple[Future, Callable[..., Any], Tuple[Any, ...]]
+
+
+class OCRWorkerPool:
+    """ワーカーごとの受信箱を持つ常駐スレッドプール
+
+    各ワーカーはcollections.dequeの受信箱とthreading.Eventを持ちます。
+    submit()は負荷（受信箱のタスク数＋実行中のタスク数）が最も小さいワーカーの
+    受信箱に追加してEventを立て、ワーカーは自分の受信箱が空になると
+    他のワーカーの受信箱からタスクを奪って処理します（ワークスティーリング）。
+    実行中のワーカーも負荷に数えるため、待機中のワーカーがいる間は
+    実行中のワーカーの受信箱にタスクが積まれることはありません。
+
+    submit()はconcurrent.futures.Futureを返すため、as_completed()等の
+    標準APIでそのまま結果を回収できます。
+
+    Note:
+        受信箱の長さに上限はありません。投入数はPipelineProcessorの
+        投入枠セマフォで制限されます。
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "OCRWorker",
+                 initializer: Optional[Callable[[int], None]] = None):
+        """
+        OCRWorkerPoolを初期化し、ワーカースレッドを起動
+
+        Args:
+            max_workers: ワーカースレッド数
+            thread_name_prefix: ワーカースレッド名の接頭辞
+            initializer: 各ワーカースレッドの開始時にワーカー番号を渡して呼び出す関数
+
+        Raises:
+            ValueError: max_workersが1未満の場合
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workersは1以上である必要があります: {max_workers}")
+
+        self._inboxes: List[Deque[_Task]] = [deque() for _ in range(max_workers)]
+        self._events: List[threading.Event] = [threading.Event() for _ in range(max_workers)]
+        # ワーカーごとの実行中タスク数（0または1、各ワーカーのみ更新）
+        # 受信箱が空でも実行中のワーカーは待機中のワーカーより負荷が高いとみなす
+        self._running: List[int] = [0] * max_workers
+        self._submit_lock = threading.Lock()
+        self._shutdown = False
+        self._initializer = initializer
+
+        self._threads: List[threading.Thread] = []
+        for index in range(max_workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(index,),
+                name=f"{thread_name_prefix}_{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """タスクを最も空いているワーカーに投入
+
+        Args:
+            fn: 実行する関数
+            *args: 関数に渡す引数
+
+        Returns:
+            タスクの結果を受け取るFuture
+
+        Raises:
+            RuntimeError: shutdown()後に呼び出された場合
+        """
+        future: Future = Future()
+
+        with self._submit_lock:
+            if self._shutdown:
+                raise RuntimeError("shutdown後のOCRWorkerPoolにはタスクを投入できません")
+
+            index = min(
+                range(len(self._inboxes)),
+                key=lambda i: len(self._inboxes[i]) + self._running[i]
+            )
+            self._inboxes[index].append((future, fn, args))
+
+        self._events[index].set()
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """プールを停止
+
+        Args:
+            wait: ワーカースレッドの終了を待つか
+            cancel_futures: 未着手のタスクをキャンセルするか
+        """
+        with self._submit_lock:
+            self._shutdown = True
+
+        if cancel_futures:
+            for inbox in self._inboxes:
+                while True:
+                    try:
+                        future, _, _ = inbox.popleft()
+                    except IndexError:
+                        break
+                    future.cancel()
+
+        # 待機中のワーカーを起こして終了させる
+        for event in self._events:
+            event.set()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _next_task(self, index: int) -> Optional[_Task]:
+        """自分の受信箱、空なら他のワーカーの受信箱からタスクを取得
+
+        Args:
+            index: ワーカー番号
+
+        Returns:
+            取得したタスク、またはどの受信箱も空の場合None
+        """
+        try:
+            return self._inboxes[index].popleft()
+        except IndexError:
+            pass
+
+        # 他のワーカーの受信箱の末尾から奪う（持ち主の先頭側と競合しにくい）
+        for offset in range(1, len(self._inboxes)):
+            victim = self._inboxes[(index + offset) % len(self._inboxes)]
+            try:
+                return victim.pop()
+            except IndexError:
+                continue
+
+        return None
+
+    def _worker_loop(self, index: int) -> None:
+        """ワーカースレッドのメインループ
+
+        Args:
+            index: ワーカー番号
+        """
+        event = self._events[index]
+
+        if self._initializer is not None:
+            try:
+                self._initializer(index)
+            except Exception as e:
+                # 初期化に失敗してもワーカーとしては動作させる
+                logger.warning(f"OCR worker {index} initializer failed: {e}")
+
+        while True:
+            task = self._next_task(index)
+
+            if task is None:
+                if self._shutdown:
+                    break
+                # 投入側はタスク追加後にEventを立てるため、
+                # clear後の再確認でタスクを取りこぼすことはない
+                event.wait()
+                event.clear()
+                continue
+
+            future, fn, args = task
+
+            # キャンセル済みのタスクはスキップ
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            self._running[index] = 1
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                self._running[index] = 0
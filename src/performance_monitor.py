@@ -5,17 +5,63 @@
 各処理ステップの実行時間、FPS、キャッシュヒット率、メモリ使用量などのメトリクスを収集します。
 """
 
-import time
+import itertools
+import sys
 import psutil
 import os
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+# 毎フレーム呼び出す時計関数は、timeモジュールの属性参照を省くため直接インポートする
+from time import perf_counter, perf_counter_ns
+from typing import Deque, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Any
 from collections import deque
 
 
-@dataclass
-class PerformanceMetrics:
-    """パフォーマンスメトリクス"""
+# レポート出力用の区切り線（呼び出し毎の文字列生成を避けるため事前に作成）
+_BANNER_EQ = "=" * 50
+_BANNER_DASH = "-" * 50
+
+# レポート出力テンプレート（%書式で一括整形する）
+_REPORT_HEADER_TMPL = (
+    "\n" + _BANNER_EQ + "\n"
+    "パフォーマンスレポート\n"
+    + _BANNER_EQ + "\n"
+    "FPS: %.2f\n"
+    "処理フレーム数: %d\n"
+    "スキップフレーム数: %d\n"
+    + _BANNER_DASH + "\n"
+    "平均キャプチャ時間: %.2f ms\n"
+    "平均検出時間: %.2f ms\n"
+    "平均OCR時間: %.2f ms\n"
+    "平均表示時間: %.2f ms\n"
+    + _BANNER_DASH + "\n"
+)
+_REPORT_BREAKDOWN_TMPL = (
+    "処理時間の内訳:\n"
+    "  キャプチャ: %.1f%%\n"
+    "  検出: %.1f%%\n"
+    "  OCR: %.1f%%\n"
+    "  表示: %.1f%%\n"
+    "合計処理時間: %.2f ms\n"
+    "理論最大FPS: %.2f\n"
+)
+_REPORT_FOOTER_TMPL = (
+    _BANNER_DASH + "\n"
+    "キャッシュヒット率: %.1f%%\n"
+    "キャッシュヒット数: %d\n"
+    "キャッシュミス数: %d\n"
+    + _BANNER_DASH + "\n"
+    "メモリ使用量: %.1f MB (%.1f%%)\n"
+)
+_REPORT_WARNINGS_HEADER = "\n" + _BANNER_EQ + "\nパフォーマンス改善の提案:\n" + _BANNER_EQ + "\n"
+_REPORT_END = _BANNER_EQ + "\n\n"
+
+# レポートで集計する処理ステップ（表示順）
+_STAGE_NAMES = ('capture', 'detection', 'ocr', 'display')
+_STAGE_NAME_SET = frozenset(_STAGE_NAMES)
+
+
+class PerformanceMetrics(NamedTuple):
+    """パフォーマンスメトリクス（不変のスナップショット）"""
     fps: float = 0.0
     avg_capture_time: float = 0.0
     avg_detection_time: float = 0.0
@@ -29,17 +75,26 @@ class PerformanceMetrics:
 
 
 class FPSCounter:
-    """FPSカウンター"""
+    """FPSカウンター
+    
+    フレーム間隔の指数移動平均（EWMA）からFPSを算出します。
+    履歴を保持しないため、メモリ使用量・更新コストともにO(1)です。
+    フレーム間隔はtime.perf_counter()で計測するため、システム時刻の補正
+    （NTP同期など）で負の間隔や極端な間隔が混入することはありません。
+    """
     
-    def __init__(self, window_size: int = 30):
+    def __init__(self, window_size: int = 30) -> None:
         """
         FPSカウンターを初期化
         
         Args:
-            window_size: FPS計算に使用する直近のフレーム数
+            window_size: 平滑化の目安となるフレーム数
+                         （平滑化係数 alpha = 2 / (window_size + 1)）
         """
         self.window_size = window_size
-        self.frame_times: deque = deque(maxlen=window_size)
+        self._alpha = 2.0 / (window_size + 1)
+        self._ewma = 0.0
+        self._initialized = False
         self.last_update_time: Optional[float] = None
     
     def update(self) -> float:
@@ -49,11 +104,15 @@ class FPSCounter:
         Returns:
             現在のFPS
         """
-        current_time = time.time()
+        current_time = perf_counter()
         
         if self.last_update_time is not None:
             frame_time = current_time - self.last_update_time
-            self.frame_times.append(frame_time)
+            if self._initialized:
+                self._ewma += self._alpha * (frame_time - self._ewma)
+            else:
+                self._ewma = frame_time
+                self._initialized = True
         
         self.last_update_time = current_time
         
@@ -66,54 +125,144 @@ class FPSCounter:
         Returns:
             FPS値（フレームタイムが記録されていない場合は0.0）
         """
-        if len(self.frame_times) == 0:
+        if not self._initialized or self._ewma == 0:
             return 0.0
         
-        avg_frame_time = sum(self.frame_times) / len(self.frame_times)
-        
-        if avg_frame_time == 0:
-            return 0.0
-        
-        return 1.0 / avg_frame_time
+        return 1.0 / self._ewma
     
     def reset(self) -> None:
         """FPSカウンターをリセット"""
-        self.frame_times.clear()
+        self._ewma = 0.0
+        self._initialized = False
         self.last_update_time = None
 
 
+# タイマー未開始を表す開始時刻（perf_counter_ns()は負の値を返さない）
+_TIMER_NOT_STARTED = -1
+
+
+class _StageTimers:
+    """既知の処理ステップのタイマー開始時刻（ナノ秒、未開始は_TIMER_NOT_STARTED）
+    
+    辞書ではなくスロット属性で保持し、start_timer/end_timerの文字列ハッシュと
+    辞書操作を避けます。
+    """
+    __slots__ = _STAGE_NAMES
+    
+    def __init__(self) -> None:
+        # mypycでコンパイルする場合も属性を静的に解決できるよう個別に代入する
+        self.capture = _TIMER_NOT_STARTED
+        self.detection = _TIMER_NOT_STARTED
+        self.ocr = _TIMER_NOT_STARTED
+        self.display = _TIMER_NOT_STARTED
+
+
 class PerformanceMonitor:
     """パフォーマンス計測クラス"""
     
-    def __init__(self, history_size: int = 100):
+    def __init__(self, history_size: int = 100, sample_every: int = 1,
+                 enabled_metrics: Optional[Iterable[str]] = None) -> None:
         """
         パフォーマンスモニターを初期化
         
         Args:
             history_size: 各メトリクスの履歴保持数
+            sample_every: timer()で計測するフレーム間隔（Nフレームに1回計測、1=全フレーム）。
+                          間引くほど計測コストは下がるが、突発的な遅延を見逃しやすくなる
+            enabled_metrics: 計測するメトリクス名（例: {"capture", "ocr"}）。
+                             含まれない名前のタイマー・記録は何もしない。Noneの場合は全て計測
+        
+        Raises:
+            ValueError: sample_everyが1未満の場合
         """
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be >= 1, got {sample_every}")
+        
         self.history_size = history_size
-        self.metrics: Dict[str, deque] = {}
-        self.timers: Dict[str, float] = {}
+        self.sample_every = sample_every
+        self._enabled: Optional[FrozenSet[str]] = (
+            frozenset(enabled_metrics) if enabled_metrics is not None else None
+        )
+        self.metrics: Dict[str, Deque[float]] = {}
+        self._sums: Dict[str, float] = {}  # 各メトリクス履歴の合計（平均計算用）
+        self.timers: Dict[str, int] = {}  # 既知ステップ以外のタイマー（開始時刻、ナノ秒）
+        self._stage_timers = _StageTimers()
         self.fps_counter = FPSCounter()
+        self._last_fps = 0.0  # 直近のupdate_fps()で算出したFPS
+        self._init_stage_metrics()
         
         # カウンター
-        self.frames_processed = 0
-        self.frames_skipped = 0
-        self.cache_hits = 0
-        self.cache_misses = 0
+        self._init_counters()
+        
+        # print_report/get_metrics_object用に再利用するレポートバッファ
+        self._report_buf: Dict[str, Any] = {}
         
         # プロセス情報（メモリ使用量計測用）
         self.process = psutil.Process(os.getpid())
     
+    def _init_counters(self) -> None:
+        """
+        カウンターを初期化
+        
+        各カウンターはitertools.countで採番します。next()はC実装で1回の呼び出しとして
+        完結するため、複数スレッド（キャプチャ/検出/OCRワーカー）から同時に加算しても
+        `+= 1`のような読み込み・加算・書き込みの競合でカウントが失われません。
+        公開値は最後に採番された値を保持するため、同時加算の最中は一時的に
+        数件遅れた値が読まれる場合があります（統計表示用途では問題になりません）。
+        """
+        self._frames_processed_iter: Iterator[int] = itertools.count(1)
+        self._frames_skipped_iter: Iterator[int] = itertools.count(1)
+        self._cache_hits_iter: Iterator[int] = itertools.count(1)
+        self._cache_misses_iter: Iterator[int] = itertools.count(1)
+        self._frames_processed = 0
+        self._frames_skipped = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    @property
+    def frames_processed(self) -> int:
+        """処理フレーム数"""
+        return self._frames_processed
+    
+    @property
+    def frames_skipped(self) -> int:
+        """スキップフレーム数"""
+        return self._frames_skipped
+    
+    @property
+    def cache_hits(self) -> int:
+        """キャッシュヒット数"""
+        return self._cache_hits
+    
+    @property
+    def cache_misses(self) -> int:
+        """キャッシュミス数"""
+        return self._cache_misses
+    
+    def _init_stage_metrics(self) -> None:
+        """既知の処理ステップの履歴を事前に確保（end_timerでの辞書ミスを回避）"""
+        for name in _STAGE_NAMES:
+            self.metrics[name] = deque(maxlen=self.history_size)
+            self._sums[name] = 0.0
+    
     def start_timer(self, name: str) -> None:
         """
         タイマーを開始
         
+        開始時刻はtime.perf_counter_ns()の整数値で保持し、経過時間は
+        end_timer()で記録する時点で一度だけ秒に変換します。
+        計測対象外のメトリクス（enabled_metricsに含まれない名前）では何もしません。
+        
         Args:
             name: タイマー名（例: "capture", "detection", "ocr"）
         """
-        self.timers[name] = time.time()
+        if self._enabled is not None and name not in self._enabled:
+            return
+        
+        if name in _STAGE_NAME_SET:
+            setattr(self._stage_timers, name, perf_counter_ns())
+        else:
+            self.timers[name] = perf_counter_ns()
     
     def end_timer(self, name: str) -> float:
         """
@@ -123,28 +272,99 @@ class PerformanceMonitor:
             name: タイマー名
             
         Returns:
-            経過時間（秒）
+            経過時間（秒）。計測対象外のメトリクスの場合は0.0
             
         Raises:
             KeyError: 指定されたタイマーが開始されていない場合
         """
-        if name not in self.timers:
-            raise KeyError(f"Timer '{name}' was not started")
+        if self._enabled is not None and name not in self._enabled:
+            return 0.0
         
-        start_time = self.timers[name]
-        elapsed = time.time() - start_time
+        end_time = perf_counter_ns()
         
-        # メトリクスに記録
-        if name not in self.metrics:
-            self.metrics[name] = deque(maxlen=self.history_size)
+        if name in _STAGE_NAME_SET:
+            start_time: int = getattr(self._stage_timers, name)
+            if start_time == _TIMER_NOT_STARTED:
+                raise KeyError(f"Timer '{name}' was not started")
+            setattr(self._stage_timers, name, _TIMER_NOT_STARTED)
+        else:
+            if name not in self.timers:
+                raise KeyError(f"Timer '{name}' was not started")
+            start_time = self.timers.pop(name)
         
-        self.metrics[name].append(elapsed)
-        
-        # タイマーをクリア
-        del self.timers[name]
+        elapsed = (end_time - start_time) * 1e-9
+        self._record(name, elapsed)
         
         return elapsed
     
+    def should_sample(self) -> bool:
+        """
+        現在のフレームを計測対象とするか判定
+        
+        update_fps()で数えたフレーム番号がsample_everyの倍数の場合に計測します。
+        
+        Returns:
+            計測対象の場合True
+        """
+        return self.frames_processed % self.sample_every == 0
+    
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        withブロックの実行時間を計測するコンテキストマネージャー
+        
+        開始時刻をローカルに保持するため、同じ名前を複数スレッドから
+        同時に計測しても互いに上書きしません。計測対象外のフレーム
+        （should_sample()がFalse）やメトリクスでは何も記録しません。
+        ブロック内で例外が発生した場合は記録しません。
+        
+        Args:
+            name: タイマー名（例: "capture", "detection", "ocr"）
+        """
+        if not self.should_sample() or (self._enabled is not None and name not in self._enabled):
+            yield
+            return
+        
+        start_time = perf_counter_ns()
+        yield
+        self._record(name, (perf_counter_ns() - start_time) * 1e-9)
+    
+    def record_ns(self, name: str, elapsed_ns: int) -> None:
+        """
+        呼び出し側で計測したナノ秒単位の経過時間を記録
+        
+        ホットパスでは`t0 = time.perf_counter_ns()`で計測した差分を渡すことで、
+        timer()のジェネレータ生成やstart_timer/end_timerの開始時刻の保存を省けます。
+        計測対象外のフレーム（should_sample()がFalse）やメトリクスでは何も記録しません。
+        
+        Args:
+            name: メトリクス名（例: "capture", "detection", "ocr"）
+            elapsed_ns: 経過時間（ナノ秒）
+        """
+        if self.frames_processed % self.sample_every == 0 and (
+                self._enabled is None or name in self._enabled):
+            self._record(name, elapsed_ns * 1e-9)
+    
+    def _record(self, name: str, elapsed: float) -> None:
+        """
+        経過時間をメトリクス履歴に記録
+        
+        Args:
+            name: メトリクス名
+            elapsed: 経過時間（秒）
+        """
+        # メトリクスに記録（既知のステップは事前確保済み、未知の名前のみ新規作成）
+        history = self.metrics.get(name)
+        if history is None:
+            history = self.metrics[name] = deque(maxlen=self.history_size)
+            self._sums[name] = 0.0
+        
+        # 履歴が満杯の場合、押し出される値を合計から差し引く
+        if len(history) == history.maxlen:
+            self._sums[name] -= history[0]
+        history.append(elapsed)
+        self._sums[name] += elapsed
+    
     def get_average(self, name: str) -> float:
         """
         指定されたメトリクスの平均値を取得
@@ -158,7 +378,22 @@ class PerformanceMonitor:
         if name not in self.metrics or len(self.metrics[name]) == 0:
             return 0.0
         
-        return sum(self.metrics[name]) / len(self.metrics[name])
+        return self._sums[name] / len(self.metrics[name])
+    
+    def _stage_averages(self) -> tuple[float, float, float, float]:
+        """
+        各処理ステップ（キャプチャ、検出、OCR、表示）の平均時間を取得
+        
+        Returns:
+            (キャプチャ, 検出, OCR, 表示)の平均時間（秒）のタプル
+        """
+        metrics = self.metrics
+        sums = self._sums
+        capture, detection, ocr, display = (
+            sums[name] / len(metrics[name]) if metrics[name] else 0.0
+            for name in _STAGE_NAMES
+        )
+        return capture, detection, ocr, display
     
     def update_fps(self) -> float:
         """
@@ -167,20 +402,21 @@ class PerformanceMonitor:
         Returns:
             現在のFPS
         """
-        self.frames_processed += 1
-        return self.fps_counter.update()
+        self._frames_processed = next(self._frames_processed_iter)
+        self._last_fps = self.fps_counter.update()
+        return self._last_fps
     
     def record_frame_skip(self) -> None:
         """フレームスキップを記録"""
-        self.frames_skipped += 1
+        self._frames_skipped = next(self._frames_skipped_iter)
     
     def record_cache_hit(self) -> None:
         """キャッシュヒットを記録"""
-        self.cache_hits += 1
+        self._cache_hits = next(self._cache_hits_iter)
     
     def record_cache_miss(self) -> None:
         """キャッシュミスを記録"""
-        self.cache_misses += 1
+        self._cache_misses = next(self._cache_misses_iter)
     
     def get_cache_hit_rate(self) -> float:
         """
@@ -216,98 +452,121 @@ class PerformanceMonitor:
         パフォーマンスレポートを取得
         
         Returns:
-            パフォーマンスメトリクスを含む辞書
+            パフォーマンスメトリクスを含む辞書（呼び出し毎に新しい辞書）
         """
-        memory_mb, memory_percent = self.get_memory_usage()
+        return self.fill_report({})
+    
+    def fill_report(self, out: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        呼び出し側の辞書にパフォーマンスレポートを書き込む
+        
+        定期的にレポートを取得する場合に、同じ辞書を使い回して
+        辞書の確保を避けるために使用します。
         
-        return {
-            'fps': self.fps_counter.get_fps(),
-            'avg_capture_time': self.get_average('capture'),
-            'avg_detection_time': self.get_average('detection'),
-            'avg_ocr_time': self.get_average('ocr'),
-            'avg_display_time': self.get_average('display'),
-            'cache_hit_rate': self.get_cache_hit_rate(),
-            'frames_processed': self.frames_processed,
-            'frames_skipped': self.frames_skipped,
-            'cache_hits': self.cache_hits,
-            'cache_misses': self.cache_misses,
-            'memory_usage_mb': memory_mb,
-            'memory_percent': memory_percent,
-        }
+        Args:
+            out: 書き込み先の辞書（既存のキーは上書きされる）
+        
+        Returns:
+            書き込み済みのout
+        """
+        memory_mb, memory_percent = self.get_memory_usage()
+        avg_capture, avg_detection, avg_ocr, avg_display = self._stage_averages()
+        
+        out['fps'] = self._last_fps
+        out['avg_capture_time'] = avg_capture
+        out['avg_detection_time'] = avg_detection
+        out['avg_ocr_time'] = avg_ocr
+        out['avg_display_time'] = avg_display
+        out['cache_hit_rate'] = self.get_cache_hit_rate()
+        out['frames_processed'] = self.frames_processed
+        out['frames_skipped'] = self.frames_skipped
+        out['cache_hits'] = self.cache_hits
+        out['cache_misses'] = self.cache_misses
+        out['memory_usage_mb'] = memory_mb
+        out['memory_percent'] = memory_percent
+        return out
     
     def get_metrics_object(self) -> PerformanceMetrics:
         """
-        パフォーマンスメトリクスをデータクラスとして取得
+        パフォーマンスメトリクスを不変のスナップショットとして取得
         
         Returns:
             PerformanceMetricsオブジェクト
         """
-        report = self.get_report()
+        report = self.fill_report(self._report_buf)
         return PerformanceMetrics(
-            fps=report['fps'],
-            avg_capture_time=report['avg_capture_time'],
-            avg_detection_time=report['avg_detection_time'],
-            avg_ocr_time=report['avg_ocr_time'],
-            avg_display_time=report['avg_display_time'],
-            cache_hit_rate=report['cache_hit_rate'],
-            frames_processed=report['frames_processed'],
-            frames_skipped=report['frames_skipped'],
-            memory_usage_mb=report['memory_usage_mb'],
-            memory_percent=report['memory_percent'],
+            report['fps'],
+            report['avg_capture_time'],
+            report['avg_detection_time'],
+            report['avg_ocr_time'],
+            report['avg_display_time'],
+            report['cache_hit_rate'],
+            report['frames_processed'],
+            report['frames_skipped'],
+            report['memory_usage_mb'],
+            report['memory_percent'],
         )
     
     def reset(self) -> None:
         """全てのメトリクスをリセット"""
         self.metrics.clear()
+        self._sums.clear()
+        self._init_stage_metrics()
         self.timers.clear()
+        self._stage_timers = _StageTimers()
         self.fps_counter.reset()
-        self.frames_processed = 0
-        self.frames_skipped = 0
-        self.cache_hits = 0
-        self.cache_misses = 0
+        self._last_fps = 0.0
+        self._init_counters()
     
     def print_report(self) -> None:
-        """パフォーマンスレポートをコンソールに出力"""
-        report = self.get_report()
-        
-        print("\n" + "="*50)
-        print("パフォーマンスレポート")
-        print("="*50)
-        print(f"FPS: {report['fps']:.2f}")
-        print(f"処理フレーム数: {report['frames_processed']}")
-        print(f"スキップフレーム数: {report['frames_skipped']}")
-        print("-"*50)
-        print(f"平均キャプチャ時間: {report['avg_capture_time']*1000:.2f} ms")
-        print(f"平均検出時間: {report['avg_detection_time']*1000:.2f} ms")
-        print(f"平均OCR時間: {report['avg_ocr_time']*1000:.2f} ms")
-        print(f"平均表示時間: {report['avg_display_time']*1000:.2f} ms")
-        print("-"*50)
+        """パフォーマンスレポートをコンソールに出力
+        
+        全行をまとめて組み立て、1回の書き込みで出力します。
+        """
+        report = self.fill_report(self._report_buf)
+        avg_capture, avg_detection, avg_ocr, avg_display = (
+            report['avg_capture_time'], report['avg_detection_time'],
+            report['avg_ocr_time'], report['avg_display_time']
+        )
+        
+        chunks = [_REPORT_HEADER_TMPL % (
+            report['fps'],
+            report['frames_processed'],
+            report['frames_skipped'],
+            avg_capture * 1000,
+            avg_detection * 1000,
+            avg_ocr * 1000,
+            avg_display * 1000,
+        )]
         
         # 合計処理時間とボトルネック分析
-        total_time = (report['avg_capture_time'] + report['avg_detection_time'] + 
-                     report['avg_ocr_time'] + report['avg_display_time'])
-        
-        if total_time > 0:
-            print("処理時間の内訳:")
-            print(f"  キャプチャ: {report['avg_capture_time']/total_time*100:.1f}%")
-            print(f"  検出: {report['avg_detection_time']/total_time*100:.1f}%")
-            print(f"  OCR: {report['avg_ocr_time']/total_time*100:.1f}%")
-            print(f"  表示: {report['avg_display_time']/total_time*100:.1f}%")
-            print(f"合計処理時間: {total_time*1000:.2f} ms")
-            print(f"理論最大FPS: {1.0/total_time:.2f}")
-        
-        print("-"*50)
-        print(f"キャッシュヒット率: {report['cache_hit_rate']*100:.1f}%")
-        print(f"キャッシュヒット数: {report['cache_hits']}")
-        print(f"キャッシュミス数: {report['cache_misses']}")
-        print("-"*50)
-        print(f"メモリ使用量: {report['memory_usage_mb']:.1f} MB ({report['memory_percent']:.1f}%)")
+        total_time = avg_capture + avg_detection + avg_ocr + avg_display
+        
+        # 合計がほぼ0の場合は内訳の文字列生成自体をスキップ
+        if total_time >= 1e-9:
+            percent_scale = 100.0 / total_time
+            chunks.append(_REPORT_BREAKDOWN_TMPL % (
+                avg_capture * percent_scale,
+                avg_detection * percent_scale,
+                avg_ocr * percent_scale,
+                avg_display * percent_scale,
+                total_time * 1000,
+                1.0 / total_time,
+            ))
+        
+        chunks.append(_REPORT_FOOTER_TMPL % (
+            report['cache_hit_rate'] * 100,
+            report['cache_hits'],
+            report['cache_misses'],
+            report['memory_usage_mb'],
+            report['memory_percent'],
+        ))
         
         # ボトルネック警告
         warnings = []
-        if report['avg_detection_time'] > 0.2:
+        if avg_detection > 0.2:
             warnings.append("⚠️  検出処理が遅い（>200ms）- 信頼度しきい値を上げるか、高速モードに切り替えてください")
-        if report['avg_ocr_time'] > 0.3:
+        if avg_ocr > 0.3:
             warnings.append("⚠️  OCR処理が遅い（>300ms）- 検出数を減らすか、OCRマージンを小さくしてください")
         if report['cache_hit_rate'] < 0.5 and report['cache_hits'] + report['cache_misses'] > 10:
             warnings.append("⚠️  キャッシュヒット率が低い（<50%）- 画面が頻繁に変化している可能性があります")
@@ -317,10 +576,10 @@ class PerformanceMonitor:
             warnings.append("⚠️  FPSが低い（<3）- パフォーマンスモードを高速に切り替えるか、ウィンドウサイズを小さくしてください")
         
         if warnings:
-            print("\n" + "="*50)
-            print("パフォーマンス改善の提案:")
-            print("="*50)
-            for warning in warnings:
-                print(warning)
+            chunks.append(_REPORT_WARNINGS_HEADER)
+            chunks.append("\n".join(warnings) + "\n")
+        
+        chunks.append(_REPORT_END)
         
-        print("="*50 + "\n")
+        # 1回の書き込みで出力（行ごとのprintによるロック取得・書き込みを回避）
+        sys.stdout.write("".join(chunks))
@@ -5,13 +5,15 @@
 キャプチャ、検出、OCR処理を独立したスレッドで実行し、高いパフォーマンスを実現します。
 """
 
+import os
 import queue
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, List, Callable
+from concurrent.futures import Future
+from typing import Optional, List, Callable, Tuple, Union
 import logging
 
+import cv2
 import numpy as np
 
 from src.config import AppConfig
@@ -23,11 +25,27 @@ from src.detection_cache import DetectionCache
 from src.ocr_cache import OCRCache
 from src.performance_monitor import PerformanceMonitor
 from src.performance_mode import PerformanceMode, get_performance_mode
+from src.spsc_ring import SPSCRing
+from src.frame_pool import FramePool
+from src.frame_diff import FrameDiffDetector
+from src.ocr_worker_pool import OCRWorkerPool
+from src.thread_affinity import CPUPinPlan, available_cpus, compute_pin_plan, pin_current_thread
 from src.visualizer import Visualizer
 
 # ロガー設定
 logger = logging.getLogger(__name__)
 
+# キャプチャの最小間隔（秒）。検出が速い場合でも約30FPSを上限とする
+CAPTURE_MIN_INTERVAL = 0.033
+
+# 検出スレッドが1回の推論でまとめて処理するフレーム数の上限
+# （実際にはフレームリングに溜まっている分のみ。リング容量を超えることはない）
+DETECTION_MAX_BATCH = 4
+
+# 表示側がこの時間（秒）以上get_display_frame()を呼んでいない場合は描画を省略する
+# （GUIは最大0.1秒待機する呼び出しを繰り返すため、描画処理の時間を見込んで余裕を持たせる）
+DISPLAY_CONSUMER_TIMEOUT = 0.5
+
 
 class PipelineProcessor:
     """パイプライン処理マネージャー
@@ -35,10 +53,10 @@ class PipelineProcessor:
     キャプチャ、検出、OCR処理を並列実行し、高速なリアルタイムOCR処理を実現します。
     
     処理フロー:
-        [キャプチャスレッド] → [フレームキュー] → [検出スレッド] → [検出結果キュー] 
+        [キャプチャスレッド] → [フレームリング] → [検出スレッド] → [検出結果キュー] 
         → [OCRスレッドプール] → [データマネージャー]
                                     ↓
-        [表示スレッド] ← [表示キュー] ←┘
+        [表示スレッド] ← [表示スロット] ←┘
     """
     
     def __init__(self, config: AppConfig, performance_mode: str = "balanced",
@@ -78,24 +96,80 @@ class PipelineProcessor:
         else:
             self.ocr_cache = None
         
+        # 静止フレーム判定（しきい値が0以下の場合は無効）
+        if config.frame_diff_threshold > 0:
+            self.frame_diff: Optional[FrameDiffDetector] = FrameDiffDetector(config.frame_diff_threshold)
+        else:
+            self.frame_diff = None
+        # 静止フレームで再利用する直前の検出結果
+        self._last_detections: List[DetectionResult] = []
+        # 最後に表示スロットへ送信したフレームの検出結果（静止フレームの表示省略の判定用）
+        self._displayed_detections: Optional[List[DetectionResult]] = None
+        # 直前の検出結果のうち、OCRの投入枠が埋まっていて投入できなかった領域
+        # （静止フレームでは検出・OCRを行わないため、次の静止フレームで投入し直す）
+        self._pending_ocr: List[DetectionResult] = []
+        
         # Performance monitoring
         self.performance_monitor = PerformanceMonitor()
         
         # Threads and queues
-        self.frame_queue: queue.Queue = queue.Queue(maxsize=2)
+        # キャプチャ→検出は単一プロデューサ・単一コンシューマのためロック不要のリングを使用
+        self.frame_queue = SPSCRing(capacity=2)
+        # キャプチャ用バッファプール（キャプチャ中・リング内・検出中・OCR中のフレームを賄う）
+        self.frame_pool = FramePool(size=6)
+        # 検出スレッドが消費したフレーム数だけキャプチャを許可するクレジット
+        self._frame_credit = threading.Semaphore(self.frame_queue.capacity)
         self.detection_queue: queue.Queue = queue.Queue(maxsize=5)
-        self.display_queue: queue.Queue = queue.Queue(maxsize=2)
+        # 表示は常に最新フレームのみ必要なため、1枠のスロットで受け渡す
+        self._display_frame: Optional[Union[np.ndarray, cv2.UMat]] = None
+        self._display_lock = threading.Lock()
+        self._display_ready = threading.Event()
+        # 表示側が最後にget_display_frame()を呼び出した時刻（描画省略の判定用）
+        self._last_display_get_ts = -float('inf')
         
         self.capture_thread: Optional[threading.Thread] = None
         self.detection_thread: Optional[threading.Thread] = None
-        self.ocr_executor: Optional[ThreadPoolExecutor] = None
+        self.ocr_executor: Optional[OCRWorkerPool] = None
+        # スレッドのCPU割り当て（config.pin_pipeline_threadsが有効な場合のみ）
+        self._pin_plan: Optional[CPUPinPlan] = None
+        # OCR結果のデータマネージャーへの追加は複数のワーカーから行われるため直列化する
+        self._data_lock = threading.Lock()
+        # 実行中・待機中のOCRタスク数の上限（ワーカーのキューが際限なく伸びるのを防ぐ）
+        # 空いている状態なら1フレーム分の検出領域は全て投入できるようにする
+        self._ocr_inflight = threading.BoundedSemaphore(
+            max(self.mode.ocr_workers * 2, self.mode.max_detections_per_frame)
+        )
         
         # Control
         self.stop_event = threading.Event()
+        # 停止済み（未起動を含む）か。2回目以降のstop()で停止処理を繰り返さないようにする
+        self._stopped = True
+        self._stop_lock = threading.Lock()
         self.frame_counter = 0
         
+        # モード・キャッシュ構成に応じた処理関数を選択
+        self._specialize_for_mode()
+        
         logger.info(f"PipelineProcessor initialized with mode: {self.mode.name}")
     
+    def _specialize_for_mode(self) -> None:
+        """パフォーマンスモードに応じてホットパスの処理関数を選択
+        
+        モードとキャッシュの有無は起動後に変化しないため、フレーム・検出領域ごとに
+        キャッシュの有無を判定する代わりに、ここで一度だけ処理関数を決定します。
+        """
+        # 検出キャッシュの参照（無効な場合は常にキャッシュミス扱い）
+        if self.detection_cache:
+            self._lookup_detections = self._lookup_detection_cache
+        else:
+            self._lookup_detections = self._no_detection_cache
+        
+        # OCRワーカーで実行する関数（無効な場合はキャッシュ参照を省く）
+        if self.ocr_cache:
+            self._ocr_task = self._ocr_single_cached
+        else:
+            self._ocr_task = self._ocr_single
+    
     def start(self) -> None:
         """パイプライン処理を開始
         
@@ -105,11 +179,34 @@ class PipelineProcessor:
             RuntimeError: コンポーネントの初期化に失敗した場合
         """
         try:
+            # 起動に失敗した場合もstop()で後片付けできるよう、初期化前に未停止にする
+            self._stopped = False
+            
             # コンポーネントの初期化
             self._initialize_components()
             
-            # スレッドの起動
+            # 1フレームの検出数やCPUコア数を超えるOCRワーカーは待機するだけなので起動しない
+            ocr_workers = min(
+                os.cpu_count() or 4,
+                self.mode.max_detections_per_frame,
+                self.mode.ocr_workers
+            )
+            
+            # スレッドごとのCPU割り当てを計算（コア数が足りない場合は固定しない）
+            if self.config.pin_pipeline_threads:
+                self._pin_plan = compute_pin_plan(available_cpus(), ocr_workers)
+                if self._pin_plan is None:
+                    logger.warning("Not enough CPUs to pin pipeline threads, using default scheduling")
+            
+            # スレッドの起動（前回のstop()で閉じたリングは作り直す）
             self.stop_event.clear()
+            self.frame_queue = SPSCRing(capacity=self.frame_queue.capacity)
+            self._frame_credit = threading.Semaphore(self.frame_queue.capacity)
+            self._last_detections = []
+            self._displayed_detections = None
+            self._pending_ocr = []
+            if self.frame_diff:
+                self.frame_diff.reset()
             
             # キャプチャスレッド
             self.capture_thread = threading.Thread(
@@ -128,9 +225,10 @@ class PipelineProcessor:
             self.detection_thread.start()
             
             # OCRスレッドプール
-            self.ocr_executor = ThreadPoolExecutor(
-                max_workers=self.mode.ocr_workers,
-                thread_name_prefix="OCRWorker"
+            self.ocr_executor = OCRWorkerPool(
+                max_workers=ocr_workers,
+                thread_name_prefix="OCRWorker",
+                initializer=self._pin_ocr_worker if self._pin_plan else None
             )
             
             logger.info("Pipeline started successfully")
@@ -144,12 +242,19 @@ class PipelineProcessor:
         """パイプライン処理を停止
         
         全てのスレッドを停止し、リソースをクリーンアップします。
+        停止済み（未起動を含む）の場合は何もしません。
         """
+        with self._stop_lock:
+            if self._stopped:
+                logger.debug("Pipeline already stopped")
+                return
+            self._stopped = True
+        
         logger.info("Stopping pipeline...")
         
         try:
             # 停止シグナルを送信
-            self.stop_event.set()
+            self._signal_stop()
             
             # スレッドの終了を待機
             if self.capture_thread and self.capture_thread.is_alive():
@@ -175,9 +280,11 @@ class PipelineProcessor:
                     self.ocr_executor = None
             
             # キューをクリア
-            self._clear_queue(self.frame_queue)
+            self.frame_queue.clear()
             self._clear_queue(self.detection_queue)
-            self._clear_queue(self.display_queue)
+            with self._display_lock:
+                self._display_frame = None
+                self._display_ready.clear()
             
             # コンポーネントのクリーンアップ
             self._cleanup_components()
@@ -192,22 +299,42 @@ class PipelineProcessor:
             except Exception as cleanup_error:
                 logger.error(f"Error during cleanup: {cleanup_error}")
     
+    def _signal_stop(self) -> None:
+        """停止シグナルを送信し、待機中のスレッドを即座に起こす
+        
+        フレームリングを閉じて検出スレッドのpop()を終わらせ、
+        クレジットを1つ返却してキャプチャスレッドの待機を解除します。
+        """
+        self.stop_event.set()
+        self.frame_queue.close()
+        self._frame_credit.release()
+    
     def _initialize_components(self) -> None:
         """コンポーネントを初期化"""
         # ウィンドウキャプチャ
-        self.window_capture = WindowCapture(self.config.target_window_title)
+        self.window_capture = WindowCapture(
+            self.config.target_window_title,
+            use_quartz=self.config.capture_use_quartz
+        )
         self.window_capture.find_window()
         
+        # 実際のキャプチャサイズ（Retina等でウィンドウサイズと異なる場合がある）でバッファを確保
+        first_frame = self.window_capture.capture_frame_into(None, self.config.capture_scale)
+        self.frame_pool.allocate(first_frame.shape, first_frame.dtype.type)
+        
         # 物体検出
         self.object_detector = ObjectDetector(
             model_path=self.config.model_path,
-            confidence_threshold=self.config.confidence_threshold
+            confidence_threshold=self.config.confidence_threshold,
+            backend=self.config.detection_backend,
+            quantize_int8=self.config.detection_quantize_int8
         )
         
         # OCR処理
         self.ocr_processor = OCRProcessor(
             lang=self.config.ocr_lang,
-            margin=self.config.ocr_margin
+            margin=self.config.ocr_margin,
+            use_tesserocr=True  # インストールされている場合のみ有効
         )
         
         # データマネージャー
@@ -217,7 +344,10 @@ class PipelineProcessor:
         )
         
         # Visualizer
-        self.visualizer = Visualizer(window_name=self.config.display_window_name)
+        self.visualizer = Visualizer(
+            window_name=self.config.display_window_name,
+            use_opencl=self.config.display_use_opencl
+        )
         
         logger.info("All components initialized")
     
@@ -277,58 +407,69 @@ class PipelineProcessor:
         """キャプチャスレッドのメインループ
         
         ウィンドウキャプチャを独立スレッドで実行し、
-        フレームキューに非ブロッキングで追加します。
+        フレームリングに非ブロッキングで追加します。
+        検出スレッドからのクレジットを待ってからキャプチャするため、
+        検出が追いつかない間は無駄なキャプチャを行いません。
         """
         logger.info("Capture thread started")
+        if self._pin_plan:
+            pin_current_thread({self._pin_plan.capture}, "capture thread")
         consecutive_errors = 0
         max_consecutive_errors = 10
+        last_capture_start = 0.0
+        capture_scale = self.config.capture_scale
         
         try:
             while not self.stop_event.is_set():
+                # 検出スレッドがフレームを消費するまで待機
+                # （停止時は_signal_stop()がクレジットを返却して起こす）
+                self._frame_credit.acquire()
+                
                 try:
-                    # パフォーマンス計測開始
-                    self.performance_monitor.start_timer('capture')
-                    
-                    # フレームをキャプチャ
-                    frame = self.window_capture.capture_frame()
+                    # 検出が速い場合でも上限FPSを超えないよう、不足分だけ待機
+                    deficit = CAPTURE_MIN_INTERVAL - (time.perf_counter() - last_capture_start)
+                    if deficit > 0 and self.stop_event.wait(deficit):
+                        self._frame_credit.release()
+                        break
+                    last_capture_start = time.perf_counter()
                     
-                    # パフォーマンス計測終了
-                    self.performance_monitor.end_timer('capture')
+                    # プールのバッファにフレームをキャプチャ（パフォーマンス計測付き）
+                    t0 = time.perf_counter_ns()
+                    frame = self.window_capture.capture_frame_into(self.frame_pool.acquire(), capture_scale)
+                    self.performance_monitor.record_ns('capture', time.perf_counter_ns() - t0)
                     
                     # 成功したらエラーカウンタをリセット
                     consecutive_errors = 0
                     
-                    # フレームキューに非ブロッキングで追加
-                    # キューが満杯の場合は古いフレームを破棄
-                    try:
-                        self.frame_queue.put_nowait(frame)
-                    except queue.Full:
-                        # キューが満杯の場合、古いフレームを破棄して新しいフレームを追加
-                        try:
-                            self.frame_queue.get_nowait()
-                            self.frame_queue.put_nowait(frame)
-                            self.performance_monitor.record_frame_skip()
-                        except (queue.Empty, queue.Full):
-                            pass
+                    # 検出・OCR・表示の各段はプールのバッファをコピーせずに共有するため、
+                    # 返却されるまで誤って書き換えられないよう読み取り専用にして公開する
+                    frame.flags.writeable = False
                     
-                    # 30FPS目標で適度にスリープ
-                    time.sleep(0.033)  # 約30FPS
+                    # フレームリングに非ブロッキングで追加
+                    # 読み出し位置は検出スレッドのみが進めるため、満杯の場合は
+                    # 古いフレームではなく今回のフレームを破棄する
+                    if not self.frame_queue.try_push(frame):
+                        self._frame_credit.release()
+                        self.frame_pool.release(frame)
+                        self.performance_monitor.record_frame_skip()
                     
                 except Exception as e:
+                    # キャプチャに失敗した場合はクレジットを返却
+                    self._frame_credit.release()
                     consecutive_errors += 1
                     logger.error(f"Error in capture loop (attempt {consecutive_errors}/{max_consecutive_errors}): {e}")
                     
                     # 連続エラーが多すぎる場合は停止
                     if consecutive_errors >= max_consecutive_errors:
                         logger.critical("Too many consecutive errors in capture loop, stopping thread")
-                        self.stop_event.set()
+                        self._signal_stop()
                         break
                     
                     time.sleep(0.1)  # エラー時は少し待機
         
         except Exception as e:
             logger.critical(f"Fatal error in capture loop: {e}")
-            self.stop_event.set()
+            self._signal_stop()
         
         finally:
             logger.info("Capture thread stopped")
@@ -336,94 +477,101 @@ class PipelineProcessor:
     def _detection_loop(self) -> None:
         """検出スレッドのメインループ
         
-        フレームキューからフレームを取得し、物体検出を実行します。
+        フレームリングからフレームを取得し、物体検出を実行します。
+        複数フレームが溜まっている場合はまとめて推論し、
         検出キャッシュを使用して重複検出を回避します。
         """
         logger.info("Detection thread started")
+        if self._pin_plan:
+            pin_current_thread(self._pin_plan.detection, "detection thread")
         consecutive_errors = 0
         max_consecutive_errors = 10
         
+        # ループ中に変化しない値はローカル変数に束縛しておく
+        frame_skip = self.mode.frame_skip
+        drop_stale = self.config.drop_stale_frames
+        frame_diff = self.frame_diff
+        detection_cache = self.detection_cache
+        lookup_detections = self._lookup_detections
+        
         try:
-            while not self.stop_event.is_set():
+            while True:
                 try:
-                    # フレームキューから取得（タイムアウト付き）
-                    try:
-                        frame = self.frame_queue.get(timeout=1.0)
-                    except queue.Empty:
-                        continue
-                    
-                    # フレームスキップ判定
-                    self.frame_counter += 1
-                    if self.frame_counter % self.mode.frame_skip != 0:
-                        self.performance_monitor.record_frame_skip()
-                        continue
+                    # フレームリングから取得（停止時はリングが閉じられてNoneが返る）
+                    frame = self.frame_queue.pop()
+                    if frame is None:
+                        break
                     
-                    detections = None
+                    # 検出が追いつかずフレームが溜まっている場合はまとめて取り出す
+                    batch = [frame]
+                    while len(batch) < DETECTION_MAX_BATCH:
+                        extra = self.frame_queue.try_pop()
+                        if extra is None:
+                            break
+                        batch.append(extra)
                     
-                    # 検出キャッシュが有効な場合（フォールバック処理付き）
-                    if self.detection_cache:
-                        try:
-                            # キャッシュヒット判定
-                            if self.detection_cache.should_skip_detection(frame):
-                                detections = self.detection_cache.get_cached_detections()
-                                if detections is not None:
-                                    self.performance_monitor.record_cache_hit()
-                                    logger.debug("Detection cache hit")
-                                else:
-                                    self.performance_monitor.record_cache_miss()
-                            else:
-                                self.performance_monitor.record_cache_miss()
-                        except Exception as cache_error:
-                            logger.warning(f"Detection cache error, falling back to detection: {cache_error}")
-                            self.performance_monitor.record_cache_miss()
-                            detections = None
+                    # リングに空きができたことをキャプチャスレッドに通知
+                    for _ in batch:
+                        self._frame_credit.release()
                     
-                    # キャッシュミスまたはキャッシュ無効の場合、検出を実行
-                    if detections is None:
-                        # パフォーマンス計測開始
-                        self.performance_monitor.start_timer('detection')
-                        
-                        # 物体検出を実行
-                        detections = self.object_detector.detect(frame)
-                        
-                        # パフォーマンス計測終了
-                        self.performance_monitor.end_timer('detection')
-                        
-                        # 検出キャッシュを更新（エラー時はスキップ）
-                        if self.detection_cache:
-                            try:
-                                self.detection_cache.update_cache(frame, detections)
-                            except Exception as cache_error:
-                                logger.warning(f"Failed to update detection cache: {cache_error}")
+                    # 最新フレームのみ処理する場合は、溜まっていた古いフレームを破棄
+                    if drop_stale and len(batch) > 1:
+                        for stale in batch[:-1]:
+                            self.performance_monitor.record_frame_skip()
+                            self.frame_pool.release(stale)
+                        batch = batch[-1:]
                     
-                    # 検出数を制限
-                    if len(detections) > self.mode.max_detections_per_frame:
-                        # Y座標でソートして上位のみ処理
-                        detections = ObjectDetector.sort_by_y_coordinate(detections)
-                        detections = detections[:self.mode.max_detections_per_frame]
+                    # フレームスキップ判定と静止フレーム判定
+                    frames = []
+                    static_flags = []
+                    for frame in batch:
+                        self.frame_counter += 1
+                        if self.frame_counter % frame_skip != 0:
+                            self.performance_monitor.record_frame_skip()
+                            self.frame_pool.release(frame)
+                        else:
+                            frames.append(frame)
+                            static_flags.append(frame_diff is not None and frame_diff.is_static(frame))
                     
-                    # 検出結果キューに送信
-                    detection_data = {
-                        'frame': frame,
-                        'detections': detections
-                    }
+                    if not frames:
+                        continue
                     
-                    try:
-                        self.detection_queue.put_nowait(detection_data)
-                    except queue.Full:
-                        # キューが満杯の場合、古いデータを破棄
-                        try:
-                            self.detection_queue.get_nowait()
-                            self.detection_queue.put_nowait(detection_data)
-                        except (queue.Empty, queue.Full):
-                            pass
+                    # 検出キャッシュを確認し、キャッシュミスのフレームのみ検出対象とする
+                    # （静止フレームは検出・OCRとも行わない）
+                    cache_lookups = [
+                        (None, None) if is_static else lookup_detections(frame)
+                        for frame, is_static in zip(frames, static_flags)
+                    ]
+                    detections_list = [detections for detections, _ in cache_lookups]
+                    pending = [
+                        i for i, detections in enumerate(detections_list)
+                        if detections is None and not static_flags[i]
+                    ]
                     
-                    # OCR処理を開始（非同期）
-                    if detections:
-                        self._process_ocr_parallel(frame, detections)
+                    if pending:
+                        # 物体検出をまとめて実行（パフォーマンス計測付き、1フレームあたりの時間を記録）
+                        t0 = time.perf_counter_ns()
+                        results = self.object_detector.detect_batch([frames[i] for i in pending])
+                        elapsed_ns = (time.perf_counter_ns() - t0) // len(pending)
+                        
+                        for i, detections in zip(pending, results):
+                            self.performance_monitor.record_ns('detection', elapsed_ns)
+                            detections_list[i] = detections
+                            
+                            # 検出キャッシュを更新（エラー時はスキップ）
+                            if detection_cache:
+                                try:
+                                    detection_cache.update_cache(frames[i], detections, cache_lookups[i][1])
+                                except Exception as cache_error:
+                                    logger.warning(f"Failed to update detection cache: {cache_error}")
                     
-                    # 検出結果を描画したフレームを表示キューに送信
-                    self._send_to_display_queue(frame, detections)
+                    # フレームごとにOCR・表示を実行（フレームの順序を保つ）
+                    for frame, detections, is_static in zip(frames, detections_list, static_flags):
+                        if is_static:
+                            self._handle_static_frame(frame)
+                        else:
+                            # 静止フレーム以外は検出キャッシュまたは検出結果で埋まっている
+                            self._handle_detections(frame, detections or [])
                     
                     # 成功したらエラーカウンタをリセット
                     consecutive_errors = 0
@@ -435,164 +583,373 @@ class PipelineProcessor:
                     # 連続エラーが多すぎる場合は停止
                     if consecutive_errors >= max_consecutive_errors:
                         logger.critical("Too many consecutive errors in detection loop, stopping thread")
-                        self.stop_event.set()
+                        self._signal_stop()
                         break
                     
                     time.sleep(0.1)
         
         except Exception as e:
             logger.critical(f"Fatal error in detection loop: {e}")
-            self.stop_event.set()
+            self._signal_stop()
         
         finally:
             logger.info("Detection thread stopped")
     
-    def _process_ocr_parallel(self, frame: np.ndarray, detections: List[DetectionResult]) -> None:
-        """OCR処理を並列実行
+    def _pin_ocr_worker(self, index: int) -> None:
+        """OCRワーカースレッドを割り当てられたコアに固定（ワーカー開始時に呼び出される）
+        
+        Args:
+            index: ワーカー番号
+        """
+        if self._pin_plan:
+            pin_current_thread(self._pin_plan.ocr_worker_cpus(index), f"OCR worker {index}")
+    
+    def _lookup_detection_cache(self, frame: np.ndarray) -> Tuple[Optional[List[DetectionResult]], Optional[int]]:
+        """検出キャッシュからフレームの検出結果を取得
+        
+        Args:
+            frame: 入力フレーム
+        
+        Returns:
+            (キャッシュされた検出結果またはNone, フレームのフィンガープリントまたはNone)
+        """
+        # フォールバック処理付き
+        fingerprint = None
+        try:
+            # フィンガープリントを1回だけ計算し、判定と更新で共有
+            fingerprint = self.detection_cache.compute_fingerprint(frame)
+            
+            # キャッシュヒット判定
+            if self.detection_cache.should_skip_detection(frame, fingerprint):
+                detections = self.detection_cache.get_cached_detections()
+                if detections is not None:
+                    self.performance_monitor.record_cache_hit()
+                    logger.debug("Detection cache hit")
+                    return detections, fingerprint
+            
+            self.performance_monitor.record_cache_miss()
+        except Exception as cache_error:
+            logger.warning(f"Detection cache error, falling back to detection: {cache_error}")
+            self.performance_monitor.record_cache_miss()
+        
+        return None, fingerprint
+    
+    @staticmethod
+    def _no_detection_cache(frame: np.ndarray) -> Tuple[Optional[List[DetectionResult]], Optional[int]]:
+        """検出キャッシュ無効時の参照（常にキャッシュミス）
+        
+        Args:
+            frame: 入力フレーム
+        
+        Returns:
+            (None, None)
+        """
+        return None, None
+    
+    def _handle_detections(self, frame: np.ndarray, detections: List[DetectionResult]) -> None:
+        """検出結果に対してOCRと表示を行い、フレームバッファを返却
+        
+        Args:
+            frame: 入力フレーム
+            detections: 検出結果のリスト
+        """
+        # 検出数を制限（検出結果はY座標順のため、上から順に処理）
+        if len(detections) > self.mode.max_detections_per_frame:
+            detections = detections[:self.mode.max_detections_per_frame]
+        
+        self._last_detections = detections
+        # 画面が変化したため、前の検出結果で投入できなかった領域は不要
+        self._pending_ocr = []
+        
+        # 検出結果キューに送信
+        detection_data = {
+            'frame': frame,
+            'detections': detections
+        }
+        
+        try:
+            self.detection_queue.put_nowait(detection_data)
+        except queue.Full:
+            # キューが満杯の場合、古いデータを破棄
+            try:
+                self.detection_queue.get_nowait()
+                self.detection_queue.put_nowait(detection_data)
+            except (queue.Empty, queue.Full):
+                pass
+        
+        # OCR処理を開始（非同期、結果を待たずに次のフレームの検出に進む）
+        ocr_submitted = False
+        if detections:
+            ocr_submitted = self._submit_ocr(frame, detections)
+        
+        # 検出結果を描画したフレームを表示スロットに送信
+        self._send_to_display_queue(frame, detections)
+        
+        # フレームバッファをプールに返却
+        # OCRタスクに渡した場合は、最後のタスクの終了時に返却される
+        if not ocr_submitted:
+            self.frame_pool.release(frame)
+    
+    def _handle_static_frame(self, frame: np.ndarray) -> None:
+        """静止フレームを直前の検出結果で表示し、フレームバッファを返却
+        
+        画面が変化していないため、検出・OCRとも新しい結果は得られません。
+        ただし直前の検出結果のうちOCRの投入枠が埋まっていて投入できなかった領域は、
+        画面が同じこのフレームを使って投入し直します（スクロール直後の取りこぼし防止）。
+        表示中のフレームが同じ検出結果で描画済みの場合は、描画と表示も省略します。
+        
+        Args:
+            frame: 入力フレーム
+        """
+        self.performance_monitor.record_frame_skip()
+        
+        ocr_submitted = False
+        if self._pending_ocr:
+            ocr_submitted = self._submit_ocr(frame, self._pending_ocr)
+        
+        if self._last_detections is self._displayed_detections:
+            # 表示中のフレームと画面・検出結果とも変わらないため、FPSのみ更新
+            self.performance_monitor.update_fps()
+        else:
+            self._send_to_display_queue(frame, self._last_detections)
+        
+        # OCRタスクに渡した場合は、最後のタスクの終了時に返却される
+        if not ocr_submitted:
+            self.frame_pool.release(frame)
+    
+    def _submit_ocr(self, frame: np.ndarray, detections: List[DetectionResult]) -> bool:
+        """OCR処理をワーカープールに投入（結果は待たない）
         
-        ThreadPoolExecutorを使用して、複数の検出領域に対して
-        並列にOCR処理を実行します。
+        検出スレッドはOCRの完了を待たずに次のフレームの検出に進むため、
+        フレームNのOCRとフレームN+1の検出が並行して実行されます。
+        結果は各タスクの完了時にワーカースレッドからデータマネージャーに送信され、
+        全タスクの終了後にフレームバッファがプールに返却されます。
         
         Args:
             frame: 入力フレーム
             detections: 検出結果のリスト
+        
+        Returns:
+            1つ以上のタスクを投入した場合True（フレームバッファの返却はタスク側で行う）。
+            Falseの場合、呼び出し元がフレームバッファを返却する
+        
+        Note:
+            投入枠が埋まっていて投入できなかった領域は_pending_ocrに残し、
+            次の静止フレームで投入し直します。
         """
         if not detections or not self.ocr_executor:
+            return False
+        
+        # 検出が1件のみでも検出スレッドでは実行しない。投入にかかる時間は数µsだが、
+        # このスレッドで実行するとOCRが終わるまで次のフレームの検出が止まるため
+        
+        # 検出結果はY座標順のため、そのまま上から下へ優先度付きで投入
+        # 投入中のタスクが上限に達している領域は後で投入し直すために残す
+        bboxes = []
+        skipped = []
+        for bbox in detections:
+            if self._ocr_inflight.acquire(blocking=False):
+                bboxes.append(bbox)
+            else:
+                skipped.append(bbox)
+                self.performance_monitor.record_frame_skip()
+        self._pending_ocr = skipped
+        
+        if not bboxes:
+            return False
+        
+        # 全タスクの終了（完了・失敗・キャンセル）でフレームバッファを返却する
+        remaining = [len(bboxes)]
+        remaining_lock = threading.Lock()
+        
+        def finish_task() -> None:
+            self._ocr_inflight.release()
+            with remaining_lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self.frame_pool.release(frame)
+        
+        def on_done(future: Future) -> None:
+            self._collect_ocr_result(future)
+            finish_task()
+        
+        for index, bbox in enumerate(bboxes):
+            try:
+                future = self.ocr_executor.submit(self._ocr_task, frame, bbox)
+            except Exception as e:
+                # 停止処理中など投入できなかった分は終了扱いにする
+                logger.error(f"Error submitting OCR task: {e}")
+                for _ in bboxes[index:]:
+                    finish_task()
+                break
+            future.add_done_callback(on_done)
+        
+        return True
+    
+    def _collect_ocr_result(self, future: Future) -> None:
+        """終了したOCRタスクの結果をデータマネージャーに送信
+        
+        Args:
+            future: 終了したOCRタスク
+        """
+        if future.cancelled():
+            return
+        
+        try:
+            text = future.result()
+        except Exception as e:
+            logger.error(f"Error getting OCR result: {e}")
             return
         
-        # Y座標でソート（上から下へ優先度付き処理）
-        sorted_detections = ObjectDetector.sort_by_y_coordinate(detections)
+        self._add_ocr_text(text)
+    
+    def _add_ocr_text(self, text: Optional[str]) -> None:
+        """OCR結果をデータマネージャーに追加
         
-        # 各検出領域に対してOCR処理を並列実行
-        def process_single_detection(bbox: DetectionResult) -> Optional[str]:
-            """単一の検出領域に対してOCR処理を実行"""
+        Args:
+            text: OCR結果（空・短すぎる場合は追加しない）
+        """
+        if text and len(text) >= self.config.min_text_length:
+            # データマネージャーに追加
             try:
-                # OCRキャッシュが有効な場合（フォールバック処理付き）
-                if self.ocr_cache:
-                    try:
-                        cached_text = self.ocr_cache.get_cached_text(bbox)
-                        if cached_text is not None:
-                            self.performance_monitor.record_cache_hit()
-                            logger.debug(f"OCR cache hit for bbox: ({bbox.x1}, {bbox.y1})")
-                            return cached_text
-                        else:
-                            self.performance_monitor.record_cache_miss()
-                    except Exception as cache_error:
-                        logger.warning(f"OCR cache error, falling back to OCR: {cache_error}")
-                        self.performance_monitor.record_cache_miss()
-                
-                # パフォーマンス計測開始
-                self.performance_monitor.start_timer('ocr')
-                
-                # OCR処理を実行
-                text = self.ocr_processor.extract_text(frame, bbox)
-                
-                # パフォーマンス計測終了
-                self.performance_monitor.end_timer('ocr')
-                
-                # OCRキャッシュを更新（エラー時はスキップ）
-                if self.ocr_cache and text:
-                    try:
-                        self.ocr_cache.update_cache(bbox, text)
-                    except Exception as cache_error:
-                        logger.warning(f"Failed to update OCR cache: {cache_error}")
-                
-                return text
-                
-            except Exception as e:
-                logger.error(f"Error in OCR processing for bbox ({bbox.x1}, {bbox.y1}): {e}")
-                return None
+                with self._data_lock:
+                    self.data_manager.add_text(text)
+            except Exception as dm_error:
+                logger.error(f"Error adding text to data manager: {dm_error}")
+    
+    def _ocr_single_cached(self, frame: np.ndarray, bbox: DetectionResult) -> Optional[str]:
+        """OCRキャッシュを参照してから単一の検出領域をOCR処理（OCRワーカースレッドで実行）
         
-        # 並列OCR処理を実行
-        futures = []
+        Args:
+            frame: 入力フレーム
+            bbox: 検出領域
+        
+        Returns:
+            抽出されたテキスト、またはエラー時None
+        """
         try:
-            for bbox in sorted_detections:
-                if self.stop_event.is_set():
-                    # 停止シグナルが出ている場合は新しいタスクを投入しない
-                    break
-                future = self.ocr_executor.submit(process_single_detection, bbox)
-                futures.append(future)
-            
-            # 結果を収集してデータマネージャーに送信
-            for future in futures:
-                if self.stop_event.is_set():
-                    # 停止シグナルが出ている場合は残りの結果を待たない
-                    future.cancel()
-                    continue
-                
-                try:
-                    text = future.result(timeout=5.0)  # 5秒タイムアウト
-                    if text and len(text) >= self.config.min_text_length:
-                        # データマネージャーに追加
-                        try:
-                            self.data_manager.add_text(text)
-                        except Exception as dm_error:
-                            logger.error(f"Error adding text to data manager: {dm_error}")
-                except TimeoutError:
-                    logger.warning(f"OCR processing timed out after 5 seconds")
-                    future.cancel()
-                except Exception as e:
-                    logger.error(f"Error getting OCR result: {e}")
+            t0 = time.perf_counter_ns()
+            roi = self.ocr_processor.crop_roi(frame, bbox)
+            if roi is None:
+                return ""
+            content_hash = self.ocr_processor.content_hash(roi)
+        except Exception as e:
+            logger.error(f"Error in OCR processing for bbox ({bbox.x1}, {bbox.y1}): {e}")
+            return None
         
+        # OCRキャッシュを参照（フォールバック処理付き）
+        # 座標が近くても内容ハッシュが一致しない領域（スクロール後の別の行、その場で更新された行）は再利用しない
+        try:
+            cached_text = self.ocr_cache.get_cached_text(bbox, content_hash)
+            if cached_text is not None:
+                self.performance_monitor.record_cache_hit()
+                logger.debug(f"OCR cache hit for bbox: ({bbox.x1}, {bbox.y1})")
+                return cached_text
+            else:
+                self.performance_monitor.record_cache_miss()
+        except Exception as cache_error:
+            logger.warning(f"OCR cache error, falling back to OCR: {cache_error}")
+            self.performance_monitor.record_cache_miss()
+        
+        try:
+            # 内容ハッシュは計算済みのため、OCRProcessorの内容キャッシュでも再計算しない
+            text = self.ocr_processor.extract_text_from_roi(roi, content_hash)
+            self.performance_monitor.record_ns('ocr', time.perf_counter_ns() - t0)
         except Exception as e:
-            logger.error(f"Error in parallel OCR processing: {e}")
+            logger.error(f"Error in OCR processing for bbox ({bbox.x1}, {bbox.y1}): {e}")
+            return None
+        
+        # OCRキャッシュを更新（エラー時はスキップ）
+        if text:
+            try:
+                self.ocr_cache.update_cache(bbox, text, content_hash)
+            except Exception as cache_error:
+                logger.warning(f"Failed to update OCR cache: {cache_error}")
+        
+        return text
     
-    def get_display_frame(self, timeout: float = 0.1) -> Optional[np.ndarray]:
+    def _ocr_single(self, frame: np.ndarray, bbox: DetectionResult) -> Optional[str]:
+        """単一の検出領域に対してOCR処理を実行（OCRワーカースレッドで実行）
+        
+        Args:
+            frame: 入力フレーム
+            bbox: 検出領域
+        
+        Returns:
+            抽出されたテキスト、またはエラー時None
+        """
+        try:
+            # OCR処理を実行（パフォーマンス計測付き）
+            # ワーカースレッド間で同時に計測されるため、開始時刻はローカル変数に保持する
+            # 切り出しはワーカースレッド内で行い、コピー中はGILが解放されるため並列に進む
+            t0 = time.perf_counter_ns()
+            roi = self.ocr_processor.crop_roi(frame, bbox)
+            text = self.ocr_processor.extract_text_from_roi(roi) if roi is not None else ""
+            self.performance_monitor.record_ns('ocr', time.perf_counter_ns() - t0)
+            
+            return text
+            
+        except Exception as e:
+            logger.error(f"Error in OCR processing for bbox ({bbox.x1}, {bbox.y1}): {e}")
+            return None
+    
+    def get_display_frame(self, timeout: float = 0.1) -> Optional[Union[np.ndarray, cv2.UMat]]:
         """表示用フレームを取得
         
         Args:
             timeout: タイムアウト時間（秒）
         
         Returns:
-            表示用フレーム、またはNone
+            表示用フレーム（display_use_opencl有効時はcv2.UMat）、またはNone
         """
+        self._last_display_get_ts = time.perf_counter()
         try:
-            return self.display_queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
+            # 新しいフレームが届くまで待機
+            ready = self._display_ready.wait(timeout)
+            self._last_display_get_ts = time.perf_counter()
+            if not ready:
+                return None
+            
+            # スロットから最新フレームを取り出す
+            with self._display_lock:
+                frame = self._display_frame
+                self._display_frame = None
+                self._display_ready.clear()
+            return frame
         except Exception as e:
             logger.error(f"Error getting display frame: {e}")
             return None
     
     def _send_to_display_queue(self, frame: np.ndarray, detections: List[DetectionResult]) -> None:
-        """検出結果を描画したフレームを表示キューに送信
+        """検出結果を描画したフレームを表示スロットに送信
         
-        フレームスキップ戦略を実装し、古いフレームを破棄します。
+        スロットには最新フレームのみを保持し、未取得の古いフレームは上書きします。
+        表示側が一定時間フレームを取得していない場合（ヘッドレス実行等）は描画を省略します。
         
         Args:
             frame: 入力フレーム
             detections: 検出結果のリスト
         """
         try:
-            # パフォーマンス計測開始
-            self.performance_monitor.start_timer('display')
+            # 表示側が読み取っていない場合は描画せず、FPSのみ更新
+            if time.perf_counter() - self._last_display_get_ts > DISPLAY_CONSUMER_TIMEOUT:
+                self.performance_monitor.update_fps()
+                return
             
-            # 検出結果を描画
+            # 検出結果を描画（パフォーマンス計測付き）
+            t0 = time.perf_counter_ns()
             annotated_frame = self.visualizer.draw_detections(frame, detections)
-            
-            # パフォーマンス計測終了
-            self.performance_monitor.end_timer('display')
+            self.performance_monitor.record_ns('display', time.perf_counter_ns() - t0)
             
             # FPSを更新
             self.performance_monitor.update_fps()
             
-            # 表示キューに送信（フレームスキップ戦略）
-            # キューが満杯の場合、古いフレームを破棄して最新フレームを追加
-            try:
-                self.display_queue.put_nowait(annotated_frame)
-            except queue.Full:
-                # 古いフレームを全て破棄
-                try:
-                    while not self.display_queue.empty():
-                        try:
-                            self.display_queue.get_nowait()
-                        except queue.Empty:
-                            break
-                    
-                    # 最新フレームを追加
-                    self.display_queue.put_nowait(annotated_frame)
-                except (queue.Empty, queue.Full) as e:
-                    logger.debug(f"Queue operation failed during frame skip: {e}")
+            # 表示スロットを最新フレームで上書き（フレームスキップ戦略）
+            with self._display_lock:
+                self._display_frame = annotated_frame
+                self._display_ready.set()
+            self._displayed_detections = detections
         
         except Exception as e:
             logger.error(f"Error sending to display queue: {e}")
@@ -11,19 +11,41 @@ Requirements: 7.1, 7.2
 
 import sys
 import argparse
+import logging
+import logging.handlers
+import queue
 from pathlib import Path
 
-# プロジェクトルートをPythonパスに追加
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# PyTorch/Ultralytics等の重いモジュールは、--helpやGUIモードで読み込まないよう
+# 使用する関数内でインポートする
 
-from src.config import load_config, AppConfig
-from src.window_capture import WindowCapture
-from src.object_detector import ObjectDetector
-from src.ocr_processor import OCRProcessor
-from src.data_manager import DataManager
-from src.visualizer import Visualizer
-from src.error_handler import ErrorHandler
+
+def setup_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    ログ出力を設定
+    
+    ルートロガーにはQueueHandlerのみを登録し、標準エラー出力への書き込みは
+    QueueListenerのバックグラウンドスレッドで行います。検出・OCRスレッドは
+    ログを記録してもI/Oを待ちません。
+    
+    Args:
+        level: ルートロガーのログレベル（デフォルト: INFO）
+    
+    Returns:
+        開始済みのQueueListener（終了時にstop()を呼び出して残りのログを出力する）
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
 
 
 def main_cli():
@@ -31,15 +53,22 @@ def main_cli():
     メインアプリケーション関数
     
     アプリケーションの初期化、メインループの実行、終了処理を行います。
+    キャプチャ・検出・OCRはPipelineProcessorの各スレッドで並列に実行し、
+    メインスレッドは描画済みフレームの表示のみを担当します。
     
     Requirements: 2.1, 2.2, 1.1, 1.2, 8.1, 8.2
     """
+    from src.config import load_config
+    from src.pipeline_processor import PipelineProcessor
+    from src.visualizer import Visualizer
+    from src.error_handler import ErrorHandler
+    
     print("="*60)
     print("リアルタイムOCRアプリケーション")
     print("="*60)
     
     # 設定の読み込み
-    print("\n[1/6] 設定を読み込んでいます...")
+    print("\n[1/3] 設定を読み込んでいます...")
     config = load_config()
     print(f"✓ 設定を読み込みました")
     print(config)
@@ -54,47 +83,25 @@ def main_cli():
     
     print("\n✓ 設定の検証に成功しました")
     
-    # YOLOv8モデルのロード
-    print("\n[2/6] YOLOv8モデルをロードしています...")
+    # パイプラインの起動（YOLOv8モデル、ウィンドウキャプチャ、OCR、データマネージャーを初期化）
+    print(f"\n[2/3] 処理パイプラインを起動しています（モード: {config.performance_mode}）...")
+    pipeline = PipelineProcessor(config, performance_mode=config.performance_mode)
     try:
-        detector = ObjectDetector(
-            model_path=config.model_path,
-            confidence_threshold=config.confidence_threshold
-        )
-        print("✓ YOLOv8モデルのロードに成功しました")
-    except Exception as e:
-        ErrorHandler.handle_initialization_error(e, "YOLOv8モデルのロードに失敗しました")
-    
-    # ウィンドウキャプチャの初期化
-    print(f"\n[3/6] ウィンドウを検索しています（タイトル: '{config.target_window_title}'）...")
-    try:
-        window_capture = WindowCapture(config.target_window_title)
-        window_info = window_capture.find_window()
+        pipeline.start()
+        window_info = pipeline.window_capture.window_info
         print(f"✓ ウィンドウを見つけました: {window_info['title']} ({window_info['owner']})")
         print(f"  位置: ({window_info['x']}, {window_info['y']})")
         print(f"  サイズ: {window_info['width']}x{window_info['height']}")
+        print(f"✓ 処理パイプラインの起動に成功しました")
+        print(f"  出力先: {config.output_csv}")
     except Exception as e:
-        ErrorHandler.handle_initialization_error(e, "ウィンドウの検索に失敗しました")
-    
-    # OCRプロセッサの初期化
-    print(f"\n[4/6] OCRプロセッサを初期化しています（言語: {config.ocr_lang}）...")
-    try:
-        ocr_processor = OCRProcessor(
-            lang=config.ocr_lang,
-            margin=config.ocr_margin
-        )
-        print("✓ OCRプロセッサの初期化に成功しました")
-    except Exception as e:
-        ErrorHandler.handle_initialization_error(e, "OCRプロセッサの初期化に失敗しました")
+        ErrorHandler.handle_initialization_error(e, "処理パイプラインの起動に失敗しました")
     
-    # データマネージャーの初期化
-    print(f"\n[5/6] データマネージャーを初期化しています...")
-    data_manager = DataManager(output_path=config.output_csv)
-    print(f"✓ データマネージャーの初期化に成功しました")
-    print(f"  出力先: {config.output_csv}")
+    # パイプライン停止後もCSV出力できるよう参照を保持
+    data_manager = pipeline.data_manager
     
-    # ビジュアライザーの初期化
-    print(f"\n[6/6] ビジュアライザーを初期化しています...")
+    # ビジュアライザーの初期化（フレーム表示用）
+    print(f"\n[3/3] ビジュアライザーを初期化しています...")
     visualizer = Visualizer(window_name=config.display_window_name)
     print("✓ ビジュアライザーの初期化に成功しました")
     
@@ -106,76 +113,39 @@ def main_cli():
     print("  - Ctrl+Cでも終了できます")
     print("="*60)
     
+    def cleanup() -> None:
+        """パイプラインと表示ウィンドウを停止"""
+        pipeline.stop()
+        visualizer.cleanup()
+    
     # シグナルハンドラの設定（Ctrl+C対応）
     ErrorHandler.setup_signal_handlers(
         data_manager=data_manager,
-        cleanup_callback=visualizer.cleanup
+        cleanup_callback=cleanup
     )
     
     # メインループ
     print("\nリアルタイム処理を開始します...\n")
     
     try:
-        frame_count = 0
-        
-        while True:
-            frame_count += 1
+        while pipeline.is_running():
+            # 描画済みの最新フレームを取得
+            frame = pipeline.get_display_frame(timeout=0.1)
             
-            # ウィンドウキャプチャ
+            # フレーム表示（静止画面で新しいフレームがない間はキー入力のみチェック）
             try:
-                frame = window_capture.capture_frame()
-            except Exception as e:
-                ErrorHandler.handle_runtime_error(e, "ウィンドウキャプチャに失敗しました")
-                continue
-            
-            # 物体検出
-            try:
-                detections = detector.detect(frame)
-            except Exception as e:
-                ErrorHandler.handle_runtime_error(e, "物体検出に失敗しました")
-                continue
-            
-            # 検出結果のソート（Y座標で上から下）
-            if detections:
-                detections = ObjectDetector.sort_by_y_coordinate(detections)
-            
-            # OCR処理（各バウンディングボックスに対して）
-            for detection in detections:
-                try:
-                    # テキスト抽出
-                    text = ocr_processor.extract_text(frame, detection)
-                    
-                    # テキストの長さチェック
-                    if len(text) < config.min_text_length:
-                        continue
-                    
-                    # 重複チェックとデータ追加
-                    data_manager.add_text(text)
-                    
-                except Exception as e:
-                    ErrorHandler.handle_runtime_error(
-                        e,
-                        "OCR処理に失敗しました",
-                        verbose=False
-                    )
-                    continue
-            
-            # 検出結果の描画
-            try:
-                annotated_frame = visualizer.draw_detections(frame, detections)
-            except Exception as e:
-                ErrorHandler.handle_runtime_error(e, "描画処理に失敗しました")
-                annotated_frame = frame
-            
-            # フレーム表示
-            try:
-                should_continue = visualizer.show_frame(annotated_frame)
+                if frame is None:
+                    should_continue = visualizer.poll_key()
+                else:
+                    should_continue = visualizer.show_frame(frame)
                 if not should_continue:
                     print("\n'q'キーが押されました。終了します...")
                     break
             except Exception as e:
                 ErrorHandler.handle_runtime_error(e, "フレーム表示に失敗しました")
                 break
+        else:
+            print("\n処理パイプラインが停止しました。終了します...")
     
     except KeyboardInterrupt:
         print("\n\nCtrl+Cが押されました。終了します...")
@@ -184,7 +154,8 @@ def main_cli():
         ErrorHandler.log_error(e, "予期しないエラーが発生しました")
     
     finally:
-        # 終了処理
+        # 終了処理（パイプラインを先に停止し、OCR結果が出揃ってからCSVに保存）
+        pipeline.stop()
         ErrorHandler.handle_graceful_shutdown(
             data_manager=data_manager,
             cleanup_callback=visualizer.cleanup
@@ -230,6 +201,20 @@ def main():
     
     args = parser.parse_args()
     
+    log_listener = setup_logging()
+    try:
+        _run(args)
+    finally:
+        log_listener.stop()
+
+
+def _run(args: argparse.Namespace) -> None:
+    """
+    解析済みのコマンドライン引数に従ってGUIモードまたはCLIモードで起動
+    
+    Args:
+        args: main()で解析したコマンドライン引数
+    """
     if args.gui:
         # GUIモードで起動
         try:
@@ -283,4 +268,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # プロジェクトルートをPythonパスに追加（スクリプトとして実行した場合のみ）
+    project_root = Path(__file__).parent.parent
+    sys.path.insert(0, str(project_root))
+    
     main()
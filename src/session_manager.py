@@ -3,18 +3,34 @@
 
 このモジュールは、OCR処理のセッション単位での画像管理を担当します。
 タイムスタンプベースのフォルダ管理、画像の切り出し・保存、ZIP圧縮を提供します。
+画像のJPEGエンコードと書き込みはバックグラウンドの書き込みスレッドで並列に行います。
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 import numpy as np
 import cv2
-import shutil
+import os
+import queue
 import subprocess
+import threading
+import zipfile
 
 from src.object_detector import DetectionResult
 
+# 切り出し画像のJPEG品質（OpenCVの既定値95より小さくし、ファイルサイズを約3割削減）
+JPEG_QUALITY = 85
+
+# 書き込み待ちの切り出し画像数の上限（超えた分は呼び出し元スレッドで直接書き込み、メモリの増加を防ぐ）
+SAVE_QUEUE_SIZE = 32
+
+# 保存する検出結果の最小の幅・高さ（ピクセル）。これ未満はフレーム端のノイズ等とみなして保存しない
+MIN_CROP_SIZE = 8
+
+# 書き込みスレッド数（cv2.imwriteはエンコード・書き込み中にGILを解放するため並列に処理できる）
+SAVE_WORKERS = min(4, os.cpu_count() or 1)
+
 
 class SessionManager:
     """
@@ -23,6 +39,12 @@ class SessionManager:
     セッション開始時にタイムスタンプベースのフォルダを作成し、
     検出されたlist-item領域の画像を保存します。
     セッション終了時にはフォルダをZIP圧縮します。
+    
+    画像の保存は書き込みスレッドに委譲するため、呼び出し元は切り出し画像の
+    コピーのみで処理を続行できます。1フレームで複数のlist-itemを保存する場合も、
+    SAVE_WORKERS個のスレッドが共有キューから取り出して並列に書き込みます。
+    書き込みスレッドはセッションの開始時に起動し、終了時に書き込み待ちの画像を
+    保存し終えてから終了します。
     """
     
     def __init__(self, base_output_dir: str = "output/sessions"):
@@ -36,6 +58,14 @@ class SessionManager:
         self.session_folder: Optional[Path] = None
         self.session_timestamp: Optional[str] = None
         self.image_counter = 0
+        # 画像の保存先・戻り値のパスの接頭辞（start_sessionで作成し、保存のたびに組み立て直さない）
+        self._image_path_prefix = ""
+        self._relative_path_prefix = ""
+        
+        # 書き込み待ちの(保存先, 切り出し画像)。Noneは書き込みスレッドの終了指示
+        self._save_queue: "queue.Queue[Optional[Tuple[str, np.ndarray]]]" = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+        # 書き込みスレッド（start_sessionで起動し、end_sessionで終了する）
+        self._save_threads: List[threading.Thread] = []
     
     def start_session(self) -> Path:
         """
@@ -51,6 +81,9 @@ class SessionManager:
         self.session_folder = self.base_output_dir / self.session_timestamp
         self.session_folder.mkdir(parents=True, exist_ok=True)
         self.image_counter = 0
+        self._image_path_prefix = os.path.join(os.fspath(self.session_folder), "list_item_")
+        self._relative_path_prefix = f"sessions/{self.session_timestamp}/list_item_"
+        self._start_save_workers()
         print(f"📁 セッション開始: {self.session_folder}")
         return self.session_folder
     
@@ -64,7 +97,11 @@ class SessionManager:
         list-item領域を切り出して保存
         
         指定されたbounding box領域をマージン付きで切り出し、
-        一意のファイル名で保存します。
+        一意のファイル名で保存します。書き込みはバックグラウンドで行われるため、
+        パスは書き込み前に返され、ファイルはend_session()までに作成されます。
+        バックグラウンドでの書き込みに失敗した場合はログを出力するのみで、
+        戻り値のパスにファイルが存在しないことがあります。
+        書き込み待ちが上限に達している場合は、画像を破棄せずにこの場で書き込みます。
         
         Args:
             frame: 元画像（BGR形式のnumpy配列）
@@ -72,7 +109,9 @@ class SessionManager:
             margin: 切り出し時に追加するマージン（ピクセル、デフォルト: 5）
         
         Returns:
-            保存した画像の相対パス（例: "sessions/20251016_143022/list_item_001.jpg"）
+            保存した画像の相対パス（例: "sessions/20251016_143022/list_item_001.jpg"）、
+            bounding boxがMIN_CROP_SIZE未満・フレーム外の場合や、
+            切り出しに失敗した場合・この場での書き込みに失敗した場合は空文字列
         
         Raises:
             RuntimeError: セッションが開始されていない場合
@@ -90,6 +129,11 @@ class SessionManager:
                 f"{'='*60}\n"
             )
         
+        # 極小またはフレーム外のbounding boxは、切り出し・コピーの前に除外する
+        if (bbox.x2 - bbox.x1 < MIN_CROP_SIZE or bbox.y2 - bbox.y1 < MIN_CROP_SIZE
+                or bbox.x1 >= frame.shape[1] or bbox.y1 >= frame.shape[0]):
+            return ""
+        
         try:
             # マージン付きで切り出し座標を計算
             x1 = max(0, bbox.x1 - margin)
@@ -103,25 +147,28 @@ class SessionManager:
                     f"無効なbounding box座標: x1={x1}, y1={y1}, x2={x2}, y2={y2}"
                 )
             
-            # 画像を切り出し
-            cropped = frame[y1:y2, x1:x2]
+            # 画像を切り出し（保存は非同期のため、フレームの再利用・描画の影響を受けないようコピー）
+            # コピーはC連続の配列になるため、imwrite内で再度コピーされることもない
+            cropped = frame[y1:y2, x1:x2].copy()
             
             # 切り出した画像が空でないかチェック
             if cropped.size == 0:
                 raise ValueError("切り出した画像が空です")
             
             # 一意のファイル名を生成
-            self.image_counter += 1
-            filename = f"list_item_{self.image_counter:03d}.jpg"
-            filepath = self.session_folder / filename
+            suffix = f"{self.image_counter + 1:03d}.jpg"
+            filepath = self._image_path_prefix + suffix
             
-            # 画像を保存
-            success = cv2.imwrite(str(filepath), cropped)
-            if not success:
-                raise IOError(f"画像の書き込みに失敗しました: {filepath}")
+            # 書き込みスレッドに保存を依頼（満杯の場合は呼び出し元スレッドで書き込む）
+            try:
+                self._save_queue.put_nowait((filepath, cropped))
+            except queue.Full:
+                if not self._write_image(filepath, cropped):
+                    return ""
+            self.image_counter += 1
             
             # 相対パスを返す
-            return f"sessions/{self.session_timestamp}/{filename}"
+            return self._relative_path_prefix + suffix
             
         except Exception as e:
             # 画像切り出し失敗時のエラーログ出力と処理継続
@@ -134,16 +181,96 @@ class SessionManager:
             # エラー時は空文字列を返して処理を継続
             return ""
     
+    def _start_save_workers(self) -> None:
+        """
+        書き込みスレッドを起動（起動済みの場合は何もしない）
+        """
+        if self._save_threads:
+            return
+        
+        self._save_threads = [
+            threading.Thread(
+                target=self._save_loop,
+                name=f"SessionImageWriter_{index}",
+                daemon=True
+            )
+            for index in range(SAVE_WORKERS)
+        ]
+        for thread in self._save_threads:
+            thread.start()
+    
+    def _stop_save_workers(self) -> None:
+        """
+        書き込み待ちの画像を保存し終えてから書き込みスレッドを終了
+        
+        終了指示はキューの末尾に積むため、それまでに依頼された画像は全て書き込まれます。
+        """
+        for _ in self._save_threads:
+            self._save_queue.put(None)
+        for thread in self._save_threads:
+            thread.join()
+        self._save_threads = []
+    
+    def _save_loop(self) -> None:
+        """
+        書き込みスレッドのメインループ（切り出し画像をJPEGで保存）
+        """
+        while True:
+            item = self._save_queue.get()
+            if item is None:
+                self._save_queue.task_done()
+                break
+            
+            filepath, cropped = item
+            try:
+                self._write_image(filepath, cropped)
+            finally:
+                self._save_queue.task_done()
+    
+    @staticmethod
+    def _write_image(filepath: str, cropped: np.ndarray) -> bool:
+        """
+        切り出し画像をJPEGで書き込み
+        
+        Args:
+            filepath: 保存先のパス
+            cropped: 切り出し画像（BGR形式のnumpy配列）
+        
+        Returns:
+            書き込みに成功した場合True
+        """
+        try:
+            success = cv2.imwrite(filepath, cropped, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+            if not success:
+                raise IOError(f"画像の書き込みに失敗しました: {filepath}")
+            return True
+        except Exception as e:
+            print(f"\n❌ 画像保存エラー:")
+            print(f"   エラー内容: {e}")
+            print(f"   💡 ヒント: ディスク容量が不足しているか、書き込み権限がない可能性があります")
+            return False
+    
+    def wait_for_pending_saves(self) -> None:
+        """
+        書き込み待ちの画像がすべて保存されるまで待機
+        """
+        self._save_queue.join()
+    
     def end_session(self) -> Optional[Path]:
         """
         セッションを終了し、ZIP圧縮
         
-        セッションフォルダ全体をZIPファイルに圧縮します。
+        セッションフォルダ全体をZIPファイルにまとめます。
+        保存画像はJPEGで既に圧縮されており、DEFLATEで再圧縮しても
+        サイズはほぼ変わらないため、無圧縮（ZIP_STORED）で格納します。
         圧縮完了後、元のフォルダを削除することも可能です（オプション）。
         
         Returns:
             ZIPファイルのPath（圧縮成功時）、失敗時はNone
         """
+        # 書き込み待ちの画像を保存し終えて書き込みスレッドを終了してから圧縮する
+        self._stop_save_workers()
+        
         if not self.session_folder or not self.session_folder.exists():
             print("\n⚠️  セッションフォルダが存在しません")
             print("   セッションが開始されていないか、既に削除されています")
@@ -154,12 +281,10 @@ class SessionManager:
         print(f"🗜️  セッションフォルダを圧縮中: {zip_path}")
         
         try:
-            # shutil.make_archiveを使用してZIP圧縮
-            shutil.make_archive(
-                str(zip_path.with_suffix('')),  # .zipを除いたパス
-                'zip',
-                self.session_folder
-            )
+            # セッションフォルダからの相対パスで無圧縮格納
+            with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_STORED) as zf:
+                for path in sorted(self.session_folder.rglob('*')):
+                    zf.write(path, path.relative_to(self.session_folder))
             print(f"✅ 圧縮完了: {zip_path}")
             
             # 元のフォルダを削除（オプション、コメントアウト）
@@ -0,0 +1,138 @@
+"""
+SPSCリングバッファモジュール
+
+このモジュールは、単一プロデューサ・単一コンシューマ（SPSC）間で
+オブジェクト参照を受け渡すための固定長リングバッファを提供します。
+queue.Queueと異なり、通常のpush/popではロックを取得しません。
+"""
+
+import threading
+from typing import Any, List, Optional
+
+
+class SPSCRing:
+    """単一プロデューサ・単一コンシューマ用のリングバッファ
+
+    書き込み位置（tail）はプロデューサのみが、読み出し位置（head）は
+    コンシューマのみが更新します。CPythonではint属性の代入はアトミックなため、
+    SPSCに限ればロックやCASなしで整合性が保たれます。
+
+    threading.Eventはコンシューマが空のリングで待機する場合にのみ使用します。
+    close()はキューへの終了番兵の投入に相当し、待機中のコンシューマを即座に起こします。
+
+    Note:
+        プロデューサ・コンシューマがそれぞれ1スレッドであることが前提です。
+        複数スレッドから同じ側を操作してはいけません。
+        Noneは「空」を表すため格納できません。
+    """
+
+    def __init__(self, capacity: int):
+        """
+        SPSCRingを初期化
+
+        Args:
+            capacity: 格納できる要素数の上限
+
+        Raises:
+            ValueError: capacityが1未満の場合
+        """
+        if capacity < 1:
+            raise ValueError(f"capacityは1以上である必要があります: {capacity}")
+
+        self.capacity = capacity
+        self._slots: List[Any] = [None] * capacity
+        self._head = 0  # 次に読み出す位置（コンシューマのみ更新）
+        self._tail = 0  # 次に書き込む位置（プロデューサのみ更新）
+        self._not_empty = threading.Event()
+        self._closed = False
+
+    def try_push(self, item: Any) -> bool:
+        """要素を非ブロッキングで追加（プロデューサ側）
+
+        Args:
+            item: 追加する要素（None以外）
+
+        Returns:
+            追加できた場合True、リングが満杯または閉じられている場合False
+        """
+        if self._closed:
+            return False
+
+        tail = self._tail
+        if tail - self._head >= self.capacity:
+            return False
+
+        self._slots[tail % self.capacity] = item
+        # スロットへの書き込み後にtailを進めることで、コンシューマに公開する
+        self._tail = tail + 1
+        self._not_empty.set()
+        return True
+
+    def try_pop(self) -> Optional[Any]:
+        """要素を非ブロッキングで取り出す（コンシューマ側）
+
+        Returns:
+            最も古い要素、またはリングが空の場合None
+        """
+        head = self._head
+        if head == self._tail:
+            return None
+
+        index = head % self.capacity
+        item = self._slots[index]
+        self._slots[index] = None  # 参照を保持し続けないように解放
+        self._head = head + 1
+        return item
+
+    def pop(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """要素を取り出す。空の場合はプロデューサの追加を待機（コンシューマ側）
+
+        閉じられたリングでは、残っている要素があっても即座にNoneを返します。
+
+        Args:
+            timeout: 最大待機時間（秒）。Noneの場合は無期限に待機
+
+        Returns:
+            取り出した要素、またはタイムアウトした場合・リングが閉じられた場合None
+        """
+        if self._closed:
+            return None
+
+        item = self.try_pop()
+        if item is not None:
+            return item
+
+        # イベントをクリアしてから再確認することで、
+        # 直前にpushされた要素の通知を取りこぼさないようにする
+        self._not_empty.clear()
+        item = self.try_pop()
+        if item is not None:
+            return item
+
+        self._not_empty.wait(timeout)
+        if self._closed:
+            return None
+        return self.try_pop()
+
+    def close(self) -> None:
+        """リングを閉じ、pop()で待機中のコンシューマを起こす（どのスレッドからも呼び出し可能）
+
+        閉じた後のtry_push()は失敗し、pop()は即座にNoneを返します。
+        残っている要素はclear()で破棄してください。
+        """
+        self._closed = True
+        self._not_empty.set()
+
+    @property
+    def closed(self) -> bool:
+        """リングが閉じられているか"""
+        return self._closed
+
+    def clear(self) -> None:
+        """全ての要素を破棄（コンシューマ側、またはスレッド停止後に呼び出す）"""
+        while self.try_pop() is not None:
+            pass
+
+    def __len__(self) -> int:
+        """現在格納されている要素数（他スレッド動作中は概算値）"""
+        return self._tail - self._head
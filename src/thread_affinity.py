@@ -0,0 +1,142 @@
+"""
+スレッドのCPU割り当てモジュール
+
+このモジュールは、パイプラインの常駐スレッド（キャプチャ・検出・OCRワーカー）を
+専用のCPUコアに固定するためのユーティリティを提供します。
+Linuxではos.sched_setaffinity()でコアを固定し、macOSではコアを指定できないため
+QoSクラスをUSER_INTERACTIVEに引き上げてパフォーマンスコアに載りやすくします。
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# macOS: <sys/qos.h> の QOS_CLASS_USER_INTERACTIVE
+QOS_CLASS_USER_INTERACTIVE = 0x21
+
+# キャプチャ・検出・OCRワーカー1つにそれぞれ専用コアを割り当てるのに必要な最小コア数
+MIN_CPUS_FOR_PINNING = 3
+
+
+@dataclass
+class CPUPinPlan:
+    """スレッド種別ごとのCPU割り当て
+
+    Attributes:
+        capture: キャプチャスレッドに割り当てるコア
+        detection: 検出スレッドに割り当てるコア（複数）
+        ocr_workers: OCRワーカーごとに割り当てるコア（ワーカー番号順）
+    """
+    capture: int
+    detection: Set[int] = field(default_factory=set)
+    ocr_workers: List[int] = field(default_factory=list)
+
+    def ocr_worker_cpus(self, index: int) -> Set[int]:
+        """OCRワーカーに割り当てるコアを取得
+
+        Args:
+            index: ワーカー番号
+
+        Returns:
+            割り当てるコアの集合（コア数よりワーカーが多い場合は巡回して割り当てる）
+        """
+        return {self.ocr_workers[index % len(self.ocr_workers)]}
+
+
+def compute_pin_plan(cpus: List[int], ocr_workers: int) -> Optional[CPUPinPlan]:
+    """利用可能なコアからスレッドごとの割り当てを計算
+
+    キャプチャは先頭の1コア、OCRワーカーは末尾から1コアずつ、検出は残り全てを使います。
+    検出スレッドから起動されるPyTorchの推論スレッドは検出スレッドの割り当てを
+    引き継ぐため、検出には1コアに絞らず残りのコアをまとめて割り当てます。
+
+    Args:
+        cpus: 利用可能なコア番号のリスト
+        ocr_workers: OCRワーカー数
+
+    Returns:
+        割り当て、またはコア数が足りない場合None
+    """
+    cpus = sorted(cpus)
+    if len(cpus) < MIN_CPUS_FOR_PINNING or ocr_workers < 1:
+        return None
+
+    capture = cpus[0]
+    # 検出用に少なくとも1コアを残す
+    ocr_count = min(ocr_workers, len(cpus) - 2)
+    ocr_cpus = cpus[len(cpus) - ocr_count:][::-1]
+    detection = set(cpus[1:len(cpus) - ocr_count])
+
+    return CPUPinPlan(capture=capture, detection=detection, ocr_workers=ocr_cpus)
+
+
+def available_cpus() -> List[int]:
+    """このプロセスが利用可能なコア番号を取得
+
+    Returns:
+        コア番号のリスト（sched_getaffinity非対応環境ではos.cpu_count()から推定）
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def pin_current_thread(cpus: Set[int], name: str = "") -> bool:
+    """呼び出し元スレッドを指定したコアに固定
+
+    Linuxではsched_setaffinity(0, ...)が呼び出し元スレッドのみに作用します。
+    macOSではコアを指定できないため、QoSクラスの引き上げのみ行います。
+
+    Args:
+        cpus: 割り当てるコアの集合
+        name: ログ出力用のスレッド名
+
+    Returns:
+        固定またはQoS設定に成功した場合True
+    """
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cpus)
+            logger.info(f"Pinned {name or 'thread'} to CPUs {sorted(cpus)}")
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to pin {name or 'thread'} to CPUs {sorted(cpus)}: {e}")
+            return False
+
+    if sys.platform == 'darwin':
+        return set_interactive_qos(name)
+
+    return False
+
+
+def set_interactive_qos(name: str = "") -> bool:
+    """呼び出し元スレッドのQoSクラスをUSER_INTERACTIVEに設定（macOSのみ）
+
+    Args:
+        name: ログ出力用のスレッド名
+
+    Returns:
+        設定に成功した場合True
+    """
+    if sys.platform != 'darwin':
+        return False
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'))
+        result = libc.pthread_set_qos_class_self_np(QOS_CLASS_USER_INTERACTIVE, 0)
+    except (OSError, AttributeError) as e:
+        logger.warning(f"Failed to set QoS class for {name or 'thread'}: {e}")
+        return False
+
+    if result != 0:
+        logger.warning(f"pthread_set_qos_class_self_np failed for {name or 'thread'}: {result}")
+        return False
+
+    logger.info(f"Set QoS class USER_INTERACTIVE for {name or 'thread'}")
+    return True
@@ -5,7 +5,9 @@
 OpenCVを使用してバウンディングボックスを描画し、ウィンドウに表示します。
 """
 
-from typing import List, TYPE_CHECKING
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Optional, Tuple, Union, TYPE_CHECKING
 import numpy as np
 import cv2
 from src.object_detector import DetectionResult
@@ -14,6 +16,43 @@ if TYPE_CHECKING:
     from src.hierarchical_detector import HierarchicalDetectionResult
 
 
+# この幅（ピクセル）未満の検出結果にはラベルを描画しない（ラベルが枠からはみ出して読めないため）
+MIN_LABELED_BOX_WIDTH = 30
+
+# 階層的検出結果のクラスごとの描画色（BGR形式）
+HIERARCHICAL_CLASS_COLORS = {
+    'list-item': (0, 255, 0),      # 緑
+    'title': (255, 0, 0),           # 青
+    'progress': (0, 255, 255),      # 黄色
+    'last_read_date': (255, 0, 255),  # マゼンタ
+    'site_name': (0, 165, 255)      # オレンジ
+}
+
+# 子要素の取得関数と描画色（描画順）。描画のたびに組み立てないよう事前に作成
+_CHILD_DRAW_SPECS = tuple(
+    (attrgetter(child_class), HIERARCHICAL_CLASS_COLORS[child_class])
+    for child_class in ('title', 'progress', 'last_read_date', 'site_name')
+)
+
+
+@lru_cache(maxsize=256)
+def _label_size(label: str) -> Tuple[int, int]:
+    """
+    検出ラベルの描画サイズを取得
+    
+    ラベルは「クラス名: 信頼度（小数第2位）」のため種類が限られ、
+    毎フレーム同じ文字列のサイズを計算し直さないようキャッシュします。
+    
+    Args:
+        label: ラベル文字列
+    
+    Returns:
+        (幅, 高さ)
+    """
+    (width, height), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+    return width, height
+
+
 class Visualizer:
     """
     検出結果の描画とウィンドウ表示を担当するクラス
@@ -22,30 +61,63 @@ class Visualizer:
     リアルタイムでウィンドウに表示します。
     """
     
-    def __init__(self, window_name: str = "Real-time Detection"):
+    def __init__(self, window_name: str = "Real-time Detection", use_opencl: bool = False):
         """
         Visualizerを初期化
         
         Args:
             window_name: 表示ウィンドウの名前（デフォルト: "Real-time Detection"）
+            use_opencl: draw_detectionsの描画をcv2.UMat（OpenCL）で行うか
+                （OpenCLが利用できない環境では無視され、CPUで描画）
         """
         self.window_name = window_name
         self._window_created = False
+        self.use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
     
-    def draw_detections(self, frame: np.ndarray, detections: List[DetectionResult]) -> np.ndarray:
+    def draw_detections(
+        self, frame: np.ndarray, detections: List[DetectionResult], inplace: bool = False
+    ) -> Union[np.ndarray, cv2.UMat]:
         """
         フレームに検出結果を描画
         
         Args:
             frame: 元画像（BGR形式のnumpy配列）
             detections: 検出結果のリスト
+            inplace: 元画像に直接描画するか（描画後に元画像が不要な呼び出し元向け。
+                OpenCL描画時はUMatへの転送がコピーを兼ねるため無視される）
         
         Returns:
-            描画済みの画像（元画像のコピー）
+            描画済みの画像（inplace=Falseの場合は元画像のコピー）。OpenCL描画時はcv2.UMatのまま返し、
+            ホスト側への転送はshow_frame()のcv2.imshowに任せる
         """
-        # 元画像を変更しないようにコピーを作成
-        annotated_frame = frame.copy()
+        if self.use_opencl:
+            try:
+                # UMatへの転送が元画像のコピーを兼ねる
+                # （OpenCVの型スタブにはndarrayを受け取るオーバーロードが定義されていない）
+                canvas = cv2.UMat(frame)  # type: ignore[call-overload]
+                self._draw_detection_overlays(canvas, detections)
+                return canvas
+            except cv2.error as e:
+                # OpenCLでの描画に失敗した場合は以降CPUで描画
+                print(f"OpenCLでの描画に失敗したため、CPU描画に切り替えます: {e}")
+                self.use_opencl = False
         
+        # 元画像を変更しないようにコピーを作成（inplaceの場合はコピーを省略）
+        annotated_frame = frame if inplace else frame.copy()
+        self._draw_detection_overlays(annotated_frame, detections)
+        return annotated_frame
+    
+    @staticmethod
+    def _draw_detection_overlays(annotated_frame, detections: List[DetectionResult]) -> None:
+        """
+        検出結果の矩形とラベルを描画（in-place変更）
+        
+        Args:
+            annotated_frame: 描画対象の画像（numpy配列またはcv2.UMat）
+            detections: 検出結果のリスト
+        """
         # 各検出結果に対してバウンディングボックスを描画
         for detection in detections:
             # 緑色の矩形を描画（BGR形式: (0, 255, 0)）
@@ -61,7 +133,7 @@ class Visualizer:
             label = f"{detection.class_name}: {detection.confidence:.2f}"
             
             # ラベルの背景を描画
-            label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+            label_size = _label_size(label)
             label_y = detection.y1 - 10 if detection.y1 - 10 > 10 else detection.y1 + 20
             
             cv2.rectangle(
@@ -83,15 +155,13 @@ class Visualizer:
                 1,
                 cv2.LINE_AA
             )
-        
-        return annotated_frame
     
-    def show_frame(self, frame: np.ndarray) -> bool:
+    def show_frame(self, frame: Union[np.ndarray, cv2.UMat]) -> bool:
         """
         フレームを表示し、キー入力をチェック
         
         Args:
-            frame: 表示する画像（BGR形式のnumpy配列）
+            frame: 表示する画像（BGR形式のnumpy配列、またはdraw_detectionsが返したcv2.UMat）
         
         Returns:
             継続する場合True、'q'キーが押された場合False
@@ -104,8 +174,24 @@ class Visualizer:
         # フレームを表示
         cv2.imshow(self.window_name, frame)
         
-        # キー入力をチェック（1ms待機）
-        key = cv2.waitKey(1) & 0xFF
+        return self.poll_key()
+    
+    def poll_key(self) -> bool:
+        """
+        フレームを更新せずにウィンドウのイベント処理とキー入力のチェックのみ行う
+        
+        静止画面では新しいフレームが届かないため、その間もウィンドウを応答させ、
+        'q'キーでの終了を受け付けるために使用します。
+        
+        Returns:
+            継続する場合True、'q'キーが押された場合False
+        """
+        # ウィンドウ作成前はイベント処理の対象がない
+        if not self._window_created:
+            return True
+        
+        # キー入力をチェック（waitKey(1)と異なり、キー入力がなければ待機せずに戻る）
+        key = cv2.pollKey() & 0xFF
         
         # 'q'キーが押された場合はFalseを返す
         if key == ord('q'):
@@ -129,7 +215,8 @@ class Visualizer:
     def draw_hierarchical_detections(
         self, 
         frame: np.ndarray, 
-        hierarchical_results: List['HierarchicalDetectionResult']
+        hierarchical_results: List['HierarchicalDetectionResult'],
+        inplace: bool = False
     ) -> np.ndarray:
         """
         階層的検出結果をフレームに描画
@@ -140,21 +227,16 @@ class Visualizer:
         Args:
             frame: 元画像（BGR形式のnumpy配列）
             hierarchical_results: 階層的検出結果のリスト
+            inplace: 元画像に直接描画するか（描画後に元画像が不要な呼び出し元向け）
         
         Returns:
-            描画済みの画像（元画像のコピー）
+            描画済みの画像（inplace=Falseの場合は元画像のコピー）
         """
-        # 元画像を変更しないようにコピーを作成
-        annotated_frame = frame.copy()
+        # 元画像を変更しないようにコピーを作成（inplaceの場合はコピーを省略）
+        annotated_frame = frame if inplace else frame.copy()
         
-        # クラスごとの色を定義（BGR形式）
-        class_colors = {
-            'list-item': (0, 255, 0),      # 緑
-            'title': (255, 0, 0),           # 青
-            'progress': (0, 255, 255),      # 黄色
-            'last_read_date': (255, 0, 255),  # マゼンタ
-            'site_name': (0, 165, 255)      # オレンジ
-        }
+        # 描画済みラベルの矩形（重なるラベルの描画を省略するため）
+        drawn_labels: List[Tuple[int, int, int, int]] = []
         
         # 各階層的検出結果に対して描画
         for hierarchical_result in hierarchical_results:
@@ -162,19 +244,21 @@ class Visualizer:
             self._draw_detection_box(
                 annotated_frame,
                 hierarchical_result.list_item_bbox,
-                class_colors['list-item'],
-                thickness=3  # 親は太い線で描画
+                HIERARCHICAL_CLASS_COLORS['list-item'],
+                thickness=3,  # 親は太い線で描画
+                drawn_labels=drawn_labels
             )
             
             # 子要素を描画
-            for child_class in ['title', 'progress', 'last_read_date', 'site_name']:
-                child_detection = getattr(hierarchical_result, child_class, None)
-                if child_detection:
+            for get_child, color in _CHILD_DRAW_SPECS:
+                child_detection = get_child(hierarchical_result)
+                if child_detection is not None:
                     self._draw_detection_box(
                         annotated_frame,
                         child_detection,
-                        class_colors[child_class],
-                        thickness=2
+                        color,
+                        thickness=2,
+                        drawn_labels=drawn_labels
                     )
         
         return annotated_frame
@@ -184,16 +268,22 @@ class Visualizer:
         frame: np.ndarray,
         detection: DetectionResult,
         color: tuple,
-        thickness: int = 2
+        thickness: int = 2,
+        drawn_labels: Optional[List[Tuple[int, int, int, int]]] = None
     ) -> None:
         """
         単一の検出結果をフレームに描画（内部ヘルパーメソッド）
         
+        幅がMIN_LABELED_BOX_WIDTH未満の検出結果、画面外にはみ出すラベル、
+        描画済みのラベルと重なるラベルは描画を省略します（枠のみ描画）。
+        
         Args:
             frame: 描画対象の画像（in-place変更）
             detection: 検出結果
             color: 描画色（BGR形式のタプル）
             thickness: 線の太さ
+            drawn_labels: 描画済みラベルの矩形(x1, y1, x2, y2)のリスト。
+                指定した場合は重なり判定に使用し、描画したラベルの矩形を追加する
         """
         # バウンディングボックスを描画
         cv2.rectangle(
@@ -204,17 +294,41 @@ class Visualizer:
             thickness=thickness
         )
         
+        if detection.x2 - detection.x1 < MIN_LABELED_BOX_WIDTH:
+            return
+        
         # クラス名と信頼度をラベルとして表示
         label = f"{detection.class_name}: {detection.confidence:.2f}"
         
-        # ラベルの背景を描画
-        label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+        # ラベルの矩形を計算
+        label_size = _label_size(label)
         label_y = detection.y1 - 10 if detection.y1 - 10 > 10 else detection.y1 + 20
+        label_rect = (
+            detection.x1,
+            label_y - label_size[1] - 5,
+            detection.x1 + label_size[0],
+            label_y + 5
+        )
+        
+        # 画面外のラベルは描画しない（putTextのアンチエイリアス描画を省く）
+        frame_height, frame_width = frame.shape[:2]
+        if (label_rect[0] >= frame_width or label_rect[2] < 0
+                or label_rect[1] >= frame_height or label_rect[3] < 0):
+            return
         
+        # 描画済みのラベルと重なるラベルは描画しない（重なると読めないため）
+        if drawn_labels is not None:
+            x1, y1, x2, y2 = label_rect
+            for dx1, dy1, dx2, dy2 in drawn_labels:
+                if x1 <= dx2 and dx1 <= x2 and y1 <= dy2 and dy1 <= y2:
+                    return
+            drawn_labels.append(label_rect)
+        
+        # ラベルの背景を描画
         cv2.rectangle(
             frame,
-            (detection.x1, label_y - label_size[1] - 5),
-            (detection.x1 + label_size[0], label_y + 5),
+            label_rect[:2],
+            label_rect[2:],
             color=color,
             thickness=-1  # 塗りつぶし
         )
@@ -13,10 +13,11 @@ def test_detection_cache():
     
     cache = DetectionCache(ttl=1.0, similarity_threshold=0.95)
     
-    # テストフレームを作成
-    frame1 = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    # テストフレームを作成（シード固定で再現可能にする）
+    rng = np.random.default_rng(0)
+    frame1 = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
     frame2 = frame1.copy()  # 同じフレーム
-    frame3 = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)  # 異なるフレーム
+    frame3 = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)  # 異なるフレーム
     
     # テスト検出結果
     detections = [
@@ -50,6 +51,30 @@ def test_detection_cache():
     print("✓ DetectionCache テスト成功\n")
 
 
+def test_detection_cache_similar_frame():
+    """わずかに変化したフレームが類似と判定されることをテスト"""
+    print("=== DetectionCache 類似フレーム テスト ===")
+    
+    cache = DetectionCache(ttl=1.0, similarity_threshold=0.9)
+    
+    # 縦方向のグラデーション（行ごとに明るさが変わる画面を模擬）
+    frame1 = np.repeat(np.linspace(0, 255, 480, dtype=np.uint8)[:, None, None], 640, axis=1).repeat(3, axis=2)
+    frame2 = frame1.copy()
+    frame2[0:20, 0:20] = 255  # 左上の小さな領域のみ変化
+    frame3 = frame1[::-1].copy()  # 上下反転（大きく変化）
+    
+    cache.update_cache(frame1, [])
+    
+    similarity = cache._compute_similarity(
+        cache.compute_fingerprint(frame2), cache.compute_fingerprint(frame1)
+    )
+    print(f"類似度: {similarity:.3f}")
+    assert cache.should_skip_detection(frame2), "わずかな変化はキャッシュヒットのはず"
+    assert not cache.should_skip_detection(frame3), "大きな変化はキャッシュミスのはず"
+    
+    print("✓ DetectionCache 類似フレーム テスト成功\n")
+
+
 def test_ocr_cache():
     """OCRCacheの基本動作をテスト"""
     print("=== OCRCache テスト ===")
@@ -96,7 +121,54 @@ def test_ocr_cache():
     print("✓ OCRCache テスト成功\n")
 
 
+def test_ocr_cache_neighbor_cells():
+    """セル境界をまたぐ近似座標と、サイズ上限での削除をテスト"""
+    print("=== OCRCache 隣接セル テスト ===")
+    
+    cache = OCRCache(position_tolerance=10, ttl=2.0, max_cache_size=3)
+    
+    # y1=99とy1=101は別のセル（9と10）だが、差は許容誤差以内
+    cache.update_cache(DetectionResult(100, 99, 200, 149, 0.9, 0, "list-item"), "境界の行")
+    assert cache.get_cached_text(DetectionResult(100, 101, 200, 151, 0.9, 0, "list-item")) == "境界の行"
+    
+    # 上限を超えると最も古いエントリから削除される
+    for i in range(3):
+        cache.update_cache(DetectionResult(100, 200 + i * 50, 200, 240 + i * 50, 0.9, 0, "list-item"), f"行{i}")
+    assert len(cache.cache) == 3
+    assert cache.get_cached_text(DetectionResult(100, 99, 200, 149, 0.9, 0, "list-item")) is None
+    assert cache.get_cached_text(DetectionResult(100, 250, 200, 290, 0.9, 0, "list-item")) == "行1"
+    
+    print("✓ OCRCache 隣接セル テスト成功\n")
+
+
+def test_ocr_cache_content_hash():
+    """OCRCacheの内容ハッシュによる再利用判定をテスト"""
+    print("=== OCRCache 内容ハッシュ テスト ===")
+    
+    cache = OCRCache(position_tolerance=10, ttl=2.0)
+    
+    bbox = DetectionResult(100, 100, 200, 150, 0.9, 0, "list-item")
+    hash1 = bytes([0b10101010, 0b11110000])
+    hash_near = bytes([0b10101011, 0b11110000])  # 1ビット違い（同じ位置で行の内容が更新された）
+    
+    cache.update_cache(bbox, "テストテキスト1", hash1)
+    
+    assert cache.get_cached_text(bbox, hash1) == "テストテキスト1", "同じ内容はキャッシュヒットのはず"
+    assert cache.get_cached_text(bbox, hash_near) is None, "同じ位置でも内容が変わればキャッシュミスのはず"
+    assert cache.get_cached_text(bbox) == "テストテキスト1", "ハッシュ未指定は座標のみで判定するはず"
+    
+    # 同じ位置の新しい内容で上書き
+    cache.update_cache(bbox, "テストテキスト2", hash_near)
+    assert cache.get_cached_text(bbox, hash_near) == "テストテキスト2", "上書き後の内容でヒットするはず"
+    assert cache.get_cached_text(bbox, hash1) is None, "上書き前の内容はキャッシュミスのはず"
+    
+    print("✓ OCRCache 内容ハッシュ テスト成功\n")
+
+
 if __name__ == "__main__":
     test_detection_cache()
+    test_detection_cache_similar_frame()
     test_ocr_cache()
+    test_ocr_cache_neighbor_cells()
+    test_ocr_cache_content_hash()
     print("=== 全テスト成功 ===")
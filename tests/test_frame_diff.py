@@ -0,0 +1,54 @@
+"""フレーム差分検出の動作確認テスト"""
+
+import numpy as np
+from src.frame_diff import FrameDiffDetector
+
+
+def test_static_and_changed_frames():
+    """静止フレームと変化のあるフレームの判定をテスト"""
+    print("=== FrameDiffDetector 判定テスト ===")
+
+    detector = FrameDiffDetector(threshold=2.0)
+    frame = np.full((480, 640, 3), 100, dtype=np.uint8)
+
+    assert not detector.is_static(frame), "最初のフレームは変化ありのはず"
+    assert detector.is_static(frame.copy()), "同じ内容のフレームは静止のはず"
+
+    noisy = frame.copy()
+    noisy[::7, ::7] += 1
+    assert detector.is_static(noisy), "わずかなノイズは静止とみなすはず"
+
+    changed = frame.copy()
+    changed[:240] = 200
+    assert not detector.is_static(changed), "大きく変化したフレームは変化ありのはず"
+    assert detector.is_static(changed.copy()), "変化後のフレームが新しい基準になるはず"
+
+    print("✓ FrameDiffDetector 判定テスト成功\n")
+
+
+def test_gradual_change_accumulates():
+    """少しずつの変化が蓄積すると変化ありと判定されることをテスト"""
+    print("=== FrameDiffDetector 蓄積テスト ===")
+
+    detector = FrameDiffDetector(threshold=2.0)
+    results = []
+    for value in range(100, 110):
+        frame = np.full((120, 160, 3), value, dtype=np.uint8)
+        results.append(detector.is_static(frame))
+
+    print(f"判定結果: {results}")
+    assert results[0] is False
+    assert results[1] is True, "1段階の変化は静止とみなすはず"
+    assert False in results[1:], "変化が蓄積すれば変化ありと判定されるはず"
+
+    detector.reset()
+    assert not detector.is_static(np.full((120, 160, 3), 109, dtype=np.uint8)), \
+        "reset後の最初のフレームは変化ありのはず"
+
+    print("✓ FrameDiffDetector 蓄積テスト成功\n")
+
+
+if __name__ == "__main__":
+    test_static_and_changed_frames()
+    test_gradual_change_accumulates()
+    print("=== 全テスト成功 ===")
@@ -0,0 +1,45 @@
+"""フレームバッファプールの動作確認テスト"""
+
+import numpy as np
+from src.frame_pool import FramePool
+
+
+def test_frame_pool_reuse():
+    """バッファの取得・返却・上限をテスト"""
+    print("=== FramePool テスト ===")
+
+    pool = FramePool(size=2)
+    assert pool.acquire() is None, "確保前のプールは空のはず"
+
+    pool.allocate((480, 640, 3))
+    assert len(pool) == 2, "sizeの数だけ確保されるはず"
+
+    buf1 = pool.acquire()
+    buf2 = pool.acquire()
+    assert buf1.shape == (480, 640, 3)
+    assert buf1.dtype == np.uint8
+    assert pool.acquire() is None, "全て取得済みの場合はNoneのはず"
+
+    # 返却したバッファが再利用される
+    pool.release(buf1)
+    assert pool.acquire() is buf1, "返却したバッファが再利用されるはず"
+
+    # 読み取り専用で公開されたバッファも、再取得時は書き込み可能に戻る
+    buf1.flags.writeable = False
+    pool.release(buf1)
+    reused = pool.acquire()
+    assert reused is buf1
+    assert reused.flags.writeable, "再取得したバッファは書き込み可能のはず"
+
+    # 上限を超えて返却しても保持しない
+    pool.release(buf1)
+    pool.release(buf2)
+    pool.release(np.empty((480, 640, 3), dtype=np.uint8))
+    assert len(pool) == 2, "上限を超えたバッファは破棄されるはず"
+
+    print("✓ FramePool テスト成功\n")
+
+
+if __name__ == "__main__":
+    test_frame_pool_reuse()
+    print("=== 全テスト成功 ===")
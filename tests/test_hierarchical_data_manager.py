@@ -6,6 +6,7 @@ import pytest
 from pathlib import Path
 import tempfile
 import pandas as pd
+from unittest.mock import patch
 from src.hierarchical_data_manager import HierarchicalDataManager, StructuredRecord
 from src.hierarchical_detector import HierarchicalDetectionResult
 from src.object_detector import DetectionResult
@@ -81,6 +82,18 @@ class TestHierarchicalDataManager:
         # 全く異なるタイトルは重複ではない
         assert dm._is_duplicate("無職転生") is False
     
+    def test_is_duplicate_cached_match(self):
+        """重複と判定済みのタイトルは全タイトルとの比較を省略するテスト"""
+        dm = HierarchicalDataManager(similarity_threshold=0.75)
+        dm.titles = ["転生したらスライムだった件"]
+        
+        assert dm._is_duplicate("転生したらスライムだつた件") is True
+        
+        # 2回目は判定済みの結果を使用（SequenceMatcherを呼び出さない）
+        with patch('src.hierarchical_data_manager.SequenceMatcher') as mock_matcher:
+            assert dm._is_duplicate("転生したらスライムだつた件") is True
+            mock_matcher.assert_not_called()
+    
     def test_is_duplicate_empty_title(self):
         """空文字列の重複チェックテスト"""
         dm = HierarchicalDataManager()
@@ -263,6 +276,8 @@ class TestHierarchicalDataManager:
         
         assert result is True
         assert dm.records[0].error_status == "missing_title"
+        assert dm.error_count == 1
+        assert dm.get_error_records() == [dm.records[0]]
     
     def test_export_to_csv_with_data(self, capsys):
         """データありのCSV出力テスト"""
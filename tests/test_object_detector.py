@@ -6,7 +6,9 @@ Requirements: 2.3, 2.4, 2.5
 
 import pytest
 import numpy as np
+import torch
 from pathlib import Path
+from ultralytics.engine.results import Boxes
 from unittest.mock import Mock, patch, MagicMock
 from src.object_detector import ObjectDetector, DetectionResult
 
@@ -70,6 +72,74 @@ class TestObjectDetector:
         assert detector.device == "mps"
         mock_model.to.assert_called_once_with("mps")
     
+    def test_init_unknown_backend(self):
+        """未対応の推論バックエンドを指定した場合にエラーが発生することを確認"""
+        with pytest.raises(ValueError) as exc_info:
+            ObjectDetector("models/best.pt", backend="tensorrt")
+        
+        assert "tensorrt" in str(exc_info.value)
+    
+    @patch.object(ObjectDetector, '_export_model')
+    @patch('src.object_detector.YOLO')
+    @patch('src.object_detector.torch')
+    @patch('src.object_detector.Path.exists')
+    def test_init_onnx_backend_loads_exported_model(self, mock_exists, mock_torch, mock_yolo, mock_export):
+        """onnxバックエンドではエクスポート済みモデルをロードすることを確認"""
+        mock_exists.return_value = True
+        mock_torch.backends.mps.is_available.return_value = False
+        mock_torch.cuda.is_available.return_value = False
+        mock_export.return_value = Path("models/best.onnx")
+        
+        mock_model = MagicMock()
+        mock_yolo.return_value = mock_model
+        
+        detector = ObjectDetector("models/best.pt", backend="onnx")
+        
+        assert detector.backend == "onnx"
+        mock_export.assert_called_once_with("onnx")
+        mock_yolo.assert_called_once_with(str(Path("models/best.onnx")), task="detect")
+        # エクスポート済みモデルはデバイス転送しない
+        mock_model.to.assert_not_called()
+    
+    @patch.object(ObjectDetector, '_export_model')
+    @patch('src.object_detector.YOLO')
+    @patch('src.object_detector.torch')
+    @patch('src.object_detector.Path.exists')
+    def test_init_backend_export_failure_falls_back(self, mock_exists, mock_torch, mock_yolo, mock_export):
+        """エクスポートに失敗した場合はPyTorchで推論することを確認"""
+        mock_exists.return_value = True
+        mock_torch.backends.mps.is_available.return_value = False
+        mock_torch.cuda.is_available.return_value = False
+        mock_export.return_value = None
+        
+        mock_model = MagicMock()
+        mock_yolo.return_value = mock_model
+        
+        detector = ObjectDetector("models/best.pt", backend="coreml")
+        
+        assert detector.backend == "pytorch"
+        mock_yolo.assert_called_once_with(str(Path("models/best.pt")))
+        mock_model.to.assert_called_once_with("cpu")
+    
+    @patch.object(ObjectDetector, '_quantize_onnx')
+    @patch.object(ObjectDetector, '_export_model')
+    @patch('src.object_detector.YOLO')
+    @patch('src.object_detector.torch')
+    @patch('src.object_detector.Path.exists')
+    def test_init_onnx_backend_quantized(self, mock_exists, mock_torch, mock_yolo, mock_export, mock_quantize):
+        """INT8量子化を有効にした場合は量子化済みモデルをロードすることを確認"""
+        mock_exists.return_value = True
+        mock_torch.backends.mps.is_available.return_value = False
+        mock_torch.cuda.is_available.return_value = False
+        mock_export.return_value = Path("models/best.onnx")
+        mock_quantize.return_value = Path("models/best.int8.onnx")
+        
+        detector = ObjectDetector("models/best.pt", backend="onnx", quantize_int8=True)
+        
+        assert detector.quantized
+        mock_quantize.assert_called_once_with(Path("models/best.onnx"))
+        mock_yolo.assert_called_once_with(str(Path("models/best.int8.onnx")), task="detect")
+    
     @patch('src.object_detector.YOLO')
     @patch('src.object_detector.torch')
     @patch('src.object_detector.Path.exists')
@@ -104,30 +174,15 @@ class TestObjectDetector:
         mock_model = MagicMock()
         mock_yolo.return_value = mock_model
         
-        # 検出結果のモック（信頼度が異なる3つの検出）
-        mock_box1 = MagicMock()
-        mock_box1.conf = [0.85]  # しきい値以上
-        mock_xyxy1 = MagicMock()
-        mock_xyxy1.cpu.return_value.numpy.return_value = np.array([100, 200, 300, 400])
-        mock_box1.xyxy = [mock_xyxy1]
-        mock_box1.cls = [0]
-        
-        mock_box2 = MagicMock()
-        mock_box2.conf = [0.45]  # しきい値以下（除外される）
-        mock_xyxy2 = MagicMock()
-        mock_xyxy2.cpu.return_value.numpy.return_value = np.array([150, 250, 350, 450])
-        mock_box2.xyxy = [mock_xyxy2]
-        mock_box2.cls = [0]
-        
-        mock_box3 = MagicMock()
-        mock_box3.conf = [0.72]  # しきい値以上
-        mock_xyxy3 = MagicMock()
-        mock_xyxy3.cpu.return_value.numpy.return_value = np.array([200, 300, 400, 500])
-        mock_box3.xyxy = [mock_xyxy3]
-        mock_box3.cls = [0]
+        # 検出結果のモック（信頼度が異なる3つの検出、列は x1, y1, x2, y2, conf, cls）
+        boxes = Boxes(torch.tensor([
+            [100, 200, 300, 400, 0.85, 0],  # しきい値以上
+            [150, 250, 350, 450, 0.45, 0],  # しきい値以下（除外される）
+            [200, 300, 400, 500, 0.72, 0],  # しきい値以上
+        ], dtype=torch.float64), orig_shape=(640, 480))
         
         mock_result = MagicMock()
-        mock_result.boxes = [mock_box1, mock_box2, mock_box3]
+        mock_result.boxes = boxes
         mock_result.names = {0: "list-item"}
         
         mock_model.return_value = [mock_result]
@@ -158,16 +213,13 @@ class TestObjectDetector:
         mock_model = MagicMock()
         mock_yolo.return_value = mock_model
         
-        # 検出結果のモック
-        mock_box = MagicMock()
-        mock_box.conf = [0.92]
-        mock_xyxy = MagicMock()
-        mock_xyxy.cpu.return_value.numpy.return_value = np.array([50.5, 100.7, 250.3, 400.9])
-        mock_box.xyxy = [mock_xyxy]
-        mock_box.cls = [0]
+        # 検出結果のモック（列は x1, y1, x2, y2, conf, cls）
+        boxes = Boxes(torch.tensor([
+            [50.5, 100.7, 250.3, 400.9, 0.92, 0],
+        ], dtype=torch.float64), orig_shape=(640, 480))
         
         mock_result = MagicMock()
-        mock_result.boxes = [mock_box]
+        mock_result.boxes = boxes
         mock_result.names = {0: "list-item"}
         
         mock_model.return_value = [mock_result]
@@ -192,6 +244,36 @@ class TestObjectDetector:
         assert detection.class_id == 0
         assert detection.class_name == "list-item"
     
+    @patch('src.object_detector.YOLO')
+    @patch('src.object_detector.torch')
+    @patch('src.object_detector.Path.exists')
+    def test_detect_sorted_by_y(self, mock_exists, mock_torch, mock_yolo):
+        """信頼度順のNMS出力がY座標順に並べ替えられることを確認"""
+        mock_exists.return_value = True
+        mock_torch.backends.mps.is_available.return_value = False
+        mock_torch.cuda.is_available.return_value = False
+        
+        mock_model = MagicMock()
+        mock_yolo.return_value = mock_model
+        
+        # 信頼度の高い順（Y座標はばらばら）
+        boxes = Boxes(torch.tensor([
+            [0, 500, 100, 600, 0.95, 0],
+            [0, 100, 100, 200, 0.90, 0],
+            [0, 300, 100, 400, 0.80, 0],
+        ], dtype=torch.float64), orig_shape=(640, 480))
+        
+        mock_result = MagicMock()
+        mock_result.boxes = boxes
+        mock_result.names = {0: "list-item"}
+        mock_model.return_value = [mock_result]
+        
+        detector = ObjectDetector("models/best.pt")
+        detections = detector.detect(np.zeros((640, 480, 3), dtype=np.uint8))
+        
+        assert [d.y1 for d in detections] == [100, 300, 500]
+        assert [d.confidence for d in detections] == [0.90, 0.80, 0.95]
+    
     @patch('src.object_detector.YOLO')
     @patch('src.object_detector.torch')
     @patch('src.object_detector.Path.exists')
@@ -370,6 +370,48 @@ class TestExtractText:
         assert call_kwargs['config'] == '--psm 6'
 
 
+class TestCropRoi:
+    """crop_roiメソッドのテストスイート"""
+    
+    @patch('src.ocr_processor.pytesseract.get_tesseract_version')
+    def test_crop_roi_contiguous_copy(self, mock_get_version):
+        """切り出し結果が元フレームから独立した連続配列であることを確認"""
+        mock_get_version.return_value = "5.0.0"
+        
+        processor = OCRProcessor(margin=10)
+        
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        bbox = DetectionResult(
+            x1=100, y1=100, x2=300, y2=200,
+            confidence=0.9, class_id=0, class_name="list-item"
+        )
+        
+        roi = processor.crop_roi(frame, bbox)
+        
+        assert roi.shape == (120, 220, 3)
+        assert roi.flags['C_CONTIGUOUS']
+        
+        # 元フレームを書き換えても切り出し結果は変わらない
+        frame[:] = 255
+        assert roi.max() == 0
+    
+    @patch('src.ocr_processor.pytesseract.get_tesseract_version')
+    def test_crop_roi_too_small(self, mock_get_version):
+        """小さすぎる領域・画像外の領域ではNoneが返ることを確認"""
+        mock_get_version.return_value = "5.0.0"
+        
+        processor = OCRProcessor()
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        
+        small = DetectionResult(x1=100, y1=100, x2=110, y2=110,
+                                confidence=0.9, class_id=0, class_name="list-item")
+        outside = DetectionResult(x1=700, y1=500, x2=800, y2=600,
+                                  confidence=0.9, class_id=0, class_name="list-item")
+        
+        assert processor.crop_roi(frame, small) is None
+        assert processor.crop_roi(frame, outside) is None
+
+
 class TestOCRProcessorIntegration:
     """統合テスト（実際のTesseractとサンプル画像を使用）"""
     
@@ -450,3 +492,104 @@ class TestOCRProcessorIntegration:
         
         # 結果が文字列であることを確認
         assert isinstance(result, str)
+
+
+class TestExtractTextBatch:
+    """extract_text_batchメソッドのテストスイート"""
+    
+    @patch('src.ocr_processor.pytesseract.get_tesseract_version')
+    @patch('src.ocr_processor.pytesseract.image_to_string')
+    def test_extract_text_batch_preserves_order(self, mock_image_to_string, mock_get_version):
+        """入力と同じ順序で結果が返り、切り出せない領域は空文字列になることを確認"""
+        mock_get_version.return_value = "5.0.0"
+        mock_image_to_string.side_effect = ["1件目のテキスト", "2件目のテキスト"]
+        
+        processor = OCRProcessor()
+        # 領域ごとに内容が異なるフレーム（内容ハッシュのキャッシュに当たらないように）
+        frame = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        
+        bboxes = [
+            DetectionResult(x1=50, y1=50, x2=300, y2=120,
+                            confidence=0.9, class_id=0, class_name="list-item"),
+            DetectionResult(x1=100, y1=100, x2=110, y2=110,
+                            confidence=0.9, class_id=0, class_name="list-item"),
+            DetectionResult(x1=50, y1=200, x2=300, y2=270,
+                            confidence=0.9, class_id=0, class_name="list-item"),
+        ]
+        
+        texts = processor.extract_text_batch(frame, bboxes)
+        
+        assert texts == ["1件目のテキスト", "", "2件目のテキスト"]
+        # 小さすぎる領域はOCRを呼び出さない
+        assert mock_image_to_string.call_count == 2
+
+
+
+class TestContentCache:
+    """内容ハッシュによるOCR結果キャッシュのテストスイート"""
+    
+    @patch('src.ocr_processor.pytesseract.get_tesseract_version')
+    @patch('src.ocr_processor.pytesseract.image_to_string')
+    def test_same_content_skips_tesseract(self, mock_image_to_string, mock_get_version):
+        """同じ内容の領域は位置が違ってもTesseractを再実行しないことを確認"""
+        mock_get_version.return_value = "5.0.0"
+        mock_image_to_string.side_effect = ["転生したらスライムだった件", "無職転生"]
+        
+        processor = OCRProcessor(margin=0)
+        rng = np.random.default_rng(1)
+        row = rng.integers(0, 256, (60, 300, 3), dtype=np.uint8)
+        
+        # 同じ文字行がスクロールで別の位置に表示されたフレーム
+        frame1 = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame1[100:160, 50:350] = row
+        frame2 = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame2[220:280, 50:350] = row
+        
+        bbox1 = DetectionResult(x1=50, y1=100, x2=350, y2=160,
+                                confidence=0.9, class_id=0, class_name="list-item")
+        bbox2 = DetectionResult(x1=50, y1=220, x2=350, y2=280,
+                                confidence=0.9, class_id=0, class_name="list-item")
+        
+        assert processor.extract_text(frame1, bbox1) == "転生したらスライムだった件"
+        assert processor.extract_text(frame2, bbox2) == "転生したらスライムだった件"
+        assert mock_image_to_string.call_count == 1
+        
+        # 内容が異なる領域はTesseractを実行する
+        frame2[220:280, 50:350] = rng.integers(0, 256, (60, 300, 3), dtype=np.uint8)
+        assert processor.extract_text(frame2, bbox2) == "無職転生"
+        assert mock_image_to_string.call_count == 2
+    
+    @patch('src.ocr_processor.pytesseract.get_tesseract_version')
+    def test_content_cache_lru_eviction(self, mock_get_version):
+        """最大エントリ数を超えると古いエントリから破棄されることを確認"""
+        mock_get_version.return_value = "5.0.0"
+        
+        processor = OCRProcessor(content_cache_size=2)
+        rng = np.random.default_rng(2)
+        rois = [rng.integers(0, 256, (40, 200, 3), dtype=np.uint8) for _ in range(3)]
+        
+        with patch('src.ocr_processor.pytesseract.image_to_string', side_effect=["テキスト1", "テキスト2", "テキスト3"]):
+            for roi in rois:
+                processor.extract_text_from_roi(roi)
+        
+        assert len(processor._content_cache) == 2
+        assert OCRProcessor.content_hash(rois[0]) not in processor._content_cache
+        assert OCRProcessor.content_hash(rois[2]) in processor._content_cache
+    
+    @patch('src.ocr_processor.pytesseract.get_tesseract_version')
+    @patch('src.ocr_processor.pytesseract.image_to_string')
+    def test_single_digit_difference_reaches_tesseract(self, mock_image_to_string, mock_get_version):
+        """数字1文字だけ異なる行がどちらもTesseractで処理されることを確認"""
+        mock_get_version.return_value = "5.0.0"
+        mock_image_to_string.side_effect = ["Episode 3/512", "Episode 4/512"]
+        
+        processor = OCRProcessor()
+        rois = []
+        for text in ("Episode 3/512", "Episode 4/512"):
+            roi = np.full((140, 700, 3), 255, dtype=np.uint8)
+            cv2.putText(roi, text, (20, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+            rois.append(roi)
+        
+        assert processor.extract_text_from_roi(rois[0]) == "Episode 3/512"
+        assert processor.extract_text_from_roi(rois[1]) == "Episode 4/512"
+        assert mock_image_to_string.call_count == 2
@@ -0,0 +1,84 @@
+"""OCRワーカープールの動作確認テスト"""
+
+import threading
+import time
+from concurrent.futures import as_completed
+
+import pytest
+
+from src.ocr_worker_pool import OCRWorkerPool
+
+
+def test_submit_and_collect():
+    """投入したタスクの結果と例外をFutureで受け取れることをテスト"""
+    print("=== OCRWorkerPool 結果回収テスト ===")
+
+    pool = OCRWorkerPool(max_workers=3)
+    try:
+        futures = [pool.submit(lambda x: x * 2, i) for i in range(50)]
+        results = sorted(f.result(timeout=5.0) for f in as_completed(futures, timeout=5.0))
+        assert results == [i * 2 for i in range(50)], "全タスクの結果を受け取れるはず"
+
+        def fail() -> None:
+            raise ValueError("OCR failed")
+
+        with pytest.raises(ValueError):
+            pool.submit(fail).result(timeout=5.0)
+    finally:
+        pool.shutdown(wait=True)
+
+    with pytest.raises(RuntimeError):
+        pool.submit(lambda: None)
+
+    print("✓ OCRWorkerPool 結果回収テスト成功\n")
+
+
+def test_shutdown_cancels_pending():
+    """cancel_futures=Trueで未着手のタスクがキャンセルされることをテスト"""
+    print("=== OCRWorkerPool キャンセルテスト ===")
+
+    pool = OCRWorkerPool(max_workers=1)
+    release = threading.Event()
+
+    running = pool.submit(release.wait, 5.0)
+    time.sleep(0.05)  # 1つ目のタスクがワーカーで実行中になるまで待機
+    pending = [pool.submit(lambda: "never") for _ in range(3)]
+
+    pool.shutdown(wait=False, cancel_futures=True)
+    release.set()
+
+    assert running.result(timeout=5.0) is True, "実行中のタスクは完了するはず"
+    assert all(f.cancelled() for f in pending), "未着手のタスクはキャンセルされるはず"
+
+    print("✓ OCRWorkerPool キャンセルテスト成功\n")
+
+
+def test_slow_tasks_run_in_parallel():
+    """実行中のワーカーがいても、待機中のワーカーに振り分けて並列実行されることをテスト"""
+    print("=== OCRWorkerPool 並列実行テスト ===")
+
+    workers = 4
+    pool = OCRWorkerPool(max_workers=workers)
+    try:
+        start = time.perf_counter()
+        futures = []
+        for _ in range(workers):
+            futures.append(pool.submit(time.sleep, 0.2))
+            time.sleep(0.005)  # 先に投入したタスクがワーカーで実行中になってから次を投入
+        for future in futures:
+            future.result(timeout=5.0)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.shutdown(wait=True)
+
+    print(f"経過時間: {elapsed:.3f}s")
+    assert elapsed < 0.35, f"{workers}個のタスクは並列に実行されるはず: {elapsed:.3f}s"
+
+    print("✓ OCRWorkerPool 並列実行テスト成功\n")
+
+
+if __name__ == "__main__":
+    test_submit_and_collect()
+    test_shutdown_cancels_pending()
+    test_slow_tasks_run_in_parallel()
+    print("=== 全テスト成功 ===")
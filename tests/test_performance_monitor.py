@@ -6,6 +6,13 @@ import time
 from src.performance_monitor import PerformanceMonitor, FPSCounter
 
 
+def _precise_sleep(seconds):
+    """短い待機をビジーウェイトで行う（time.sleepのスケジューラ由来の遅延を避ける）"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
 def test_fps_counter():
     """FPSカウンターのテスト"""
     print("FPSカウンターのテスト...")
@@ -35,9 +42,10 @@ def test_performance_monitor():
     assert 90 < elapsed * 1000 < 110, f"計測時間が期待範囲外: {elapsed*1000}ms"
     
     # 平均値のテスト
+    # 平均値の許容範囲が狭いため、全ての待機をビジーウェイトで行う（合計150ms）
     for i in range(5):
         monitor.start_timer("capture")
-        time.sleep(0.01 * (i + 1))  # 10ms, 20ms, 30ms, 40ms, 50ms
+        _precise_sleep(0.01 * (i + 1))  # 10ms, 20ms, 30ms, 40ms, 50ms
         monitor.end_timer("capture")
     
     avg_capture = monitor.get_average("capture")
@@ -75,6 +83,57 @@ def test_performance_monitor():
     print("  ✓ パフォーマンスモニターは正常に動作しています")
 
 
+def test_timer_sampling():
+    """timer()のフレーム間引き計測のテスト"""
+    print("\nタイマー間引き計測のテスト...")
+    monitor = PerformanceMonitor(sample_every=3)
+    
+    # 6フレーム中、フレーム番号0と3のみ計測される
+    for _ in range(6):
+        with monitor.timer("capture"):
+            pass
+        monitor.update_fps()
+    
+    assert len(monitor.metrics["capture"]) == 2, f"計測回数が期待値と異なる: {len(monitor.metrics['capture'])}"
+    print("  ✓ 間引き計測は正常に動作しています")
+
+
+def test_record_ns():
+    """record_ns()によるナノ秒単位の記録のテスト"""
+    print("\nナノ秒単位の記録のテスト...")
+    monitor = PerformanceMonitor(sample_every=2)
+    
+    # 4フレーム中、フレーム番号0と2のみ記録される
+    for _ in range(4):
+        monitor.record_ns("ocr", 20_000_000)  # 20ms
+        monitor.update_fps()
+    
+    assert len(monitor.metrics["ocr"]) == 2, f"記録回数が期待値と異なる: {len(monitor.metrics['ocr'])}"
+    assert abs(monitor.get_average("ocr") - 0.02) < 1e-9, "秒単位に変換して記録されるはず"
+    print("  ✓ ナノ秒単位の記録は正常に動作しています")
+
+
+def test_enabled_metrics():
+    """enabled_metricsによる計測対象の限定のテスト"""
+    print("\n計測対象の限定のテスト...")
+    monitor = PerformanceMonitor(enabled_metrics={"capture"})
+    
+    # 対象外のメトリクスは開始・終了・記録とも何もしない
+    monitor.start_timer("detection")
+    assert monitor.end_timer("detection") == 0.0
+    monitor.record_ns("ocr", 20_000_000)
+    with monitor.timer("display"):
+        pass
+    assert len(monitor.metrics["detection"]) == 0
+    assert len(monitor.metrics["ocr"]) == 0
+    assert len(monitor.metrics["display"]) == 0
+    
+    # 対象のメトリクスは通常どおり記録される
+    monitor.record_ns("capture", 10_000_000)
+    assert abs(monitor.get_average("capture") - 0.01) < 1e-9
+    print("  ✓ 計測対象の限定は正常に動作しています")
+
+
 def test_performance_report():
     """パフォーマンスレポート出力のテスト"""
     print("\nパフォーマンスレポート出力のテスト...")
@@ -83,7 +142,7 @@ def test_performance_report():
     # サンプルデータを生成
     for _ in range(20):
         monitor.start_timer("capture")
-        time.sleep(0.01)
+        _precise_sleep(0.01)
         monitor.end_timer("capture")
         
         monitor.start_timer("detection")
@@ -114,6 +173,9 @@ if __name__ == "__main__":
     try:
         test_fps_counter()
         test_performance_monitor()
+        test_timer_sampling()
+        test_record_ns()
+        test_enabled_metrics()
         test_performance_report()
         
         print("\n" + "="*60)
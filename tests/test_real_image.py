@@ -6,6 +6,8 @@ Requirements: 2.3, 4.3
 """
 
 import cv2
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.object_detector import ObjectDetector
 from src.ocr_processor import OCRProcessor
@@ -82,6 +84,16 @@ def main():
             # Y座標でソート
             sorted_detections = ObjectDetector.sort_by_y_coordinate(detections)
             
+            # OCRは領域ごとに独立しているため並列に実行し、出力は検出順に行う
+            # （OCRProcessorはスレッドごとにエンジンを持ち、TesseractはOCR中にGILを解放する）
+            texts = None
+            if ocr_processor:
+                max_workers = min(len(sorted_detections), os.cpu_count() or 1, 8)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    texts = list(executor.map(
+                        lambda bbox: ocr_processor.extract_text(frame, bbox), sorted_detections
+                    ))
+            
             print("=" * 80)
             print("検出結果とOCR抽出テキスト")
             print("=" * 80)
@@ -92,8 +104,8 @@ def main():
                 print(f"   信頼度: {bbox.confidence:.2f}")
                 
                 # OCR実行（OCRプロセッサが利用可能な場合のみ）
-                if ocr_processor:
-                    text = ocr_processor.extract_text(frame, bbox)
+                if texts is not None:
+                    text = texts[i - 1]
                     
                     if text:
                         print(f"   📝 抽出テキスト:")
@@ -129,7 +141,8 @@ def main():
             # 結果を保存
             output_path = Path("temp/test_screenshot/detection_result.jpg")
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            cv2.imwrite(str(output_path), output_image)
+            # 確認用の出力のため、既定（95）より低い品質で保存してエンコード量を減らす
+            cv2.imwrite(str(output_path), output_image, [cv2.IMWRITE_JPEG_QUALITY, 85])
             print(f"\n💾 検出結果を保存: {output_path}")
         else:
             print("⚠️  リストアイテムが検出されませんでした")
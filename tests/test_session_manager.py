@@ -0,0 +1,130 @@
+"""セッション管理（非同期の画像保存）の動作確認テスト"""
+
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+from src.object_detector import DetectionResult
+from src.session_manager import SessionManager
+
+
+def test_save_images_in_background():
+    """保存した画像がセッション終了時のZIPに含まれることをテスト"""
+    print("=== SessionManager 非同期保存テスト ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = SessionManager(tmpdir)
+        manager.start_session()
+
+        frame = np.full((200, 200, 3), 128, dtype=np.uint8)
+        bbox = DetectionResult(x1=10, y1=10, x2=100, y2=100, confidence=0.9, class_id=0, class_name="list-item")
+
+        path = manager.save_list_item_image(frame, bbox)
+        assert path == f"sessions/{manager.session_timestamp}/list_item_001.jpg"
+
+        # 保存後に元フレームを書き換えても、保存される画像には影響しない
+        frame[:] = 0
+
+        zip_path = manager.end_session()
+        assert zip_path is not None
+        with zipfile.ZipFile(zip_path) as zf:
+            assert zf.namelist() == ["list_item_001.jpg"]
+
+        saved = cv2.imread(str(Path(manager.session_folder) / "list_item_001.jpg"))
+        assert saved is not None
+        assert abs(float(saved.mean()) - 128) < 5, "切り出し時点の画像が保存されるはず"
+
+    print("✅ 全てのテストに合格")
+
+
+def test_skip_degenerate_bbox():
+    """極小・フレーム外のbounding boxは保存されないことをテスト"""
+    print("=== SessionManager 極小bbox除外テスト ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = SessionManager(tmpdir)
+        manager.start_session()
+
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        tiny = DetectionResult(x1=10, y1=10, x2=14, y2=40, confidence=0.9, class_id=0, class_name="list-item")
+        outside = DetectionResult(x1=120, y1=10, x2=160, y2=40, confidence=0.9, class_id=0, class_name="list-item")
+
+        assert manager.save_list_item_image(frame, tiny) == ""
+        assert manager.save_list_item_image(frame, outside) == ""
+        assert manager.image_counter == 0
+
+        manager.end_session()
+
+    print("✅ 全てのテストに合格")
+
+
+def test_writer_threads_stop_with_session():
+    """セッション終了時に書き込みスレッドが終了することをテスト"""
+    print("=== SessionManager 書き込みスレッド終了テスト ===")
+
+    def writer_threads():
+        return [t for t in threading.enumerate() if t.name.startswith("SessionImageWriter_")]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frame = np.full((200, 200, 3), 128, dtype=np.uint8)
+        bbox = DetectionResult(x1=10, y1=10, x2=100, y2=100, confidence=0.9, class_id=0, class_name="list-item")
+
+        # GUIの開始・停止の繰り返しと同様に、毎回新しいSessionManagerでセッションを回す
+        for _ in range(3):
+            manager = SessionManager(tmpdir)
+            manager.start_session()
+            assert writer_threads(), "セッション中は書き込みスレッドが動作しているはず"
+            manager.save_list_item_image(frame, bbox)
+            manager.end_session()
+            assert not writer_threads(), "セッション終了後に書き込みスレッドが残らないはず"
+
+    print("✅ 全てのテストに合格")
+
+
+def test_full_queue_writes_synchronously():
+    """書き込み待ちが満杯の場合も画像が破棄されずに保存されることをテスト"""
+    print("=== SessionManager 書き込み待ち満杯テスト ===")
+
+    release = threading.Event()
+    caller_writes = []
+    original_imwrite = cv2.imwrite
+
+    def slow_imwrite(filepath, image, params):
+        # 書き込みスレッドは解放されるまで止め、呼び出し元スレッドでの書き込みを記録する
+        if threading.current_thread().name.startswith("SessionImageWriter_"):
+            release.wait(5.0)
+        else:
+            caller_writes.append(filepath)
+        return original_imwrite(filepath, image, params)
+
+    with tempfile.TemporaryDirectory() as tmpdir, \
+            patch("src.session_manager.SAVE_QUEUE_SIZE", 1), \
+            patch("src.session_manager.SAVE_WORKERS", 1), \
+            patch("src.session_manager.cv2.imwrite", side_effect=slow_imwrite):
+        manager = SessionManager(tmpdir)
+        manager.start_session()
+
+        frame = np.full((200, 200, 3), 128, dtype=np.uint8)
+        bbox = DetectionResult(x1=10, y1=10, x2=100, y2=100, confidence=0.9, class_id=0, class_name="list-item")
+        paths = [manager.save_list_item_image(frame, bbox) for _ in range(3)]
+
+        release.set()
+        manager.end_session()
+
+        assert all(paths), "満杯でも保存パスが返されるはず"
+        assert caller_writes, "満杯の場合は呼び出し元スレッドで書き込むはず"
+        saved = sorted(p.name for p in Path(manager.session_folder).glob("*.jpg"))
+        assert saved == ["list_item_001.jpg", "list_item_002.jpg", "list_item_003.jpg"]
+
+    print("✅ 全てのテストに合格")
+
+
+if __name__ == "__main__":
+    test_save_images_in_background()
+    test_skip_degenerate_bbox()
+    test_writer_threads_stop_with_session()
+    test_full_queue_writes_synchronously()
@@ -0,0 +1,91 @@
+"""SPSCリングバッファの動作確認テスト"""
+
+import threading
+import time
+from src.spsc_ring import SPSCRing
+
+
+def test_push_pop_order():
+    """FIFO順序と満杯・空の判定をテスト"""
+    print("=== SPSCRing 順序テスト ===")
+
+    ring = SPSCRing(capacity=2)
+
+    assert ring.try_pop() is None, "空のリングからはNoneが返るはず"
+    assert ring.try_push(1), "空きがあれば追加できるはず"
+    assert ring.try_push(2), "空きがあれば追加できるはず"
+    assert not ring.try_push(3), "満杯の場合は追加できないはず"
+    assert len(ring) == 2
+
+    assert ring.try_pop() == 1, "古い要素から取り出されるはず"
+    assert ring.try_push(3), "取り出し後は再び追加できるはず"
+    assert ring.try_pop() == 2
+    assert ring.try_pop() == 3
+    assert ring.pop(timeout=0.01) is None, "空の場合はタイムアウトでNoneが返るはず"
+
+    ring.try_push(4)
+    ring.clear()
+    assert len(ring) == 0, "clear後は空になるはず"
+
+    print("✓ SPSCRing 順序テスト成功\n")
+
+
+def test_threaded_handoff():
+    """別スレッドのプロデューサから全要素を順序通り受け取れることをテスト"""
+    print("=== SPSCRing スレッド間受け渡しテスト ===")
+
+    ring = SPSCRing(capacity=4)
+    count = 10000
+
+    def producer():
+        for i in range(count):
+            while not ring.try_push(i):
+                pass
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+
+    received = []
+    while len(received) < count:
+        item = ring.pop(timeout=1.0)
+        assert item is not None, "プロデューサ動作中にタイムアウトしないはず"
+        received.append(item)
+    thread.join()
+
+    assert received == list(range(count)), "全要素が順序通り受け取れるはず"
+    print(f"受け渡し要素数: {len(received)}")
+    print("✓ SPSCRing スレッド間受け渡しテスト成功\n")
+
+
+def test_close_wakes_consumer():
+    """close()で待機中のコンシューマが即座に起きることをテスト"""
+    print("=== SPSCRing close テスト ===")
+
+    ring = SPSCRing(capacity=2)
+    result = {}
+
+    def consumer():
+        start = time.perf_counter()
+        result['item'] = ring.pop()
+        result['elapsed'] = time.perf_counter() - start
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    time.sleep(0.05)
+    ring.close()
+    thread.join(timeout=1.0)
+
+    assert not thread.is_alive(), "close後はpop()から戻るはず"
+    assert result['item'] is None, "閉じられたリングからはNoneが返るはず"
+    assert ring.closed
+    assert not ring.try_push(1), "閉じたリングには追加できないはず"
+
+    print(f"待機時間: {result['elapsed'] * 1000:.1f}ms")
+    print("✓ SPSCRing close テスト成功\n")
+
+
+if __name__ == "__main__":
+    test_push_pop_order()
+    test_threaded_handoff()
+    test_close_wakes_consumer()
+    print("=== 全テスト成功 ===")
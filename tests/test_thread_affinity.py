@@ -0,0 +1,88 @@
+"""
+スレッドのCPU割り当てのテスト
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thread_affinity import available_cpus, compute_pin_plan, pin_current_thread
+
+
+def test_compute_pin_plan_assigns_dedicated_cpus():
+    """キャプチャ・検出・OCRワーカーに重複しないコアが割り当てられること"""
+    print("\n=== CPU割り当て計算テスト ===")
+
+    plan = compute_pin_plan(list(range(8)), ocr_workers=3)
+    print(f"割り当て: {plan}")
+
+    assert plan is not None
+    assert plan.capture == 0
+    assert plan.ocr_workers == [7, 6, 5]
+    assert plan.detection == {1, 2, 3, 4}
+    assert plan.ocr_worker_cpus(4) == {6}
+
+    print("✓ 各スレッドに専用コアが割り当てられた")
+
+
+def test_compute_pin_plan_keeps_a_detection_cpu():
+    """OCRワーカーが多くても検出用のコアが残ること"""
+    print("\n=== 検出コア確保テスト ===")
+
+    plan = compute_pin_plan([0, 1, 2, 3], ocr_workers=8)
+    print(f"割り当て: {plan}")
+
+    assert plan is not None
+    assert plan.detection == {1}
+    assert plan.ocr_workers == [3, 2]
+
+    print("✓ 検出用のコアが確保された")
+
+
+def test_compute_pin_plan_too_few_cpus():
+    """コア数が足りない場合は割り当てないこと"""
+    print("\n=== コア不足テスト ===")
+
+    assert compute_pin_plan([0, 1], ocr_workers=2) is None
+
+    print("✓ コア不足時は固定しない")
+
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'), reason="sched_setaffinity非対応環境")
+def test_pin_current_thread_affects_only_calling_thread():
+    """固定が呼び出し元スレッドのみに作用すること"""
+    print("\n=== スレッド固定テスト ===")
+
+    cpus = available_cpus()
+    target = {cpus[0]}
+    pinned = {}
+
+    def worker():
+        pinned['ok'] = pin_current_thread(target, "test thread")
+        pinned['cpus'] = os.sched_getaffinity(0)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    print(f"ワーカー: {pinned['cpus']}, メイン: {os.sched_getaffinity(0)}")
+    assert pinned['ok']
+    assert pinned['cpus'] == target
+    assert os.sched_getaffinity(0) == set(cpus)
+
+    print("✓ 呼び出し元スレッドのみ固定された")
+
+
+if __name__ == "__main__":
+    test_compute_pin_plan_assigns_dedicated_cpus()
+    test_compute_pin_plan_keeps_a_detection_cpu()
+    test_compute_pin_plan_too_few_cpus()
+    if hasattr(os, 'sched_setaffinity'):
+        test_pin_current_thread_affects_only_calling_thread()
+    print("\n全てのテストが完了しました")
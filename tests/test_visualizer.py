@@ -5,6 +5,7 @@ Visualizerモジュールのテスト
 import pytest
 import numpy as np
 import cv2
+from unittest.mock import patch
 from src.visualizer import Visualizer
 from src.object_detector import DetectionResult
 
@@ -108,6 +109,70 @@ class TestVisualizer:
         assert result[50, 50, 1] > 0  # 1つ目の矩形
         assert result[200, 200, 1] > 0  # 2つ目の矩形
     
+    def test_draw_detections_umat_matches_cpu(self):
+        """UMat経由の描画結果がCPU描画と一致することのテスト"""
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        detections = [
+            DetectionResult(x1=50, y1=50, x2=150, y2=150, confidence=0.9, class_id=0, class_name="list-item")
+        ]
+        
+        cpu_result = Visualizer().draw_detections(frame, detections)
+        
+        # OpenCLデバイスがなくてもUMatはCPUで動作するため、描画経路を強制的に有効化して比較
+        umat_visualizer = Visualizer()
+        umat_visualizer.use_opencl = True
+        umat_result = umat_visualizer.draw_detections(frame, detections)
+        
+        # 描画結果はshow_frameまでUMatのまま保持される
+        assert isinstance(umat_result, cv2.UMat)
+        assert np.array_equal(cpu_result, umat_result.get())
+        assert np.array_equal(frame, np.zeros((480, 640, 3), dtype=np.uint8))
+    
+    def test_draw_detections_inplace(self):
+        """inplace=Trueで元画像に直接描画されることのテスト"""
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        detections = [
+            DetectionResult(x1=50, y1=50, x2=150, y2=150, confidence=0.9, class_id=0, class_name="list-item")
+        ]
+        
+        expected = Visualizer().draw_detections(frame, detections)
+        result = Visualizer().draw_detections(frame, detections, inplace=True)
+        
+        assert result is frame
+        assert np.array_equal(result, expected)
+    
+    def test_poll_key_without_window(self):
+        """ウィンドウ作成前のpoll_keyはイベント処理を行わずTrueを返すことのテスト"""
+        visualizer = Visualizer()
+        
+        with patch('src.visualizer.cv2.pollKey') as mock_poll_key:
+            assert visualizer.poll_key() is True
+            mock_poll_key.assert_not_called()
+    
+    def test_draw_hierarchical_detections_skips_overlapping_labels(self):
+        """重なるラベル・幅の狭い検出結果のラベルが描画されないことのテスト"""
+        from src.hierarchical_detector import HierarchicalDetectionResult
+        
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        results = [
+            HierarchicalDetectionResult(
+                list_item_id=f"list_item_{i:03d}",
+                list_item_bbox=DetectionResult(
+                    x1=50, y1=100 + i * 5, x2=400, y2=200, confidence=0.9, class_id=0, class_name="list-item"
+                )
+            )
+            for i in range(2)
+        ]
+        results[0].title = DetectionResult(
+            x1=300, y1=300, x2=320, y2=320, confidence=0.8, class_id=1, class_name="title"
+        )
+        
+        with patch('src.visualizer.cv2.putText') as mock_put_text:
+            Visualizer().draw_hierarchical_detections(frame, results)
+        
+        # 2つ目のlist-itemのラベルは1つ目と重なり、titleは幅が狭いため描画されない
+        assert mock_put_text.call_count == 1
+    
     def test_cleanup(self):
         """クリーンアップのテスト"""
         visualizer = Visualizer()
@@ -4,10 +4,21 @@ WindowCaptureモジュールのテストコード
 Requirements: 1.1, 1.2, 1.3
 """
 
+import threading
+
 import pytest
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
-from src.window_capture import WindowCapture
+from src import window_capture
+from src.window_capture import WINDOW_LIST_TTL, WindowCapture
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_mss():
+    """スレッドごとに共有しているmssインスタンスを破棄（テストごとにmssのモックを使用するため）"""
+    window_capture._thread_local.__dict__.pop('sct', None)
+    yield
+    window_capture._thread_local.__dict__.pop('sct', None)
 
 
 class TestWindowCapture:
@@ -166,6 +177,31 @@ class TestWindowCapture:
         assert "NonExistentWindow" in error_message
         assert "利用可能なウィンドウ" in error_message
         assert "Other Window" in error_message
+        # 候補の表示には検索に使用した一覧を使い回す
+        mock_cg_window.assert_called_once()
+    
+    @patch('src.window_capture.mss.mss')
+    @patch('src.window_capture.CGWindowListCopyWindowInfo')
+    def test_find_window_reuses_window_list(self, mock_cg_window, mock_mss_class):
+        """短時間の再検索ではウィンドウ一覧を再取得しないことを確認"""
+        mock_cg_window.return_value = [
+            {
+                'kCGWindowName': 'iPhone',
+                'kCGWindowOwnerName': 'iPhone Mirroring',
+                'kCGWindowBounds': {'X': 0, 'Y': 0, 'Width': 100, 'Height': 200}
+            }
+        ]
+        
+        capture = WindowCapture("iPhone")
+        capture.find_window()
+        capture.find_window()
+        
+        mock_cg_window.assert_called_once()
+        
+        # TTLを過ぎた後は再取得する
+        capture._window_list_ts -= WINDOW_LIST_TTL
+        capture.find_window()
+        assert mock_cg_window.call_count == 2
     
     @patch('src.window_capture.mss.mss')
     def test_capture_frame_success(self, mock_mss_class):
@@ -206,6 +242,8 @@ class TestWindowCapture:
         # BGR形式（3チャンネル）に変換されていることを確認
         assert frame.shape == (800, 400, 3)
         assert frame.dtype == np.uint8
+        # 後段のOpenCV処理でコピーが発生しないよう、画素が連続した配列になっていることを確認
+        assert frame.flags['C_CONTIGUOUS']
     
     def test_capture_frame_without_window_info(self):
         """ウィンドウ情報なしでキャプチャするとエラーになることを確認"""
@@ -258,18 +296,118 @@ class TestWindowCapture:
         assert np.all(frame[:, :, 2] == 200)  # R
     
     @patch('src.window_capture.mss.mss')
-    def test_destructor_cleanup(self, mock_mss_class):
-        """デストラクタでリソースがクリーンアップされることを確認"""
+    def test_capture_frame_into_scaled(self, mock_mss_class):
+        """縮小率を指定するとBGRに変換しつつ縮小されることを確認"""
         mock_sct = MagicMock()
         mock_mss_class.return_value = mock_sct
         
+        bgra_data = np.zeros((800, 400, 4), dtype=np.uint8)
+        bgra_data[:, :, 2] = 200  # R
+        bgra_data[:, :, 3] = 255  # A
+        
+        mock_screenshot = MagicMock()
+        mock_screenshot.__array__ = lambda: bgra_data
+        mock_sct.grab.return_value = mock_screenshot
+        
         capture = WindowCapture("TestWindow")
+        capture.window_info = {
+            'x': 0,
+            'y': 0,
+            'width': 400,
+            'height': 800,
+            'title': 'TestWindow',
+            'owner': 'TestApp'
+        }
+        
+        buffer = np.empty((400, 200, 3), dtype=np.uint8)
+        frame = capture.capture_frame_into(buffer, scale=0.5)
+        
+        # 縮小後のサイズと一致するバッファはそのまま再利用される
+        assert frame is buffer
+        assert frame.shape == (400, 200, 3)
+        assert np.all(frame[:, :, 2] == 200)
+        assert np.all(frame[:, :, 0] == 0)
+    
+    @patch('src.window_capture.CGDataProviderCopyData')
+    @patch('src.window_capture.CGImageGetDataProvider')
+    @patch('src.window_capture.CGImageGetBytesPerRow', return_value=48)
+    @patch('src.window_capture.CGImageGetHeight', return_value=4)
+    @patch('src.window_capture.CGImageGetWidth', return_value=10)
+    @patch('src.window_capture.CGWindowListCreateImage')
+    @patch('src.window_capture.mss.mss')
+    def test_capture_frame_quartz(self, mock_mss_class, mock_create_image, *_mocks):
+        """Quartzから直接キャプチャし、行末のパディングが除外されることを確認"""
+        # 1行あたり48バイト（10ピクセル×4バイト＋パディング8バイト）
+        rows = np.zeros((4, 48), dtype=np.uint8)
+        rows[:, :40] = np.tile([10, 20, 30, 255], 10)
+        rows[:, 40:] = 99  # パディング
+        _mocks[-1].return_value = rows.tobytes()
+        
+        capture = WindowCapture("TestWindow", use_quartz=True)
+        capture.window_info = {
+            'x': 0,
+            'y': 0,
+            'width': 10,
+            'height': 4,
+            'title': 'TestWindow',
+            'owner': 'TestApp'
+        }
+        
+        frame = capture.capture_frame_into(None)
+        
+        mock_create_image.assert_called_once()
+        capture.sct.grab.assert_not_called()
+        assert frame.shape == (4, 10, 3)
+        assert np.all(frame[:, :, 0] == 10)
+        assert np.all(frame[:, :, 2] == 30)
+    
+    @patch('src.window_capture.CGWindowListCreateImage', return_value=None)
+    @patch('src.window_capture.mss.mss')
+    def test_capture_frame_quartz_fallback(self, mock_mss_class, mock_create_image):
+        """Quartzでのキャプチャに失敗した場合はmssに切り替わることを確認"""
+        mock_sct = MagicMock()
+        mock_mss_class.return_value = mock_sct
+        
+        mock_screenshot = MagicMock()
+        mock_screenshot.__array__ = lambda: np.zeros((100, 100, 4), dtype=np.uint8)
+        mock_sct.grab.return_value = mock_screenshot
+        
+        capture = WindowCapture("TestWindow", use_quartz=True)
+        capture.window_info = {
+            'x': 0,
+            'y': 0,
+            'width': 100,
+            'height': 100,
+            'title': 'TestWindow',
+            'owner': 'TestApp'
+        }
+        
+        frame = capture.capture_frame()
+        
+        assert frame.shape == (100, 100, 3)
+        assert capture.use_quartz is False
+        mock_sct.grab.assert_called_once()
+    
+    @patch('src.window_capture.mss.mss')
+    def test_mss_shared_per_thread(self, mock_mss_class):
+        """mssインスタンスが同じスレッドのインスタンス間で共有され、スレッドごとに作成されることを確認"""
+        mock_mss_class.side_effect = lambda: MagicMock()
+        
+        capture1 = WindowCapture("TestWindow")
+        capture2 = WindowCapture("OtherWindow")
+        
+        # 同じスレッドでは1つのmssインスタンスを共有
+        assert capture1.sct is capture2.sct
+        assert mock_mss_class.call_count == 1
         
-        # デストラクタを明示的に呼び出し
-        capture.__del__()
+        # 別スレッドでは専用のインスタンスを作成
+        other = []
+        thread = threading.Thread(target=lambda: other.append(capture1.sct))
+        thread.start()
+        thread.join()
         
-        # closeが呼ばれたことを確認
-        mock_sct.close.assert_called_once()
+        assert other[0] is not capture1.sct
+        assert mock_mss_class.call_count == 2
 
 
 class TestWindowCaptureIntegration: